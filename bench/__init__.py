@@ -0,0 +1 @@
+"""Бенчмарки Жизненной RPG: генератор синтетических профилей и замеры."""
@@ -0,0 +1,53 @@
+# bench/_app.py — функции приложения для микробенчмарков без запуска Streamlit-скрипта
+"""
+Логика приложения живёт в пакете life_rpg, поэтому для микробенчмарков его
+модули просто импортируются; вместо Supabase подставляется in-memory клиент
+(life_rpg.db.use_client). load_app_namespace() собирает их функции и
+константы в один словарь — как раньше globals() app.py.
+"""
+import importlib
+
+from bench.fakes import InMemorySupabase
+
+BENCH_USER_ID = "bench-user"
+
+# модули, из которых собирается пространство имён (позже — приоритетнее)
+MODULES = [
+    "life_rpg.constants",
+    "life_rpg.db",
+    "life_rpg.auth",
+    "life_rpg.persistence",
+    "life_rpg.state",
+    "life_rpg.logic",
+    "life_rpg.report",
+    "life_rpg.charts",
+    "life_rpg.stats",
+]
+
+
+def load_app_namespace(client: InMemorySupabase | None = None) -> dict:
+    """Возвращает словарь с функциями и константами приложения."""
+    # вне `streamlit run` каждое обращение к st.session_state пишет предупреждение;
+    # уровень ставим после импорта streamlit — он настраивает свои логгеры сам
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    from life_rpg import db
+
+    ns: dict = {}
+    for name in MODULES:
+        mod = importlib.import_module(name)
+        ns.update({k: v for k, v in vars(mod).items() if not k.startswith("__")})
+    ns["supabase"] = client or InMemorySupabase(BENCH_USER_ID)
+    db.use_client(ns["supabase"])
+    return ns
+
+
+def reset_session(ns: dict, data: dict):
+    """Очищает st.session_state и загружает в него документ состояния."""
+    ss = ns["st"].session_state
+    for k in list(ss.keys()):
+        del ss[k]
+    ns["_bootstrap_state"]()
+    ss.auth_user = {"id": BENCH_USER_ID}
+    ns["deserialize_state"](data)
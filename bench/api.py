@@ -0,0 +1,101 @@
+# bench/api.py — пропускная способность JSON API (life_rpg.api) на in-memory хранилище
+"""
+Запросы идут прямо в WSGI-приложение (без сокетов): меряется само API —
+проверка токена, ETag, LRU ответов, загрузка документа и правила.
+
+  get_304     — GET /today с совпавшим If-None-Match (один state_meta, без документа);
+  get_cached  — GET /today без валидатора, тело из LRU;
+  get_cold    — GET /today при пустом LRU: разбор документа, сессия, ответ;
+  stats_cold  — то же для /stats (серии, XP за неделю);
+  post_cold   — POST отметки привычки, документ не загружен: разбор, правило, запись;
+  post_habit  — POST подряд (документ уже в сессии): правило и запись, попеременно ✅/❌.
+
+    python -m bench.api --sizes small,medium,large
+"""
+import argparse
+import sys
+
+from bench.fakes import InMemoryStore
+from bench.profiles import SIZES, generate_state
+from bench.runner import fmt_seconds, measure, meta, write_results
+
+USER_ID = "bench-user"
+TOKEN = "bench-token"
+
+
+def _call(app, method: str, path: str, headers: dict | None = None) -> tuple[str, dict, bytes]:
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "HTTP_AUTHORIZATION": f"Bearer {TOKEN}"}
+    environ.update(headers or {})
+    out = {}
+
+    def start_response(status, hdrs):
+        out["status"], out["headers"] = status, dict(hdrs)
+
+    body = b"".join(app(environ, start_response))
+    return out["status"], out["headers"], body
+
+
+def run_size(size: str, repeat: int) -> list[dict]:
+    from life_rpg.api import Api
+
+    store = InMemoryStore()
+    state = generate_state(**SIZES[size])
+    state["api_token"] = TOKEN
+    state["updated_at"] = "2026-01-01T00:00:00+00:00"
+    store.put_state(USER_ID, state)
+    app = Api(store)
+    habit_id = state["habits"][0]["id"]
+
+    status, headers, _ = _call(app, "GET", f"/api/{USER_ID}/today")
+    assert status == "200 OK", status
+    inm = {"HTTP_IF_NONE_MATCH": headers["ETag"]}
+    assert _call(app, "GET", f"/api/{USER_ID}/today", inm)[0] == "304 Not Modified"
+
+    flip = [True]
+
+    def post_habit():
+        flip[0] = not flip[0]
+        action = "done" if flip[0] else "fail"
+        assert _call(app, "POST", f"/api/{USER_ID}/habits/{habit_id}/{action}")[0] == "200 OK"
+
+    cases = [
+        ("get_304", lambda: _call(app, "GET", f"/api/{USER_ID}/today", inm), None),
+        ("get_cached", lambda: _call(app, "GET", f"/api/{USER_ID}/today"), None),
+        ("get_cold", lambda: _call(app, "GET", f"/api/{USER_ID}/today"), app.clear),
+        ("stats_cold", lambda: _call(app, "GET", f"/api/{USER_ID}/stats"), app.clear),
+        ("post_cold", post_habit, app.clear),
+        ("post_habit", post_habit, None),
+    ]
+    results = []
+    for name, fn, setup in cases:
+        r = measure(fn, setup=setup, repeat=repeat)
+        results.append({"size": size, "op": name, "req_per_s": 1 / r["median_s"], **r})
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    from life_rpg.headless import init_process
+
+    p = argparse.ArgumentParser(description="Пропускная способность JSON API на in-memory хранилище.")
+    p.add_argument("--sizes", default="small,medium", help="профили через запятую: " + ",".join(SIZES))
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/api-<commit>.json)")
+    args = p.parse_args(argv)
+
+    init_process()
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    results = []
+    print(f"{'size':>7} {'op':<12} {'median':>10} {'req/s':>10}")
+    for size in sizes:
+        for r in run_size(size, args.repeat):
+            results.append(r)
+            print(f"{size:>7} {r['op']:<12} {fmt_seconds(r['median_s']):>10} {r['req_per_s']:>10.0f}")
+
+    payload = {"meta": meta(), "sizes": {s: SIZES[s] for s in sizes}, "results": results}
+    path = write_results("api", payload, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# bench/compare.py — сравнение двух JSON-результатов бенчмарков
+"""
+    python -m bench.compare base.json new.json [--threshold 0.10]
+
+Печатает медианы и отношение new/base по каждой паре (размер, операция).
+Код возврата 1, если хоть одна операция замедлилась больше порога.
+"""
+import argparse
+import json
+import sys
+
+from bench.runner import fmt_seconds
+
+
+def _index(payload: dict) -> dict:
+    key_fields = ("size", "op", "interaction")
+    out = {}
+    for r in payload.get("results", []):
+        key = tuple(r.get(f) for f in key_fields if f in r)
+        out[key] = r
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Сравнить два файла результатов бенчмарков.")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--metric", default="median_s")
+    p.add_argument("--threshold", type=float, default=0.10, help="допустимое замедление (доля)")
+    args = p.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    b_idx, n_idx = _index(base), _index(new)
+    print(f"base: {base['meta'].get('commit')}  new: {new['meta'].get('commit')}  метрика: {args.metric}")
+    regressed = 0
+    for key in sorted(set(b_idx) & set(n_idx), key=str):
+        b, n = b_idx[key][args.metric], n_idx[key][args.metric]
+        ratio = n / b if b else float("inf")
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  ⚠️ медленнее"
+            regressed += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  ✅ быстрее"
+        label = " ".join(str(k) for k in key)
+        print(f"{label:<45} {fmt_seconds(b):>12} → {fmt_seconds(n):>12}  ×{ratio:.2f}{flag}")
+
+    only_one = set(b_idx) ^ set(n_idx)
+    if only_one:
+        print(f"\n{len(only_one)} замеров есть только в одном из файлов — пропущены.")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# bench/core.py — микробенчмарки основных функций приложения (пакет life_rpg)
+"""
+Замеряет serialize_state, deserialize_state, auto_process_overdues,
+_day_done_ok, помощники render_full_stats, export_year_report_xlsx
+и поисковый индекс (построение, доиндексация после правки, запрос)
+на синтетических профилях разного размера.
+
+    python -m bench.core --sizes small,medium,large
+    python -m bench.compare bench/results/core-<old>.json bench/results/core-<new>.json
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from bench._app import load_app_namespace, reset_session
+from bench.profiles import SIZES, generate_state
+from bench.runner import fmt_seconds, measure, meta, write_results
+
+# помощники блока «Полная статистика» (render_full_stats)
+FULL_STATS_HELPERS = [
+    "_current_and_best_streak",
+    "_goals_stats",
+    "_big_goals_stats",
+    "_habits_stats",
+    "_xp_last_7_days",
+    "_habits_week_success",
+    "_goals_category_success",
+    "_xp_last_30_days_summary",
+]
+
+
+def build_cases(ns: dict, data: dict) -> list[tuple[str, object, object]]:
+    """Список (имя, fn, setup); setup=None — функция не меняет состояние."""
+    load = lambda: reset_session(ns, data)  # noqa: E731
+    yesterday = date.today() - timedelta(days=1)
+    snapshot = ns["serialize_state"]()
+    year = date.today().year
+
+    cases = [
+        ("serialize_state", ns["serialize_state"], None),
+        ("deserialize_state", lambda: ns["deserialize_state"](data), None),
+        ("auto_process_overdues", ns["auto_process_overdues"], load),
+        ("_day_done_ok", lambda: ns["_day_done_ok"](yesterday), None),
+    ]
+    cases += [(name, ns[name], None) for name in FULL_STATS_HELPERS]
+    cases.append(("export_year_report_xlsx", lambda: ns["export_year_report_xlsx"](snapshot, year), None))
+    cases += search_cases(ns)
+    return cases
+
+
+def search_cases(ns: dict) -> list[tuple[str, object, object]]:
+    ss = ns["st"].session_state
+    goals = ss.goals
+
+    def drop_index():
+        ss.pop("search_index", None)
+
+    def edit_one():
+        # одна правка, как после ✅ или редактирования: индекс должен доиндексировать один элемент
+        ns["search_index"]()
+        goals[len(goals) // 2]["title"] += " правка"
+        ss.state_rev = ss.get("state_rev", 0) + 1
+
+    word = goals[0]["title"].split()[0][:3] if goals else ""
+    return [
+        ("search_index_build", ns["search_index"], drop_index),
+        ("search_index_sync_one", ns["search_index"], edit_one),
+        ("search_query", lambda: ns["search_index"]().query(text=word, statuses=["open", "done"]), None),
+    ]
+
+
+def run(sizes: list[str], repeat: int, only: set[str] | None = None) -> dict:
+    ns = load_app_namespace()
+    results = []
+    for size in sizes:
+        params = SIZES[size]
+        data = generate_state(**params)
+        reset_session(ns, data)
+        for name, fn, setup in build_cases(ns, data):
+            if only and name not in only:
+                continue
+            r = measure(fn, setup=setup, repeat=repeat)
+            # после мутирующих замеров возвращаем исходный профиль
+            if setup is not None:
+                reset_session(ns, data)
+            results.append({"size": size, "op": name, **r})
+            print(f"{size:>7} {name:<28} {fmt_seconds(r['median_s']):>12}")
+    return {"meta": meta(), "sizes": {s: SIZES[s] for s in sizes}, "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Микробенчмарки основных функций Жизненной RPG.")
+    p.add_argument("--sizes", default="small,medium,large", help="через запятую: " + ",".join(SIZES))
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--only", help="через запятую: замерять только эти функции")
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/core-<commit>.json)")
+    args = p.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        p.error(f"неизвестные размеры: {', '.join(unknown)}")
+    only = {s.strip() for s in args.only.split(",")} if args.only else None
+
+    payload = run(sizes, args.repeat, only)
+    path = write_results("core", payload, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
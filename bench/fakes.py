@@ -0,0 +1,224 @@
+# bench/fakes.py — in-memory заменитель клиента Supabase для бенчмарков
+"""
+Повторяет ровно ту часть API supabase-py, которой пользуется приложение:
+table(...).select/eq/is_/gte/lte/order/limit/upsert/insert/update/delete(...).execute()
+(колонки и фильтры вида data->>поле — как в PostgREST) и
+auth.get_user/sign_in_with_password/sign_up/sign_out.
+
+InMemoryStore — то же для SQLStore (life_rpg.sqlstore), которым пользуются процессы
+вне Streamlit (лента календаря, JSON API).
+"""
+import copy
+import json
+import sys
+import types
+from collections import Counter
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _User:
+    def __init__(self, user_id: str, email: str = "bench@example.com"):
+        self.id = user_id
+        self.email = email
+
+    def model_dump(self) -> dict:
+        return {"id": self.id, "email": self.email}
+
+
+class _AuthResponse:
+    def __init__(self, user):
+        self.user = user
+
+
+class _Auth:
+    def __init__(self, user_id: str | None):
+        self._user = _User(user_id) if user_id else None
+
+    def get_user(self):
+        return _AuthResponse(self._user)
+
+    def sign_in_with_password(self, creds: dict):
+        self._user = _User("bench-user", creds.get("email", ""))
+        return _AuthResponse(self._user)
+
+    sign_up = sign_in_with_password
+
+    def sign_out(self):
+        self._user = None
+
+
+class _Query:
+    def __init__(self, rows: list[dict], calls: Counter):
+        self._rows = rows
+        self._calls = calls
+        self._op = "select"
+        self._payload = None
+        self._filters: list[tuple[str, object]] = []
+        self._ranges: list[tuple[str, str, object]] = []  # (колонка, gte/lte, значение)
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._conflict = ["user_id"]
+        self._json_cols: list[tuple[str, str]] | None = None  # (имя в ответе, data->>поле)
+
+    def select(self, *cols, **_kw):
+        self._op = "select"
+        specs = [c.strip() for col in cols for c in col.split(",")]
+        if any("->>" in c for c in specs):
+            self._json_cols = [tuple(c.split(":", 1)) if ":" in c else (c, c) for c in specs]
+        return self
+
+    def eq(self, col, val):
+        self._filters.append((col, val))
+        return self
+
+    def is_(self, col, val):
+        self._filters.append((col, None if val == "null" else val))
+        return self
+
+    def gte(self, col, val):
+        self._ranges.append((col, "gte", val))
+        return self
+
+    def lte(self, col, val):
+        self._ranges.append((col, "lte", val))
+        return self
+
+    def order(self, col, desc: bool = False, **_kw):
+        self._order.append((col, desc))
+        return self
+
+    def limit(self, n: int, **_kw):
+        self._limit = n
+        return self
+
+    def upsert(self, payload, on_conflict: str = "user_id", **_kw):
+        self._op, self._payload = "upsert", payload
+        self._conflict = on_conflict.split(",")
+        return self
+
+    def insert(self, payload, **_kw):
+        self._op, self._payload = "insert", payload
+        return self
+
+    def update(self, payload, **_kw):
+        self._op, self._payload = "update", payload
+        return self
+
+    def delete(self, **_kw):
+        self._op = "delete"
+        return self
+
+    @staticmethod
+    def _value(row: dict, col: str):
+        if "->>" not in col:
+            return row.get(col)
+        base, key = col.split("->>", 1)
+        v = (row.get(base) or {}).get(key)
+        return None if v is None else str(v)
+
+    def _match(self, row: dict) -> bool:
+        if not all(self._value(row, c) == v for c, v in self._filters):
+            return False
+        for c, op, v in self._ranges:
+            x = row.get(c)
+            if x is None or (x < v if op == "gte" else x > v):
+                return False
+        return True
+
+    def execute(self):
+        self._calls[self._op] += 1
+        if self._op == "select":
+            rows = [r for r in self._rows if self._match(r)]
+            for col, desc in reversed(self._order):  # устойчивая сортировка: первый order — главный
+                rows.sort(key=lambda r: r.get(col), reverse=desc)
+            if self._limit is not None:
+                rows = rows[:self._limit]
+            if self._json_cols is not None:
+                return _Result([{name: self._value(r, col) for name, col in self._json_cols} for r in rows])
+            return _Result([copy.deepcopy(r) for r in rows])
+        if self._op in ("upsert", "insert"):
+            payloads = self._payload if isinstance(self._payload, list) else [self._payload]
+            for p in payloads:
+                # как и в PostgreSQL, значение проходит через JSON — храним копию
+                p = copy.deepcopy(p)
+                key = [p.get(c) for c in self._conflict]
+                for i, r in enumerate(self._rows):
+                    if self._op == "upsert" and None not in key and [r.get(c) for c in self._conflict] == key:
+                        self._rows[i] = {**r, **p}
+                        break
+                else:
+                    self._rows.append(p)
+            return _Result(payloads)
+        if self._op == "update":
+            hit = [r for r in self._rows if self._match(r)]
+            for r in hit:
+                r.update(copy.deepcopy(self._payload))
+            return _Result(hit)
+        hit = [r for r in self._rows if self._match(r)]
+        self._rows[:] = [r for r in self._rows if not self._match(r)]
+        return _Result(hit)
+
+
+class InMemorySupabase:
+    """Минимальный клиент Supabase, хранящий таблицы в словаре."""
+
+    def __init__(self, user_id: str | None = "bench-user"):
+        self.tables: dict[str, list[dict]] = {}
+        self.auth = _Auth(user_id)
+        self.calls: Counter = Counter()  # число execute() по типу операции
+
+    def table(self, name: str) -> _Query:
+        return _Query(self.tables.setdefault(name, []), self.calls)
+
+    def put_state(self, user_id: str, data: dict):
+        self.table("rpg_state").upsert({"user_id": user_id, "data": data}).execute()
+
+
+class InMemoryStore:
+    """rpg_state в словаре с интерфейсом SQLStore. Документ хранится JSON-текстом, как в
+    базе, — чтение и запись платят за разбор и сериализацию; поля state_meta, как
+    вычисляемые колонки, считаются при записи."""
+
+    META = ("ics_token", "api_token", "updated_at")
+
+    def __init__(self):
+        self.rows: dict[str, tuple[str, dict]] = {}  # user_id → (JSON, поля state_meta)
+        self.calls: Counter = Counter()
+
+    def put_state(self, user_id: str, data: dict):
+        self.rows[user_id] = (json.dumps(data, ensure_ascii=False), {k: data.get(k) for k in self.META})
+
+    def state_meta(self, user_id: str) -> dict | None:
+        self.calls["meta"] += 1
+        row = self.rows.get(user_id)
+        return None if row is None else dict(row[1])
+
+    def load_state(self, user_id: str) -> dict | None:
+        self.calls["load"] += 1
+        row = self.rows.get(user_id)
+        return None if row is None else json.loads(row[0])
+
+    def save_state(self, user_id: str, data: dict):
+        self.calls["save"] += 1
+        self.put_state(user_id, data)
+
+    def save_state_if(self, user_id: str, data: dict, seen) -> bool:
+        self.calls["save"] += 1
+        row = self.rows.get(user_id)
+        if row is None or row[1]["updated_at"] != seen:
+            return False
+        self.put_state(user_id, data)
+        return True
+
+
+def install_fake_supabase_module(client: InMemorySupabase) -> types.ModuleType:
+    """Подменяет пакет `supabase` в sys.modules, чтобы create_client отдавал client."""
+    mod = types.ModuleType("supabase")
+    mod.Client = InMemorySupabase
+    mod.create_client = lambda *_a, **_kw: client
+    sys.modules["supabase"] = mod
+    return mod
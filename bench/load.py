@@ -0,0 +1,79 @@
+# bench/load.py — загрузка документа состояния и первые обращения к нему
+"""
+Даты отметок привычек разбираются лениво (life_rpg.memory.DayList), поэтому
+одного замера deserialize_state мало — часть работы переезжает на первое
+обращение. Виды:
+
+  load       — deserialize_state(документ);
+  load_today — загрузка и ответ «сегодня» (life_rpg.api.today_view): первый
+               перезапуск главной / первый запрос API;
+  load_all   — загрузка и обращение ко всем датам: дедлайны всех задач и все
+               отметки всех привычек (худший случай для ленивого разбора);
+  load_save  — загрузка и serialize_state() (правило + запись без показа истории).
+
+Файл не зависит от того, ленивый ли разбор: его можно запустить на старом
+коммите и сравнить результаты через bench.compare.
+
+    python -m bench.load --sizes medium,large
+    python -m bench.compare bench/results/load-<old>.json bench/results/load-<new>.json
+"""
+import argparse
+import json
+import sys
+
+from bench.profiles import SIZES, generate_state
+from bench.runner import fmt_seconds, measure, meta, write_results
+
+
+def _touch_all():
+    import streamlit as st
+
+    n = 0
+    for g in st.session_state.goals:
+        n += g["due"].toordinal()
+    for h in st.session_state.habits:
+        n += sum(1 for _ in h["completions"]) + sum(1 for _ in h["failures"])
+    return n
+
+
+def run_size(size: str, repeat: int) -> list[dict]:
+    from life_rpg.api import today_view
+    from life_rpg.persistence import deserialize_state, serialize_state
+
+    data = json.loads(json.dumps(generate_state(**SIZES[size])))  # как из базы
+    cases = [
+        ("load", lambda: deserialize_state(data)),
+        ("load_today", lambda: (deserialize_state(data), today_view())),
+        ("load_all", lambda: (deserialize_state(data), _touch_all())),
+        ("load_save", lambda: (deserialize_state(data), serialize_state())),
+    ]
+    return [{"size": size, "op": name, **measure(fn, repeat=repeat)} for name, fn in cases]
+
+
+def main(argv: list[str] | None = None) -> int:
+    from life_rpg.headless import init_process, open_session
+
+    p = argparse.ArgumentParser(description="Загрузка документа состояния и первые обращения к нему.")
+    p.add_argument("--sizes", default="medium,large", help="профили через запятую: " + ",".join(SIZES))
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/load-<commit>.json)")
+    args = p.parse_args(argv)
+
+    init_process()
+    open_session({})
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    results = []
+    print(f"{'size':>7} {'op':<11} {'median':>10}")
+    for size in sizes:
+        for r in run_size(size, args.repeat):
+            results.append(r)
+            print(f"{size:>7} {r['op']:<11} {fmt_seconds(r['median_s']):>10}")
+
+    payload = {"meta": meta(), "sizes": {s: SIZES[s] for s in sizes}, "results": results}
+    path = write_results("load", payload, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
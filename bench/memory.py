@@ -0,0 +1,87 @@
+# bench/memory.py — сколько памяти держит одна сессия
+"""
+Документ синтетического профиля проходит через JSON (как из базы), загружается
+в st.session_state (life_rpg.headless), затем строится то, что сессия держит
+после первых страниц: серия XP, индекс поиска, порядок задач. Меряется двумя
+способами:
+
+  deep    — life_rpg.memory.session_footprint: байты объектов по ключам
+            session_state (общие объекты — один раз);
+  traced  — tracemalloc: сколько памяти осталось выделено после загрузки,
+            когда сам документ уже освобождён (проверка для deep).
+
+    python -m bench.memory --sizes medium,large
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from bench.profiles import SIZES, generate_state
+from bench.runner import meta, write_results
+
+TOP_KEYS = 6
+
+
+def run_size(size: str) -> dict:
+    import streamlit as st
+
+    from life_rpg.headless import open_session
+    from life_rpg.memory import session_footprint
+    from life_rpg.state import goals_in_order, search_index, xp_series
+
+    text = json.dumps(generate_state(**SIZES[size]), ensure_ascii=False)
+    open_session({})  # пустая сессия: её служебные ключи не входят в замер
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    open_session(json.loads(text))
+    xp_series()
+    search_index()
+    goals_in_order()
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    rows = session_footprint()
+    ss = st.session_state
+    return {
+        "size": size,
+        "json_bytes": len(text.encode("utf-8")),
+        "deep_bytes": sum(n for _, n in rows),
+        "traced_bytes": traced,
+        "goals": len(ss.goals),
+        "habit_events": sum(len(h["completions"]) + len(h["failures"]) for h in ss.habits),
+        "keys": dict(rows[:TOP_KEYS]),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    from life_rpg.headless import init_process
+    from life_rpg.memory import fmt_bytes
+
+    p = argparse.ArgumentParser(description="Память одной сессии на синтетических профилях.")
+    p.add_argument("--sizes", default="medium,large", help="профили через запятую: " + ",".join(SIZES))
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/memory-<commit>.json)")
+    args = p.parse_args(argv)
+
+    init_process()
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    results = []
+    print(f"{'size':>7} {'json':>10} {'deep':>10} {'traced':>10}  крупнейшие ключи")
+    for size in sizes:
+        r = run_size(size)
+        results.append(r)
+        top = ", ".join(f"{k} {fmt_bytes(n)}" for k, n in r["keys"].items())
+        print(f"{size:>7} {fmt_bytes(r['json_bytes']):>10} {fmt_bytes(r['deep_bytes']):>10} "
+              f"{fmt_bytes(r['traced_bytes']):>10}  {top}")
+
+    payload = {"meta": meta(), "sizes": {s: SIZES[s] for s in sizes}, "results": results}
+    path = write_results("memory", payload, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# bench/profiles.py — генератор синтетических профилей (документов rpg_state)
+"""
+Строит правдоподобный документ состояния в том же формате, что и
+serialize_state(): задачи разных типов/категорий/повторений, глобальные
+цели, привычки с историей выполнений за N лет, xp_log и даты дисциплины.
+
+Генерация детерминирована (seed), поэтому результаты замеров можно
+сравнивать между коммитами.
+"""
+import argparse
+import json
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+
+STATS = ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"]
+TASK_CATEGORIES = ["Работа", "Учёба", "Дом", "Здоровье", "Хобби", "Другое"]
+RECUR_MODES = ["daily", "weekly", "by_days"]
+
+_WORDS = [
+    "Сделать", "Прочитать", "Позвонить", "Купить", "Написать", "Подготовить",
+    "отчёт", "книгу", "маме", "продукты", "письмо", "презентацию", "тренировку",
+    "английский", "налоги", "ремонт", "план", "статью", "курс", "встречу",
+]
+
+# Размеры по умолчанию: (задачи, привычки, лет истории)
+SIZES = {
+    "small": {"goals": 50, "habits": 5, "years": 1},
+    "medium": {"goals": 500, "habits": 15, "years": 2},
+    "large": {"goals": 5000, "habits": 40, "years": 5},
+}
+
+
+def _title(rnd: random.Random) -> str:
+    return " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(2, 4)))
+
+
+def _classify(due: date, today: date) -> str:
+    left = (due - today).days
+    if left <= 7:
+        return "Краткосрочная"
+    elif left <= 92:
+        return "Среднесрочная"
+    return "Долгосрочная"
+
+
+def generate_state(goals: int = 500, habits: int = 15, years: float = 2,
+                   overdue: float = 0.002, seed: int = 42, today: date | None = None) -> dict:
+    """
+    Возвращает документ состояния заданного размера.
+    overdue — доля активных задач с дедлайном в прошлом (пользователь давно не заходил).
+    """
+    rnd = random.Random(seed)
+    # отдельный генератор для id: не сдвигает остальные случайные данные профиля
+    id_rnd = random.Random(seed + 1)
+
+    def new_id() -> str:
+        return uuid.UUID(int=id_rnd.getrandbits(128), version=4).hex
+
+    today = today or date.today()
+    history_days = max(1, int(years * 365))
+    start = today - timedelta(days=history_days)
+
+    # --- задачи: ~70% в прошлом (закрыты), остальное — активные, часть на сегодня
+    out_goals = []
+    for n in range(goals):
+        roll = rnd.random()
+        recur = rnd.random() < 0.2
+        stale = rnd.random() < overdue
+        if stale:
+            due = today - timedelta(days=rnd.randint(1, 30))
+            done = failed = overdue_flag = False
+        elif roll < 0.7 and not recur:
+            due = start + timedelta(days=rnd.randrange(history_days))
+            done = rnd.random() < 0.75
+            failed = not done
+            overdue_flag = failed and rnd.random() < 0.5
+        elif roll < 0.8:
+            due = today
+            done = failed = overdue_flag = False
+        else:
+            due = today + timedelta(days=rnd.randint(1, 400))
+            done = failed = overdue_flag = False
+        recur_mode = rnd.choice(RECUR_MODES) if recur else "none"
+        recur_days = sorted(rnd.sample(range(7), rnd.randint(1, 4))) if recur_mode == "by_days" else []
+        due_time = f"{rnd.randrange(24):02d}:{rnd.choice((0, 30)):02d}" if rnd.random() < 0.3 else None
+        if due == today:
+            # задачи «на сегодня» — без времени, иначе они просрочатся в зависимости от часа запуска
+            due_time = None
+        out_goals.append({
+            "id": new_id(),
+            "order": (n + 1) * 1024.0,
+            "title": _title(rnd),
+            "due": due.isoformat(),
+            "type": _classify(due, today),
+            "category": rnd.choice(TASK_CATEGORIES),
+            "done": done,
+            "failed": failed,
+            "overdue": overdue_flag,
+            "stat": rnd.choice(STATS),
+            "recur_mode": recur_mode,
+            "recur_days": recur_days,
+            "due_time": due_time,
+            "time": None,
+        })
+
+    # --- глобальные цели: примерно одна на 20 задач
+    big_goals = []
+    for _ in range(max(1, goals // 20)):
+        due = start + timedelta(days=rnd.randrange(history_days + 365))
+        closed = due < today
+        done = closed and rnd.random() < 0.5
+        big_goals.append({
+            "id": new_id(),
+            "title": _title(rnd),
+            "due": due.isoformat(),
+            "done": done,
+            "failed": closed and not done,
+            "note": _title(rnd) if rnd.random() < 0.5 else "",
+        })
+
+    # --- привычки: история по запланированным дням (~75% успех, часть без отметок)
+    out_habits = []
+    for _ in range(habits):
+        days = sorted(rnd.sample(range(7), rnd.randint(2, 7)))
+        completions, failures = [], []
+        d = start
+        while d < today:
+            if d.weekday() in days:
+                r = rnd.random()
+                if r < 0.75:
+                    completions.append(d.isoformat())
+                elif r < 0.9:
+                    failures.append(d.isoformat())
+            d += timedelta(days=1)
+        out_habits.append({
+            "id": new_id(),
+            "title": _title(rnd),
+            "days": days,
+            "stat": rnd.choice(STATS),
+            "completions": completions,
+            "failures": failures,
+        })
+
+    # --- xp_log и дисциплина: активность в ~80% дней
+    xp_log = {}
+    discipline = []
+    total_xp = 0
+    d = start
+    while d <= today:
+        if rnd.random() < 0.8:
+            delta = rnd.choice((5, 10, 15, 25, 30, -5, -10, 70))
+            xp_log[d.isoformat()] = delta
+            total_xp += delta
+            if d < today and rnd.random() < 0.4:
+                discipline.append(d.isoformat())
+        d += timedelta(days=1)
+
+    total_xp = max(0, total_xp)
+    return {
+        "xp": total_xp,
+        "level": max(1, total_xp // 1000 + 1),
+        "stats": {s: round(rnd.uniform(0, 200), 1) for s in STATS},
+        "goals": out_goals,
+        "xp_log": xp_log,
+        "discipline_awarded_dates": discipline,
+        "big_goals": big_goals,
+        "habits": out_habits,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Сгенерировать синтетический профиль rpg_state (JSON в stdout).")
+    p.add_argument("--size", choices=sorted(SIZES), help="готовый размер (перекрывает --goals/--habits/--years)")
+    p.add_argument("--goals", type=int, default=500)
+    p.add_argument("--habits", type=int, default=15)
+    p.add_argument("--years", type=float, default=2)
+    p.add_argument("--overdue", type=float, default=0.002, help="доля активных задач с дедлайном в прошлом")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    params = SIZES[args.size] if args.size else {"goals": args.goals, "habits": args.habits, "years": args.years}
+    json.dump(generate_state(overdue=args.overdue, seed=args.seed, **params), sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# bench/rerun.py — сквозной замер полных перезапусков app.py через AppTest
+"""
+Гоняет app.py через streamlit.testing.v1.AppTest с in-memory Supabase:
+вход подменён (auth_user в session_state), состояние — синтетический профиль.
+Сценарий проходит по страницам Главная/Профиль/Цели/Привычки, выполняет и
+проваливает задачи, отмечает привычки. Для каждого действия печатается
+p50/p95 времени прогона скрипта, число элементов на странице и записей в БД.
+
+    python -m bench.rerun --sizes small,medium --rounds 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bench.fakes import InMemorySupabase, install_fake_supabase_module
+from bench.profiles import SIZES, generate_state
+from bench.runner import fmt_seconds, meta, write_results
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+USER_ID = "bench-user"
+
+# (название действия, какую кнопку нажать): ("key", k) — кнопка с точным ключом,
+# ("prefix", p) — первая кнопка, ключ которой начинается с p
+SCENARIO = [
+    ("home", ("key", "nav_home")),
+    ("today_done", ("prefix", "today_done_")),
+    ("today_fail", ("prefix", "today_fail_")),
+    ("active_done", ("prefix", "active_short_done_")),
+    ("profile", ("key", "nav_profile")),
+    ("profile_visual", ("key", "show_visual_btn")),
+    ("profile_hide_visual", ("key", "hide_visual_btn")),
+    ("profile_full_stats", ("key", "toggle_full_stats")),
+    ("profile_hide_stats", ("key", "toggle_full_stats")),
+    ("goals", ("key", "nav_goals")),
+    ("habits", ("key", "nav_habits")),
+    ("habit_done", ("prefix", "h_done_")),
+    ("habit_fail", ("prefix", "h_fail_")),
+]
+
+
+def count_elements(node) -> int:
+    children = getattr(node, "children", None) or {}
+    if isinstance(children, dict):
+        children = children.values()
+    return 1 + sum(count_elements(c) for c in children)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль по методу ближайшего ранга."""
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, int(round(q / 100 * len(s) + 0.5)) - 1))
+    return s[k]
+
+
+def _find_button(at, how):
+    kind, ref = how
+    for b in at.button:
+        key = b.key or ""
+        if (kind == "key" and key == ref) or (kind == "prefix" and key.startswith(ref)):
+            return b
+    return None
+
+
+def _new_app(client: InMemorySupabase, timeout: float):
+    from streamlit.testing.v1 import AppTest
+    import streamlit as st
+    import streamlit.logger
+
+    # предупреждения об устаревших аргументах на каждом прогоне только засоряют вывод
+    streamlit.logger.set_log_level("error")
+    install_fake_supabase_module(client)
+    # get_supabase() под st.cache_resource — иначе достанется клиент прошлого размера
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.secrets["SUPABASE_URL"] = "https://bench.supabase.co"
+    at.secrets["SUPABASE_ANON_KEY"] = "bench-anon-key"
+    at.session_state["auth_user"] = {"id": USER_ID}
+    return at
+
+
+def _writes(client: InMemorySupabase) -> int:
+    return client.calls["upsert"] + client.calls["update"]  # условная запись состояния — update
+
+
+def _timed_run(at, client: InMemorySupabase, action=None) -> dict:
+    writes_before = _writes(client)
+    t0 = time.perf_counter()
+    (action.click() if action is not None else at).run()
+    elapsed = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"app.py упал: {at.exception[0].value}")
+    return {
+        "time_s": elapsed,
+        "elements": count_elements(at._tree),
+        "writes": _writes(client) - writes_before,
+    }
+
+
+def run_size(size: str, rounds: int, timeout: float) -> list[dict]:
+    client = InMemorySupabase(USER_ID)
+    client.put_state(USER_ID, generate_state(**SIZES[size]))
+    at = _new_app(client, timeout)
+
+    samples: dict[str, list[dict]] = {"initial_load": [_timed_run(at, client)]}
+    for _ in range(rounds):
+        for name, how in SCENARIO:
+            btn = _find_button(at, how)
+            if btn is None:
+                continue  # например, задачи на сегодня уже закончились
+            samples.setdefault(name, []).append(_timed_run(at, client, btn))
+
+    out = []
+    for name, runs in samples.items():
+        times = [r["time_s"] for r in runs]
+        out.append({
+            "size": size,
+            "interaction": name,
+            "runs": len(runs),
+            "p50_s": percentile(times, 50),
+            "p95_s": percentile(times, 95),
+            "median_s": statistics.median(times),
+            "elements": round(statistics.mean(r["elements"] for r in runs)),
+            "writes": round(statistics.mean(r["writes"] for r in runs), 1),
+        })
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Замер полных перезапусков app.py через Streamlit AppTest.")
+    p.add_argument("--sizes", default="small,medium", help="через запятую: " + ",".join(SIZES))
+    p.add_argument("--rounds", type=int, default=5, help="сколько раз пройти сценарий")
+    p.add_argument("--timeout", type=float, default=120, help="таймаут одного прогона скрипта, с")
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/rerun-<commit>.json)")
+    args = p.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        p.error(f"неизвестные размеры: {', '.join(unknown)}")
+
+    results = []
+    print(f"{'size':>7} {'interaction':<22} {'p50':>10} {'p95':>10} {'elems':>6} {'writes':>6}")
+    for size in sizes:
+        for r in run_size(size, args.rounds, args.timeout):
+            results.append(r)
+            print(f"{size:>7} {r['interaction']:<22} {fmt_seconds(r['p50_s']):>10} "
+                  f"{fmt_seconds(r['p95_s']):>10} {r['elements']:>6} {r['writes']:>6}")
+
+    payload = {"meta": meta(), "sizes": {s: SIZES[s] for s in sizes}, "rounds": args.rounds, "results": results}
+    path = write_results("rerun", payload, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
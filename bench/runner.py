@@ -0,0 +1,91 @@
+# bench/runner.py — общий таймер и запись результатов в JSON
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def measure(fn, setup=None, repeat: int = 5, min_time: float = 0.05) -> dict:
+    """
+    Замеряет fn(): `repeat` выборок, в каждой fn вызывается `number` раз.
+    Если задан setup — он вызывается перед каждым запуском (вне замера), а number=1:
+    так меряются функции, которые меняют состояние.
+    """
+    number = 1
+    if setup is None:
+        # калибруем число повторов, чтобы выборка длилась хотя бы min_time
+        while True:
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - t0 >= min_time or number >= 1_000_000:
+                break
+            number *= 10
+
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def meta() -> dict:
+    info = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    try:
+        import streamlit
+        info["streamlit"] = streamlit.__version__
+    except Exception:
+        pass
+    return info
+
+
+def write_results(kind: str, payload: dict, out: str | None = None) -> Path:
+    """Сохраняет результаты в JSON (по умолчанию bench/results/<kind>-<commit>.json)."""
+    if out:
+        path = Path(out)
+    else:
+        path = RESULTS_DIR / f"{kind}-{payload['meta'].get('commit') or 'nogit'}.json"
+    os.makedirs(path.parent, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def fmt_seconds(s: float) -> str:
+    if s >= 1:
+        return f"{s:.2f} s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.2f} ms"
+    return f"{s * 1e6:.1f} µs"
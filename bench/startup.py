@@ -0,0 +1,106 @@
+# bench/startup.py — холодный старт: импорт приложения и первая отрисовка главной
+"""
+Каждый замер — в новом процессе Python, чтобы модули не были уже загружены:
+
+  import       — импорт модулей, которые тянет app.py (streamlit уже загружен);
+  first_paint  — первый прогон app.py через AppTest до готовой главной
+                 (вход подменён, профиль — синтетический заданного размера).
+
+Для каждого вида печатается медиана и список тяжёлых зависимостей
+(pandas, altair, xlsxwriter, numpy, pyarrow), которые оказались загружены.
+
+    python -m bench.startup --repeat 5 --size small
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench.runner import fmt_seconds, meta, write_results
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ["pandas", "altair", "xlsxwriter", "numpy", "pyarrow"]
+KINDS = ["import", "first_paint"]
+# то, что импортирует app.py до первой отрисовки
+APP_MODULES = [
+    "life_rpg.auth", "life_rpg.db", "life_rpg.logic", "life_rpg.report",
+    "life_rpg.state", "life_rpg.ui", "life_rpg.views",
+]
+
+
+def _child(kind: str, size: str) -> dict:
+    """Выполняется в отдельном процессе: один замер, результат — JSON в stdout."""
+    import importlib
+
+    import streamlit  # noqa: F401 — сам Streamlit в замер не входит
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    if kind == "import":
+        t0 = time.perf_counter()
+        for name in APP_MODULES:
+            importlib.import_module(name)
+        elapsed = time.perf_counter() - t0
+    else:
+        from bench.fakes import InMemorySupabase
+        from bench.profiles import SIZES, generate_state
+        from bench.rerun import USER_ID, _new_app
+
+        client = InMemorySupabase(USER_ID)
+        client.put_state(USER_ID, generate_state(**SIZES[size]))
+        at = _new_app(client, timeout=120)
+        t0 = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - t0
+        if at.exception:
+            raise RuntimeError(f"app.py упал: {at.exception[0].value}")
+    return {"time_s": elapsed, "loaded": [m for m in HEAVY if m in sys.modules]}
+
+
+def _spawn(kind: str, size: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "bench.startup", "--child", kind, "--size", size],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Холодный старт: импорт модулей и первая отрисовка главной.")
+    p.add_argument("--repeat", type=int, default=5, help="сколько новых процессов на каждый вид замера")
+    p.add_argument("--size", default="small", help="профиль для first_paint")
+    p.add_argument("--out", help="путь к JSON (по умолчанию bench/results/startup-<commit>.json)")
+    p.add_argument("--child", choices=KINDS, help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.size)))
+        return 0
+
+    results = []
+    print(f"{'op':<12} {'median':>10} {'min':>10}  загружены")
+    for kind in KINDS:
+        runs = [_spawn(kind, args.size) for _ in range(args.repeat)]
+        times = [r["time_s"] for r in runs]
+        r = {
+            "size": args.size,
+            "op": kind,
+            "median_s": statistics.median(times),
+            "min_s": min(times),
+            "repeat": args.repeat,
+            "loaded": runs[-1]["loaded"],
+        }
+        results.append(r)
+        print(f"{kind:<12} {fmt_seconds(r['median_s']):>10} {fmt_seconds(r['min_s']):>10}  "
+              f"{', '.join(r['loaded']) or '—'}")
+
+    path = write_results("startup", {"meta": meta(), "results": results}, args.out)
+    print(f"\nрезультаты: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Вспомогательные модули Жизненной RPG."""
@@ -0,0 +1,267 @@
+# life_rpg/api.py — JSON API для быстрых проверок с телефона
+"""
+Без Streamlit: один HTTP-запрос вместо полного перезапуска страницы.
+
+    GET  /api/<user_id>/today                  задачи и привычки на сегодня
+    GET  /api/<user_id>/stats                  уровень, XP, характеристики, серии
+    POST /api/<user_id>/goals/<id>/done|fail   выполнить / провалить задачу
+    POST /api/<user_id>/habits/<id>/done|fail  отметить привычку за сегодня
+
+Доступ — заголовок `Authorization: Bearer <api_token>`; токен создаётся в
+профиле (📱 API) и хранится в документе состояния.
+
+Изменения проходят через те же правила, что и кнопки страниц (settle_goals,
+habit_mark): документ загружается в st.session_state (life_rpg.headless),
+после правила serialize_state() пишется обратно — только если updated_at строки
+всё ещё тот, что был у прочитанного документа (иначе 409: игрок сохранил
+состояние в приложении, ночная обработка и т. п. — клиент повторяет запрос).
+Правила работают с общим на процесс st.session_state, поэтому запросы
+обрабатываются по одному (замок).
+
+GET отвечает с ETag, который считается по (виду, updated_at, сегодняшней дате)
+без чтения документа: при совпавшем If-None-Match — 304 после одного запроса
+вычисляемых колонок. Готовые ответы лежат в LRU по тому же ключу, а последний
+загруженный документ остаётся в st.session_state: следующий запрос того же
+игрока при неизменном updated_at не разбирает документ заново.
+
+    python -m life_rpg.api --db sqlite:///rpg.db --port 8503
+"""
+import argparse
+import hmac
+import json
+import sys
+import threading
+from datetime import date
+
+from life_rpg import clock
+from life_rpg.cache import LRUCache
+from life_rpg.ics import etag, not_modified
+
+JSON_MIME = "application/json; charset=utf-8"
+CACHE_ENTRIES = 1024
+CACHE_CONTROL = "private, no-cache"  # клиент хранит ответ, но каждый раз переспрашивает (дёшево: 304)
+VIEWS = ("today", "stats")
+
+
+# ===== ОТВЕТЫ ИЗ СОСТОЯНИЯ СЕССИИ =====
+def _goal_json(g: dict) -> dict:
+    return {
+        "id": g.get("id"),
+        "title": g["title"],
+        "due": g["due"].isoformat(),
+        "due_time": g.get("due_time"),
+        "type": g["type"],
+        "category": g.get("category", "Прочее"),
+        "stat": g["stat"],
+        "recur_mode": g.get("recur_mode", "none"),
+        "overdue": g.get("overdue", False),
+    }
+
+
+def today_view(on_date: date | None = None) -> dict:
+    """Как блок «Сегодня» на главной и список привычек: открытые задачи на дату и привычки по расписанию."""
+    import streamlit as st
+
+    from life_rpg.logic import habit_done_on_date, habit_failed_on_date, is_habit_scheduled_today
+    from life_rpg.state import goals_in_order
+
+    d = on_date or clock.today()
+    return {
+        "date": d.isoformat(),
+        "goals": [_goal_json(g) for g in goals_in_order() if g["due"] == d and not g["done"] and not g["failed"]],
+        "habits": [
+            {
+                "id": h.get("id"),
+                "title": h["title"],
+                "stat": h.get("stat", "Дисциплина 🎯"),
+                "done": habit_done_on_date(h, d),
+                "failed": habit_failed_on_date(h, d),
+            }
+            for h in st.session_state.habits
+            if is_habit_scheduled_today(h, d)
+        ],
+    }
+
+
+def stats_view() -> dict:
+    import streamlit as st
+
+    from life_rpg.leaderboard import habit_rate
+    from life_rpg.state import xp_series
+    from life_rpg.stats import _current_and_best_streak
+
+    ss = st.session_state
+    streak, best = _current_and_best_streak()
+    return {
+        "level": int(ss.level),
+        "xp": int(ss.xp),
+        "xp_week": int(xp_series().window_sum(7, clock.today())),
+        "stats": ss.stats,
+        "streak": streak,
+        "best_streak": best,
+        "habit_rate": habit_rate(ss.habits),
+    }
+
+
+def apply_action(kind: str, item_id: str, success: bool) -> int:
+    """Правило кнопки ✅/❌ над загруженным состоянием; возвращает HTTP-статус."""
+    from life_rpg.logic import habit_mark, settle_goals
+    from life_rpg.state import goal_by_id, habit_by_id
+
+    if kind == "goals":
+        g = goal_by_id(item_id)
+        if g is None:
+            return 404
+        if g["done"] or g["failed"]:
+            return 409  # уже закрыта: повтор запроса не начисляет XP второй раз
+        settle_goals([g], success)
+        return 200
+    h = habit_by_id(item_id)
+    if h is None:
+        return 404
+    habit_mark(h, success)
+    return 200
+
+
+def _render(view: str) -> bytes:
+    data = today_view() if view == "today" else stats_view()
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+# ===== WSGI =====
+class Api:
+    """WSGI-приложение API поверх хранилища с load_state/save_state_if/state_meta (SQLStore)."""
+
+    def __init__(self, store, cache_entries: int = CACHE_ENTRIES):
+        self.store = store
+        self.cache = LRUCache(cache_entries)  # (user_id, updated_at, вид, дата) → тело
+        self.builds = 0
+        self.lock = threading.Lock()  # st.session_state вне `streamlit run` — один на процесс
+        self.session: tuple | None = None  # (user_id, updated_at) документа в st.session_state
+
+    def clear(self):
+        """Забыть готовые ответы и загруженный документ."""
+        self.cache.clear()
+        self.session = None
+
+    def _load(self, user_id: str, updated_at) -> bool:
+        from life_rpg.headless import open_session
+
+        if self.session == (user_id, updated_at):
+            return True
+        self.session = None
+        data = self.store.load_state(user_id)
+        if data is None:
+            return False
+        open_session(data)
+        self.session = (user_id, data.get("updated_at"))
+        return True
+
+    def _body(self, user_id: str, updated_at, view: str, day: str) -> bytes | None:
+        def build():
+            if not self._load(user_id, updated_at):
+                return None
+            self.builds += 1
+            return _render(view)
+        return self.cache.get_or_build((user_id, updated_at, view, day), build)
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD", "GET")
+        parts = environ.get("PATH_INFO", "").strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "api":
+            return self._json(start_response, "404 Not Found", {"error": "not found"})
+        user_id = parts[1]
+
+        meta = self.store.state_meta(user_id)
+        token = environ.get("HTTP_AUTHORIZATION", "").removeprefix("Bearer ").strip()
+        # неверный токен неотличим от отсутствующего игрока
+        if not meta or not meta["api_token"] or not hmac.compare_digest(str(meta["api_token"]), token):
+            return self._json(start_response, "401 Unauthorized", {"error": "unauthorized"},
+                              [("WWW-Authenticate", "Bearer")])
+
+        with self.lock:
+            if len(parts) == 3 and parts[2] in VIEWS:
+                if method not in ("GET", "HEAD"):
+                    return self._json(start_response, "405 Method Not Allowed", {"error": "use GET"})
+                return self._get(start_response, environ, user_id, meta["updated_at"], parts[2], method)
+            if len(parts) == 5 and parts[2] in ("goals", "habits") and parts[4] in ("done", "fail"):
+                if method != "POST":
+                    return self._json(start_response, "405 Method Not Allowed", {"error": "use POST"})
+                return self._post(start_response, user_id, meta["updated_at"], parts[2], parts[3], parts[4] == "done")
+        return self._json(start_response, "404 Not Found", {"error": "not found"})
+
+    def _get(self, start_response, environ, user_id: str, updated_at, view: str, method: str):
+        day = clock.today().isoformat()
+        # ETag — от ключа ответа, а не от тела: для 304 документ не нужен
+        tag = etag(f"{view}|{updated_at}|{day}".encode("utf-8"))
+        headers = [("ETag", tag), ("Cache-Control", CACHE_CONTROL)]
+        if not_modified(tag, None, environ.get("HTTP_IF_NONE_MATCH"), None):
+            start_response("304 Not Modified", headers)
+            return [b""]
+        body = self._body(user_id, updated_at, view, day)
+        if body is None:
+            return self._json(start_response, "404 Not Found", {"error": "not found"})
+        start_response("200 OK", headers + [("Content-Type", JSON_MIME), ("Content-Length", str(len(body)))])
+        return [b"" if method == "HEAD" else body]
+
+    def _post(self, start_response, user_id: str, updated_at, kind: str, item_id: str, success: bool):
+        from life_rpg.persistence import serialize_state
+
+        if not self._load(user_id, updated_at):
+            return self._json(start_response, "404 Not Found", {"error": "not found"})
+        seen = self.session[1]  # версия загруженного документа (может быть новее meta)
+        self.session = None  # пока правило не записано, документ в сессии не совпадает с базой
+        status = apply_action(kind, item_id, success)
+        if status != 200:
+            self.session = (user_id, seen)  # правило ничего не меняло
+        if status == 404:
+            return self._json(start_response, "404 Not Found", {"error": f"no such {kind[:-1]}"})
+        if status == 409:
+            return self._json(start_response, "409 Conflict", {"error": "goal already closed"})
+        data = serialize_state()
+        if not self.store.save_state_if(user_id, data, seen):
+            return self._json(start_response, "409 Conflict", {"error": "state changed, retry"})
+        self.session = (user_id, data["updated_at"])
+        # в ответе — новый «сегодня» с его ETag: клиенту не нужен отдельный GET
+        day = clock.today().isoformat()
+        body = _render("today")
+        self.cache.get_or_build((user_id, data["updated_at"], "today", day), lambda: body)
+        tag = etag(f"today|{data['updated_at']}|{day}".encode("utf-8"))
+        start_response("200 OK", [("ETag", tag), ("Cache-Control", CACHE_CONTROL),
+                                  ("Content-Type", JSON_MIME), ("Content-Length", str(len(body)))])
+        return [body]
+
+    @staticmethod
+    def _json(start_response, status: str, payload: dict, extra: list | None = None):
+        body = json.dumps(payload).encode("utf-8")
+        start_response(status, [("Content-Type", JSON_MIME), ("Content-Length", str(len(body))), *(extra or [])])
+        return [body]
+
+
+def main(argv: list[str] | None = None) -> int:
+    from wsgiref.simple_server import make_server
+
+    from life_rpg.headless import init_process
+    from life_rpg.sqlstore import SQLStore
+
+    p = argparse.ArgumentParser(description="JSON API Жизненной RPG.")
+    p.add_argument("--db", required=True, help="sqlite:///путь.db или postgresql://…")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8503)
+    args = p.parse_args(argv)
+
+    init_process()
+    store = SQLStore(args.db)
+    try:
+        with make_server(args.host, args.port, Api(store)) as httpd:
+            print(f"API: http://{args.host}:{args.port}/api/<user_id>/today")
+            httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
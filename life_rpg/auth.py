@@ -0,0 +1,64 @@
+# life_rpg/auth.py — вход/регистрация через Supabase Auth
+import streamlit as st
+
+from life_rpg.db import client
+
+
+def auth_form():
+    st.header("🔐 Вход в аккаунт")
+    try:
+        mode = st.segmented_control("Режим", ["Войти", "Регистрация"], key="auth_mode")
+    except Exception:
+        mode = st.radio("Режим", ["Войти", "Регистрация"], key="auth_mode_radio")
+
+    email = st.text_input("Email", key="auth_email")
+    password = st.text_input("Пароль", type="password", key="auth_password")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        disabled = (mode != "Войти") or (not email or not password)
+        if st.button("Войти", use_container_width=True, disabled=disabled):
+            try:
+                res = client().auth.sign_in_with_password({"email": email, "password": password})
+                st.session_state.auth_user = res.user.model_dump()
+                st.success("Готово! Вошли.")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Не удалось войти: {e}")
+
+    with col2:
+        disabled = (mode != "Регистрация") or (not email or not password)
+        if st.button("Зарегистрироваться", use_container_width=True, disabled=disabled):
+            try:
+                res = client().auth.sign_up({"email": email, "password": password})
+                st.session_state.auth_user = res.user.model_dump()
+                st.success("Аккаунт создан, вы вошли.")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Не удалось зарегистрироваться: {e}")
+
+
+def current_user_id() -> str | None:
+    """UUID пользователя из Supabase Auth (или None, если не залогинен)."""
+    u = st.session_state.get("auth_user")
+    if u and u.get("id"):
+        return u["id"]
+    # пробуем восстановить сессию
+    try:
+        res = client().auth.get_user()
+        if res and res.user:
+            st.session_state.auth_user = res.user.model_dump()
+            return res.user.id
+    except Exception:
+        pass
+    return None
+
+
+def logout_button():
+    if st.sidebar.button("Выйти", key="btn_logout", use_container_width=True):
+        try:
+            client().auth.sign_out()
+        except Exception:
+            pass
+        st.session_state.pop("auth_user", None)
+        st.rerun()
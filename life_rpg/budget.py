@@ -0,0 +1,284 @@
+# life_rpg/budget.py — учёт и бюджет вызовов Supabase
+"""
+Клиент Supabase оборачивается в InstrumentedClient: каждый execute() запроса
+к таблице и каждый вызов auth.* считается и замеряется по перезапуску и по
+сессии, с разбивкой по виду (read/write/auth/rpc), таблице, операции и месту
+вызова в коде приложения (например, update_stat → rpg_state.upsert).
+
+Бюджет на один перезапуск задаётся переменной окружения или секретом
+SUPABASE_BUDGET, например "write=1,read=2,auth=1". При превышении пишется
+warning в лог (один раз на вид вызова за перезапуск).
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+log = logging.getLogger("life_rpg.budget")
+
+BUDGET_ENV = "SUPABASE_BUDGET"
+DEFAULT_BUDGET = {"write": 1, "read": 2, "auth": 2}
+WRITE_OPS = {"insert", "upsert", "update", "delete"}
+
+# функции-обёртки, которые пропускаем при поиске места вызова
+_PASS_THROUGH = {"db_save_state", "db_load_state", "db_state_version", "save_state", "load_state_if_exists", "wrapper"}
+_THIS_FILE = __file__
+
+
+class _Local(threading.local):
+    current = None  # RerunCalls активного перезапуска
+
+
+_local = _Local()
+
+
+def parse_budget(spec: str | None) -> dict[str, int]:
+    """'write=1,read=2' → {'write': 1, 'read': 2}; пустая строка — бюджет по умолчанию."""
+    if not spec:
+        return dict(DEFAULT_BUDGET)
+    out = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        try:
+            out[k.strip()] = int(v)
+        except ValueError:
+            log.warning("Не понял лимит в SUPABASE_BUDGET: %r", part)
+    return out
+
+
+def current_budget() -> dict[str, int]:
+    spec = os.environ.get(BUDGET_ENV)
+    if spec is None:
+        try:
+            spec = st.secrets.get(BUDGET_ENV)
+        except Exception:
+            spec = None
+    return parse_budget(spec)
+
+
+class CallStats:
+    """{(вид, таблица/цель, операция, место вызова): [число, секунд]}."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str, str, str], list] = {}
+
+    def add(self, key: tuple, seconds: float, count: int = 1):
+        row = self.rows.get(key)
+        if row is None:
+            self.rows[key] = [count, seconds]
+        else:
+            row[0] += count
+            row[1] += seconds
+
+    def merge(self, other: "CallStats"):
+        for key, (n, s) in other.rows.items():
+            self.add(key, s, n)
+
+    def by_kind(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for (kind, *_), (n, _s) in self.rows.items():
+            out[kind] = out.get(kind, 0) + n
+        return out
+
+    def worst(self, limit: int = 10) -> list[dict]:
+        items = sorted(self.rows.items(), key=lambda kv: (kv[1][0], kv[1][1]), reverse=True)
+        return [
+            {"kind": k[0], "target": k[1], "op": k[2], "origin": k[3], "calls": n, "seconds": s}
+            for k, (n, s) in items[:limit]
+        ]
+
+
+class RerunCalls:
+    """Вызовы одного перезапуска + проверка бюджета на лету."""
+
+    def __init__(self, budget: dict[str, int]):
+        self.stats = CallStats()
+        self.budget = budget
+        self.counts: dict[str, int] = {}
+        self.violations: list[str] = []
+
+    def record(self, kind: str, target: str, op: str, seconds: float, origin: str):
+        self.stats.add((kind, target, op, origin), seconds)
+        n = self.counts.get(kind, 0) + 1
+        self.counts[kind] = n
+        limit = self.budget.get(kind)
+        if limit is not None and n == limit + 1:
+            msg = (f"Бюджет Supabase превышен: {n} вызовов «{kind}» за перезапуск "
+                   f"(лимит {limit}); последний — {origin} → {target}.{op}")
+            self.violations.append(msg)
+            log.warning(msg)
+
+
+def _origin() -> str:
+    """Имя первой функции приложения выше по стеку (минуя обёртки сохранения/загрузки)."""
+    f = sys._getframe(2)
+    while f is not None:
+        code = f.f_code
+        if code.co_filename != _THIS_FILE and code.co_name not in _PASS_THROUGH:
+            if code.co_name == "<module>":
+                return os.path.basename(code.co_filename)  # верхний уровень скрипта
+            return code.co_name
+        f = f.f_back
+    return "?"
+
+
+def _record(kind: str, target: str, op: str, seconds: float):
+    cur = _local.current
+    if cur is None:
+        return  # вызов вне перезапуска (например, из фонового потока)
+    cur.record(kind, target, op, seconds, _origin())
+
+
+class _QueryProxy:
+    """Обёртка над построителем запроса postgrest: запоминает операцию, замеряет execute()."""
+
+    __slots__ = ("_q", "_table", "_op")
+
+    def __init__(self, q, table: str, op: str = "select"):
+        self._q = q
+        self._table = table
+        self._op = op
+
+    def __getattr__(self, name):
+        attr = getattr(self._q, name)
+        if not callable(attr):
+            return attr
+        op = name if name in WRITE_OPS or name == "select" else self._op
+
+        def call(*args, **kwargs):
+            res = attr(*args, **kwargs)
+            # цепочки .eq(...).order(...) возвращают новый построитель — оборачиваем и его
+            if hasattr(res, "execute"):
+                return _QueryProxy(res, self._table, op)
+            return res
+        return call
+
+    def execute(self):
+        t0 = time.perf_counter()
+        try:
+            return self._q.execute()
+        finally:
+            kind = "write" if self._op in WRITE_OPS else "read"
+            _record(kind, self._table, self._op, time.perf_counter() - t0)
+
+
+class _AuthProxy:
+    __slots__ = ("_auth",)
+
+    def __init__(self, auth):
+        self._auth = auth
+
+    def __getattr__(self, name):
+        attr = getattr(self._auth, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                _record("auth", "auth", name, time.perf_counter() - t0)
+        return call
+
+
+class InstrumentedClient:
+    """Прокси клиента Supabase со счётчиками вызовов."""
+
+    def __init__(self, client):
+        self._client = client
+        self.auth = _AuthProxy(client.auth)
+
+    def table(self, name: str):
+        return _QueryProxy(self._client.table(name), name)
+
+    from_ = table
+
+    def rpc(self, fn: str, *args, **kwargs):
+        return _QueryProxy(self._client.rpc(fn, *args, **kwargs), fn, "rpc")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument(client) -> InstrumentedClient:
+    return client if isinstance(client, InstrumentedClient) else InstrumentedClient(client)
+
+
+# ---------- жизненный цикл перезапуска ----------
+def _finalize(rc: RerunCalls):
+    ss = st.session_state
+    total = ss.setdefault("sb_session_stats", CallStats())
+    total.merge(rc.stats)
+    ss.sb_reruns = ss.get("sb_reruns", 0) + 1
+    ss.sb_last_rerun = dict(rc.counts)
+    if rc.violations:
+        hist = ss.setdefault("sb_violations", deque(maxlen=20))
+        hist.extend(rc.violations)
+
+
+def start_rerun():
+    ss = st.session_state
+    prev = ss.pop("sb_rerun_open", None)
+    if prev is not None:
+        # прошлый перезапуск оборвался на st.rerun() — его вызовы тоже учитываем
+        _finalize(prev)
+    rc = RerunCalls(current_budget())
+    ss.sb_rerun_open = rc
+    _local.current = rc
+
+
+def finish_rerun():
+    rc = _local.current
+    _local.current = None
+    if rc is None:
+        return
+    st.session_state.pop("sb_rerun_open", None)
+    _finalize(rc)
+
+
+def render_panel():
+    """Сводка вызовов Supabase за сессию (показывается вместе с панелью трассировки)."""
+    ss = st.session_state
+    stats: CallStats | None = ss.get("sb_session_stats")
+    with st.sidebar.expander("📡 Вызовы Supabase", expanded=False):
+        if not stats or not stats.rows:
+            st.caption("Вызовов пока не было.")
+            return
+        reruns = max(1, ss.get("sb_reruns", 1))
+        kinds = stats.by_kind()
+        st.caption(
+            f"Перезапусков: {reruns} · "
+            + " · ".join(f"{k}: {n} ({n / reruns:.1f}/перезапуск)" for k, n in sorted(kinds.items()))
+        )
+        last = ss.get("sb_last_rerun") or {}
+        st.caption("Последний перезапуск: " + (", ".join(f"{k}={n}" for k, n in sorted(last.items())) or "—"))
+        st.caption("Бюджет: " + ", ".join(f"{k}≤{v}" for k, v in sorted(current_budget().items())))
+        st.markdown("**Главные источники вызовов**")
+        st.dataframe(
+            [
+                {
+                    "Место": w["origin"],
+                    "Вызов": f"{w['target']}.{w['op']}",
+                    "Вид": w["kind"],
+                    "Число": w["calls"],
+                    "Время, мс": round(w["seconds"] * 1000, 1),
+                }
+                for w in stats.worst()
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        viol = list(ss.get("sb_violations", []))
+        if viol:
+            st.markdown("**Превышения бюджета**")
+            for v in viol[-5:]:
+                st.caption("⚠️ " + v)
@@ -0,0 +1,68 @@
+# life_rpg/cache.py — мемоизация данных и спецификаций графиков в рамках сессии
+"""
+Графики профиля строятся из состояния, которое меняется только при сохранении.
+Поэтому данные и vega-lite спецификации кэшируются по ключу
+(вид графика, ревизия состояния, ...) — ревизию увеличивает save_state().
+Кэш — LRU с ограниченным числом записей на сессию: старые ревизии вытесняются.
+"""
+from collections import OrderedDict
+
+import streamlit as st
+
+CACHE_KEY = "chart_cache"
+MAX_ENTRIES = 32
+
+
+class LRUCache:
+    """Простой LRU поверх OrderedDict."""
+
+    __slots__ = ("data", "maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int = MAX_ENTRIES):
+        self.data: OrderedDict = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            value = build()
+            self.data[key] = value
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+            return value
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def drop(self, predicate) -> int:
+        """Удаляет записи, ключ которых подходит под predicate; возвращает их число."""
+        keys = [k for k in self.data if predicate(k)]
+        for k in keys:
+            del self.data[k]
+        return len(keys)
+
+    def clear(self):
+        self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+
+def session_cache() -> LRUCache:
+    cache = st.session_state.get(CACHE_KEY)
+    if cache is None:
+        cache = st.session_state[CACHE_KEY] = LRUCache()
+    return cache
+
+
+def state_revision() -> int:
+    return st.session_state.get("state_rev", 0)
+
+
+def memo(kind: str, build, *extra):
+    """Значение build() для (kind, ревизия состояния, *extra), пересчитывается только при изменениях."""
+    return session_cache().get_or_build((kind, state_revision(), *extra), build)
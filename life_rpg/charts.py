@@ -0,0 +1,163 @@
+# life_rpg/charts.py — спецификации графиков (Altair → vega-lite)
+"""
+pandas и altair импортируются внутри функций: они нужны только для визуализации
+в профиле, а на импорт обоих уходит ~0.8 с — на главной их не ждём.
+Тепловые карты привычек собираются словарём vega-lite без них.
+"""
+from datetime import date
+
+import streamlit as st
+
+from life_rpg.constants import WEEKDAY_LABELS
+from life_rpg.state import xp_series
+
+
+def pie_spec(counter_like, title="Диаграмма"):
+    """Vega-lite спецификация пончиковой диаграммы (или None, если данных нет)."""
+    import altair as alt
+    import pandas as pd
+    alt.data_transformers.disable_max_rows()
+    try:
+        items = list(counter_like.items())
+    except AttributeError:
+        items = list(counter_like)
+
+    df = pd.DataFrame(items, columns=["label", "value"])
+    if df.empty or (df["value"].fillna(0).astype(float).sum() == 0):
+        return None
+
+    df = df[df["value"].fillna(0).astype(float) > 0]
+    chart = (
+        alt.Chart(df)
+        .mark_arc(innerRadius=60)
+        .encode(
+            theta=alt.Theta("value:Q", stack=True),
+            color=alt.Color("label:N", legend=alt.Legend(title=None)),
+            tooltip=[alt.Tooltip("label:N", title="Категория"), alt.Tooltip("value:Q", title="Значение")],
+        )
+        .properties(title=title)
+    )
+    return chart.to_dict()
+
+
+def bar_spec(mapping: dict, x_title: str = "", y_title: str = ""):
+    """Vega-lite спецификация столбчатой диаграммы {подпись: значение} в порядке ключей."""
+    import altair as alt
+    import pandas as pd
+    alt.data_transformers.disable_max_rows()
+    df = pd.DataFrame({"label": [str(k) for k in mapping.keys()], "value": list(mapping.values())})
+    chart = (
+        alt.Chart(df)
+        .mark_bar()
+        .encode(
+            x=alt.X("label:N", sort=None, title=x_title or None),
+            y=alt.Y("value:Q", title=y_title or None),
+            tooltip=[alt.Tooltip("label:N", title=x_title or "Категория"), alt.Tooltip("value:Q", title=y_title or "Значение")],
+        )
+    )
+    return chart.to_dict()
+
+
+def show_chart(spec, title="Диаграмма"):
+    """Рисует готовую спецификацию; для None — подпись об отсутствии данных."""
+    if spec is None:
+        st.caption(f"ℹ️ Нет данных для: {title}.")
+        return
+    st.vega_lite_chart(spec, use_container_width=True)
+
+
+def pie_from_counter(counter_like, title="Диаграмма"):
+    """Пончиковая диаграмма через Altair с защитой от пустых данных."""
+    show_chart(pie_spec(counter_like, title), title)
+
+
+def _xp_last_7_days_df():
+    """Возвращает DataFrame (date, XP) за последние 7 дней (из ряда xp_series())."""
+    import pandas as pd
+    if st.session_state.get("xp_log") is None:
+        return None
+    days = xp_series().window(7)
+    return pd.DataFrame({"date": pd.to_datetime([d for d, _ in days]), "XP": [float(v) for _, v in days]})
+
+
+def _xp_line_spec(xp_df):
+    """Линия XP по дням (или None, если данных нет)."""
+    import altair as alt
+    if xp_df is None or xp_df.empty:
+        return None
+    chart = (
+        alt.Chart(xp_df)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("date:T", title=None, axis=alt.Axis(format="%d.%m")),
+            y=alt.Y("XP:Q"),
+            tooltip=[alt.Tooltip("date:T", title="Дата", format="%d.%m.%Y"), alt.Tooltip("XP:Q")],
+        )
+    )
+    return chart.to_dict()
+
+
+# ===== ТЕПЛОВЫЕ КАРТЫ ПРИВЫЧЕК =====
+# спецификации vega-lite собираются словарём напрямую — без altair/pandas,
+# клетки (366 на год) уже посчитаны в life_rpg.heatmap
+HABIT_STATUS_COLORS = {
+    "выполнено": "#2ea043",
+    "провалено": "#da3633",
+    "пропущено": "#6e4b16",
+    "сегодня": "#d29922",
+    "запланировано": "#30363d",
+    "не по плану": "#161b22",
+}
+
+
+def _heatmap_base(cells: list[dict], year: int, height: int) -> dict:
+    """Сетка неделя × день недели; клетка — {"i": день года, ...}, остальное считает vega-lite."""
+    offset = date(year, 1, 1).weekday()
+    labels = "[" + ",".join(f"'{d}'" for d in WEEKDAY_LABELS) + "]"
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "data": {"values": cells},
+        "transform": [
+            {"calculate": f"floor((datum.i + {offset}) / 7)", "as": "w"},
+            {"calculate": f"(datum.i + {offset}) % 7", "as": "wd"},
+            {"calculate": f"datetime({year}, 0, 1 + datum.i)", "as": "date"},
+        ],
+        "mark": {"type": "rect", "cornerRadius": 2, "stroke": "#0d1117", "strokeWidth": 2},
+        "height": height,
+        "encoding": {
+            "x": {"field": "w", "type": "ordinal", "axis": None},
+            "y": {"field": "wd", "type": "ordinal",
+                  "axis": {"title": None, "labelExpr": f"{labels}[datum.value]", "ticks": False, "domain": False}},
+        },
+        "config": {"view": {"stroke": None}},
+    }
+
+
+def habit_heatmap_spec(cells: list[dict], year: int) -> dict:
+    spec = _heatmap_base(cells, year, 110)
+    spec["encoding"]["color"] = {
+        "field": "s", "type": "nominal",
+        "scale": {"domain": list(HABIT_STATUS_COLORS), "range": list(HABIT_STATUS_COLORS.values())},
+        "legend": {"orient": "bottom", "title": None},
+    }
+    spec["encoding"]["tooltip"] = [
+        {"field": "date", "type": "temporal", "format": "%d.%m.%Y", "title": "Дата"},
+        {"field": "s", "type": "nominal", "title": "Статус"},
+    ]
+    return spec
+
+
+def aggregate_heatmap_spec(cells: list[dict], year: int) -> dict:
+    spec = _heatmap_base(cells, year, 130)
+    spec["transform"].append({"calculate": "datum.done / datum.planned", "as": "rate"})
+    spec["encoding"]["color"] = {
+        "field": "rate", "type": "quantitative",
+        "scale": {"domain": [0, 1], "scheme": "greens"},
+        "legend": {"orient": "bottom", "title": "Доля выполненных", "format": ".0%"},
+    }
+    spec["encoding"]["tooltip"] = [
+        {"field": "date", "type": "temporal", "format": "%d.%m.%Y", "title": "Дата"},
+        {"field": "done", "type": "quantitative", "title": "Выполнено"},
+        {"field": "planned", "type": "quantitative", "title": "Запланировано"},
+    ]
+    return spec
@@ -0,0 +1,34 @@
+# life_rpg/clock.py — текущие дата и время для игровых правил
+"""
+Правила (просрочки, бонус дисциплины, годовой сброс) берут «сейчас» отсюда,
+а не из date.today()/datetime.now() напрямую: ночная обработка
+(life_rpg.nightly) и бенчмарки подставляют фиксированный момент через use_clock().
+"""
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+MOSCOW = ZoneInfo("Europe/Moscow")
+
+_fixed: datetime | None = None  # момент, подставленный через use_clock() (aware)
+
+
+def use_clock(at: datetime | None):
+    """Зафиксировать «сейчас»; наивное время — в часовом поясе сервера. None — снова системные часы."""
+    global _fixed
+    _fixed = None if at is None else at.astimezone()
+
+
+def now() -> datetime:
+    """Локальное время сервера без tzinfo — как datetime.now()."""
+    if _fixed is None:
+        return datetime.now()
+    return _fixed.astimezone().replace(tzinfo=None)
+
+
+def today() -> date:
+    return now().date()
+
+
+def moscow_now() -> datetime:
+    """Текущее время в часовом поясе МСК."""
+    return datetime.now(MOSCOW) if _fixed is None else _fixed.astimezone(MOSCOW)
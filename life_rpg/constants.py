@@ -0,0 +1,24 @@
+# life_rpg/constants.py — базовые настройки игры
+STATE_FILE = "state.json"
+
+GOAL_TYPES = {"Краткосрочная": 5, "Среднесрочная": 25, "Долгосрочная": 70}
+XP_PER_LEVEL = 1000
+WEEKDAY_LABELS = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
+CATEGORIES = ["Работа", "Личное", "Семья", "Прочее", "Проекты"]
+
+HABIT_XP = 10
+
+# постраничный вывод длинных списков задач
+PAGE_SIZES = [10, 25, 50, 100]
+PAGE_SIZE_DEFAULT = 25
+
+# xp_log: по дням храним последние N дней, более старые — помесячными суммами (xp_rollup)
+XP_LOG_KEEP_DAYS = 90
+
+BIG_GOAL_XP = 250
+BIG_GOAL_STAT_BONUS = 10
+
+# значения полей формы добавления задачи/привычки (используются и импортом)
+STAT_NAMES = ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"]
+TASK_CATEGORIES = ["Работа", "Учёба", "Дом", "Здоровье", "Хобби", "Другое"]
+RECUR_MODES = ["none", "daily", "weekly", "by_days"]
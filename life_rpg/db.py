@@ -0,0 +1,171 @@
+# life_rpg/db.py — клиент Supabase, таблицы rpg_state, rpg_reports и rpg_leaderboard
+"""
+Клиент создаётся один раз на процесс (st.cache_resource) и оборачивается
+счётчиками вызовов (life_rpg.budget). Бенчмарки и фоновые задачи могут
+подставить свой клиент через use_client(). Фоновой задаче кэшированный
+клиент сессии не передаётся: у него авторизация того игрока, который вошёл
+последним, — для неё job_client() создаёт отдельный.
+"""
+import base64
+
+import streamlit as st
+
+from life_rpg import budget
+from life_rpg.leaderboard import COLUMNS, METRICS, rank_column
+from life_rpg.tracing import traced
+
+_client_override = None  # клиент, подставленный через use_client()
+
+
+@st.cache_resource
+def get_supabase():
+    from supabase import create_client
+
+    url = st.secrets.get("SUPABASE_URL", "").strip()
+    key = st.secrets.get("SUPABASE_ANON_KEY", "").strip()  # <-- ВАЖНО: ANON
+    if not (url.startswith("https://") and ".supabase.co" in url):
+        st.error("❗ SUPABASE_URL не задан/неверный (Manage app → Settings → Secrets).")
+        st.stop()
+    if not key:
+        st.error("❗ SUPABASE_ANON_KEY не задан (Settings → Secrets).")
+        st.stop()
+    # все вызовы идут через прокси со счётчиками (см. life_rpg/budget.py)
+    return budget.instrument(create_client(url, key))
+
+
+def use_client(c):
+    """Подставить свой клиент (in-memory в бенчмарках); None — вернуть Supabase из секретов."""
+    global _client_override
+    _client_override = None if c is None else budget.instrument(c)
+
+
+def client():
+    if _client_override is not None:
+        return _client_override
+    return get_supabase()
+
+
+def job_client():
+    """
+    Отдельный клиент для фоновой задачи (вызывать в потоке скрипта).
+
+    С SUPABASE_SERVICE_ROLE_KEY в секретах — сервисный клиент (обходит RLS);
+    без него — новый клиент с anon-ключом и access-токеном текущего игрока,
+    снятым в момент постановки в очередь: вход другого игрока в том же
+    процессе его уже не подменит.
+    """
+    if _client_override is not None:
+        return _client_override
+    from supabase import create_client
+
+    url = st.secrets.get("SUPABASE_URL", "").strip()
+    service_key = st.secrets.get("SUPABASE_SERVICE_ROLE_KEY", "").strip()
+    if service_key:
+        return budget.instrument(create_client(url, service_key))
+    session = client().auth.get_session()
+    if session is None:
+        raise RuntimeError("нет сессии игрока для фоновой задачи")
+    c = create_client(url, st.secrets.get("SUPABASE_ANON_KEY", "").strip())
+    c.postgrest.auth(session.access_token)
+    return budget.instrument(c)
+
+
+# версия документа rpg_state — его updated_at (как вычисляемая колонка у ленты и API)
+STATE_VERSION = "data->>updated_at"
+
+
+@traced
+def db_save_state(user_id: str, data: dict, seen: str | None = None) -> bool:
+    """
+    seen — updated_at документа, который сессия прочитала или записала последней:
+    строка обновляется, только если он не изменился (иначе False — документ
+    переписали API, другая вкладка или ночная обработка). seen=None — строки
+    ещё нет или документ старый, без updated_at: обычный upsert.
+    """
+    if seen is None:
+        client().table("rpg_state").upsert({"user_id": user_id, "data": data}).execute()
+        return True
+    res = client().table("rpg_state").update({"data": data}).eq("user_id", user_id).eq(STATE_VERSION, seen).execute()
+    return bool(res.data)
+
+
+@traced
+def db_state_version(user_id: str) -> str | None:
+    """updated_at документа в базе без чтения самого документа."""
+    res = client().table("rpg_state").select(f"updated_at:{STATE_VERSION}").eq("user_id", user_id).execute()
+    return res.data[0]["updated_at"] if res.data else None
+
+
+@traced
+def db_load_state(user_id: str) -> dict | None:
+    res = client().table("rpg_state").select("data").eq("user_id", user_id).execute()
+    if res.data:
+        return res.data[0]["data"]
+    return None
+
+
+# ===== ГОДОВЫЕ ОТЧЁТЫ (таблица rpg_reports) =====
+# строка на (user_id, year): status pending/ready/failed, snapshot — состояние
+# на момент сброса (пока отчёт не собран), content — xlsx в base64, dismissed —
+# модалка закрыта. Фоновая задача передаёт клиент явно (sb), т.к. работает вне
+# потока скрипта.
+REPORTS_TABLE = "rpg_reports"
+
+
+@traced
+def db_save_report(user_id: str, year: int, fields: dict, sb=None):
+    (sb or client()).table(REPORTS_TABLE).upsert(
+        {"user_id": user_id, "year": year, **fields}, on_conflict="user_id,year"
+    ).execute()
+
+
+def _report_row(user_id: str, year: int, cols: str, sb=None) -> dict | None:
+    res = (sb or client()).table(REPORTS_TABLE).select(cols).eq("user_id", user_id).eq("year", year).execute()
+    return res.data[0] if res.data else None
+
+
+@traced
+def db_report_meta(user_id: str, year: int) -> dict | None:
+    """Только status/dismissed — без содержимого отчёта."""
+    return _report_row(user_id, year, "status,dismissed")
+
+
+@traced
+def db_report_snapshot(user_id: str, year: int, sb=None) -> dict | None:
+    row = _report_row(user_id, year, "snapshot", sb)
+    return row and row.get("snapshot")
+
+
+@traced
+def db_report_content(user_id: str, year: int) -> bytes | None:
+    row = _report_row(user_id, year, "content")
+    return base64.b64decode(row["content"]) if row and row.get("content") else None
+
+
+# ===== РЕЙТИНГ (таблица rpg_leaderboard) =====
+# строки и места пишет только ночная обработка; здесь — чтение по индексам мест
+LEADERBOARD_TABLE = "rpg_leaderboard"
+LEADERBOARD_COLS = ",".join(COLUMNS + tuple(rank_column(m) for m in METRICS))
+
+
+@traced
+def db_leaderboard_page(metric: str, first: int, last: int) -> list[dict]:
+    """Строки с местами first..last по метрике (диапазон по индексу, без OFFSET)."""
+    col = rank_column(metric)
+    res = (client().table(LEADERBOARD_TABLE).select(LEADERBOARD_COLS)
+           .gte(col, first).lte(col, last).order(col).execute())
+    return res.data
+
+
+@traced
+def db_leaderboard_size(metric: str) -> int:
+    """Число игроков в рейтинге — последнее место по метрике."""
+    col = rank_column(metric)
+    res = client().table(LEADERBOARD_TABLE).select(col).order(col, desc=True).limit(1).execute()
+    return int(res.data[0][col] or 0) if res.data else 0
+
+
+@traced
+def db_leaderboard_row(user_id: str) -> dict | None:
+    res = client().table(LEADERBOARD_TABLE).select(LEADERBOARD_COLS).eq("user_id", user_id).execute()
+    return res.data[0] if res.data else None
@@ -0,0 +1,158 @@
+# life_rpg/export.py — выгрузка всей истории в CSV/Parquet по запросу
+"""
+Вся история игрока — пять таблиц:
+
+  xp_daily      — день, ΔXP, накопленный XP (дни без изменений пропускаются;
+                  дни старше XP_LOG_KEEP_DAYS уже свёрнуты и есть только в xp_monthly);
+  xp_monthly    — месяц, ΔXP за все месяцы истории (свёртка + дневной ряд);
+  goals         — задачи и их исход (done/failed/overdue/open);
+  big_goals     — глобальные цели и их исход;
+  habit_events  — по строке на каждое выполнение/провал привычки.
+
+Строки таблиц выдают генераторы, писатели забирают их кусками по CHUNK_ROWS
+и сразу пишут в свой член ZIP-архива (csv.writer / pyarrow.parquet.ParquetWriter).
+В памяти одновременно — только текущий кусок, архив собирается во временном
+файле (SpooledTemporaryFile уходит на диск после SPOOL_BYTES).
+"""
+import csv
+import importlib.util
+import io
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from itertools import islice
+
+CHUNK_ROWS = 10_000
+SPOOL_BYTES = 8 * 1024 * 1024
+
+FORMATS = {"csv": "CSV", "parquet": "Parquet"}
+
+# колонки и типы (для Parquet) каждой таблицы
+TABLES = {
+    "xp_daily": [("date", "date"), ("xp_delta", "int"), ("xp_total", "int")],
+    "xp_monthly": [("month", "str"), ("xp_delta", "int")],
+    "goals": [
+        ("id", "str"), ("title", "str"), ("due", "date"), ("due_time", "str"), ("type", "str"),
+        ("category", "str"), ("stat", "str"), ("recur_mode", "str"), ("status", "str"),
+    ],
+    "big_goals": [("id", "str"), ("title", "str"), ("due", "date"), ("status", "str"), ("note", "str")],
+    "habit_events": [("habit_id", "str"), ("title", "str"), ("stat", "str"), ("date", "date"), ("event", "str")],
+}
+
+
+def parquet_available() -> bool:
+    """Parquet пишет pyarrow — необязательная зависимость, проверяем без импорта."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+# ---------- строки таблиц ----------
+def _status(item: dict) -> str:
+    if item.get("done"):
+        return "done"
+    if item.get("failed"):
+        return "failed"
+    if item.get("overdue"):
+        return "overdue"
+    return "open"
+
+
+def _as_date(value) -> date | None:
+    if isinstance(value, date) or value is None:
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def xp_rows(series, base: int = 0):
+    """Из DailyXPSeries: накопленная сумма берётся из префиксных сумм ряда
+    (base — XP свёрнутых месяцев до начала ряда)."""
+    if series.start is None:
+        return
+    prefix = series.prefix
+    for i, v in enumerate(series.values):
+        if v:
+            yield series.start + timedelta(days=i), v, base + prefix[i + 1]
+
+
+def goal_rows(goals):
+    for g in goals:
+        yield (g.get("id"), g.get("title", ""), _as_date(g.get("due")), g.get("due_time"), g.get("type"),
+               g.get("category"), g.get("stat"), g.get("recur_mode", "none"), _status(g))
+
+
+def big_goal_rows(big_goals):
+    for g in big_goals:
+        yield g.get("id"), g.get("title", ""), _as_date(g.get("due")), _status(g), g.get("note", "")
+
+
+def habit_event_rows(habits):
+    for h in habits:
+        hid, title, stat = h.get("id"), h.get("title", ""), h.get("stat")
+        for event, key in (("done", "completions"), ("failed", "failures")):
+            for d in sorted(h.get(key, []), key=str):
+                yield hid, title, stat, _as_date(d), event
+
+
+def history_tables(goals, big_goals, habits, history) -> dict:
+    """name → генератор строк (в порядке колонок TABLES[name]); history — XPHistory."""
+    return {
+        "xp_daily": xp_rows(history.daily, history.rolled_total()),
+        "xp_monthly": iter(history.monthly()),
+        "goals": goal_rows(goals),
+        "big_goals": big_goal_rows(big_goals),
+        "habit_events": habit_event_rows(habits),
+    }
+
+
+def _chunks(rows, size: int = CHUNK_ROWS):
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+# ---------- писатели ----------
+def _write_csv(member, name: str, rows):
+    text = io.TextIOWrapper(member, encoding="utf-8-sig", newline="")
+    w = csv.writer(text)
+    w.writerow([c for c, _ in TABLES[name]])
+    for chunk in _chunks(rows):
+        w.writerows(chunk)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(member, name: str, rows):
+    import pyarrow as pa  # лениво: необязательная зависимость, нужна только для Parquet
+    import pyarrow.parquet as pq
+
+    types = {"str": pa.string(), "int": pa.int64(), "date": pa.date32()}
+    cols = TABLES[name]
+    schema = pa.schema([(c, types[t]) for c, t in cols])
+    with pq.ParquetWriter(member, schema) as writer:
+        for chunk in _chunks(rows):
+            # один кусок — одна row group
+            arrays = [pa.array([r[i] for r in chunk], type=schema.field(i).type) for i in range(len(cols))]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+
+def write_history(out, fmt: str, tables: dict):
+    """Пишет ZIP с таблицами (name.csv или name.parquet) в бинарный файл out."""
+    if fmt not in FORMATS:
+        raise ValueError(f"неизвестный формат: {fmt}")
+    write = _write_csv if fmt == "csv" else _write_parquet
+    # Parquet уже сжат внутри — повторно не жмём
+    compression = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(out, "w", compression=compression) as zf:
+        for name, rows in tables.items():
+            with zf.open(f"{name}.{fmt}", "w", force_zip64=True) as member:
+                write(member, name, rows)
+
+
+def export_history(fmt: str, goals, big_goals, habits, history) -> bytes:
+    """Архив истории целиком (bytes для st.download_button)."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as tmp:
+        write_history(tmp, fmt, history_tables(goals, big_goals, habits, history))
+        tmp.seek(0)
+        return tmp.read()
@@ -0,0 +1,111 @@
+# life_rpg/feed.py — календарная лента (.ics) по ссылке для телефонов
+"""
+Календари опрашивают ленту каждые несколько минут, поэтому опрос без изменений
+почти бесплатен:
+
+  1. из rpg_state читаются только вычисляемые колонки ics_token и updated_at
+     (документ не читается и не разбирается);
+  2. календарь собирается заново, только если updated_at изменился, —
+     готовые тексты лежат в LRU по (user_id, updated_at);
+  3. клиенту с совпавшим ETag / If-Modified-Since отвечаем 304 без тела.
+
+Ссылка: GET /ics/<user_id>/<ics_token>.ics; токен создаётся в профиле
+(📅 Календарь) и хранится в документе состояния. Запуск:
+
+    python -m life_rpg.feed --db sqlite:///rpg.db --port 8502
+"""
+import argparse
+import hmac
+import sys
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from life_rpg.cache import LRUCache
+from life_rpg.ics import ICS_MIME, build_calendar, etag, http_date, not_modified, parse_updated
+from life_rpg.sqlstore import SQLStore
+
+CACHE_ENTRIES = 1024
+CACHE_CONTROL = "private, max-age=300"
+
+
+class Feed:
+    """WSGI-приложение ленты поверх SQLStore."""
+
+    def __init__(self, store: SQLStore, cache_entries: int = CACHE_ENTRIES):
+        self.store = store
+        self.cache = LRUCache(cache_entries)  # (user_id, updated_at) → (ETag, тело)
+        self.builds = 0
+
+    def _calendar(self, user_id: str, updated_at) -> tuple[str, bytes] | None:
+        def build():
+            data = self.store.load_state(user_id)
+            if data is None:
+                return None
+            self.builds += 1
+            body = build_calendar(data.get("goals", []), data.get("big_goals", []), data.get("habits", []),
+                                  parse_updated(updated_at)).encode("utf-8")
+            return etag(body), body
+        return self.cache.get_or_build((user_id, updated_at), build)
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD", "GET")
+        parts = environ.get("PATH_INFO", "").strip("/").split("/")
+        if method not in ("GET", "HEAD") or len(parts) != 3 or parts[0] != "ics" or not parts[2].endswith(".ics"):
+            return self._plain(start_response, "404 Not Found")
+        user_id, token = parts[1], parts[2][:-len(".ics")]
+
+        meta = self.store.state_meta(user_id)
+        # неверный токен неотличим от отсутствующего игрока
+        if not meta or not meta["ics_token"] or not hmac.compare_digest(str(meta["ics_token"]), token):
+            return self._plain(start_response, "404 Not Found")
+
+        found = self._calendar(user_id, meta["updated_at"])
+        if found is None:
+            return self._plain(start_response, "404 Not Found")
+        tag, body = found
+        updated = parse_updated(meta["updated_at"])
+        headers = [("ETag", tag), ("Cache-Control", CACHE_CONTROL)]
+        if updated is not None:
+            headers.append(("Last-Modified", http_date(updated)))
+
+        if not_modified(tag, updated, environ.get("HTTP_IF_NONE_MATCH"), environ.get("HTTP_IF_MODIFIED_SINCE")):
+            start_response("304 Not Modified", headers)
+            return [b""]
+        headers += [("Content-Type", ICS_MIME), ("Content-Length", str(len(body))),
+                    ("Content-Disposition", 'inline; filename="life_rpg.ics"')]
+        start_response("200 OK", headers)
+        return [b"" if method == "HEAD" else body]
+
+    @staticmethod
+    def _plain(start_response, status: str):
+        start_response(status, [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", "0")])
+        return [b""]
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, code="-", size="-"):
+        # в журнал не пишем путь: в нём токен ленты
+        if str(code) not in ("200", "304"):
+            sys.stderr.write(f"{self.command} {code}\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Календарная лента (.ics) Жизненной RPG.")
+    p.add_argument("--db", required=True, help="sqlite:///путь.db или postgresql://…")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8502)
+    args = p.parse_args(argv)
+
+    store = SQLStore(args.db)
+    try:
+        with make_server(args.host, args.port, Feed(store), handler_class=_QuietHandler) as httpd:
+            print(f"лента: http://{args.host}:{args.port}/ics/<user_id>/<token>.ics")
+            httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# life_rpg/headless.py — правила приложения вне `streamlit run`
+"""
+Ночная обработка (life_rpg.nightly) и JSON API (life_rpg.api) вызывают те же
+функции logic/report, что и страницы. Вне `streamlit run` st.session_state —
+обычный словарь процесса (один на процесс, не потокобезопасный): перед каждым
+игроком он очищается и заполняется из документа состояния.
+
+save_state() внутри правил в базу не пишет (persistence.detach()) —
+вызывающий сам забирает serialize_state() и пишет его (пачкой или сразу).
+"""
+from datetime import datetime
+
+
+def init_process(at: datetime | None = None):
+    """Один раз на процесс: без предупреждений о session_state, без записи из save_state();
+    at — зафиксировать «сейчас»."""
+    import streamlit.logger
+    from streamlit import config
+
+    from life_rpg import clock, persistence
+
+    # вне `streamlit run` каждое обращение к st.session_state пишет предупреждение.
+    # Конфиг разбираем заранее: при разборе streamlit сам выставляет уровень логгеров
+    config.get_option("logger.level")
+    config.set_option("global.showWarningOnDirectExecution", False)
+    streamlit.logger.set_log_level("error")
+    persistence.detach()
+    if at is not None:
+        clock.use_clock(at)
+
+
+def open_session(data: dict):
+    """Очищает st.session_state и загружает в него документ состояния игрока."""
+    import streamlit as st
+
+    from life_rpg.persistence import deserialize_state
+    from life_rpg.state import _bootstrap_state
+
+    ss = st.session_state
+    for k in list(ss.keys()):
+        del ss[k]
+    _bootstrap_state()
+    deserialize_state(data)
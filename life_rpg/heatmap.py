@@ -0,0 +1,122 @@
+# life_rpg/heatmap.py — годовые битовые карты привычек для календаря-«тепловой карты»
+"""
+Для каждой привычки и года строятся три битовые маски (int, бит i — день
+года i, 1 января = 0): выполнено, провалено, запланировано (по дням недели).
+Маски собираются один раз из completions/failures и кэшируются по ревизии
+привычки (habit_revision); клетки календаря и спецификации графиков — тоже.
+Сводная карта считает по дням, сколько привычек выполнено из запланированных.
+"""
+import calendar
+from datetime import date
+from functools import lru_cache
+
+from life_rpg.memory import as_dates
+
+
+class YearBits:
+    __slots__ = ("year", "done", "failed", "scheduled")
+
+    def __init__(self, year: int, scheduled: int):
+        self.year = year
+        self.done = 0
+        self.failed = 0
+        self.scheduled = scheduled
+
+
+def habit_revision(h: dict) -> tuple:
+    """Ключ кэша: rev меняют все правки привычки (logic.touch_habit), длины — страховка."""
+    return h.get("rev", 0), len(h.get("completions", [])), len(h.get("failures", []))
+
+
+def days_in_year(year: int) -> int:
+    return 366 if calendar.isleap(year) else 365
+
+
+@lru_cache(maxsize=256)
+def scheduled_mask(year: int, weekdays: frozenset) -> int:
+    """Маска дней года, выпадающих на weekdays (0 = Пн)."""
+    first = date(year, 1, 1).weekday()
+    mask = 0
+    for i in range(days_in_year(year)):
+        if (first + i) % 7 in weekdays:
+            mask |= 1 << i
+    return mask
+
+
+def _created(h: dict) -> date | None:
+    try:
+        return date.fromisoformat(str(h["created"])[:10]) if h.get("created") else None
+    except ValueError:
+        return None
+
+
+class HabitBits:
+    """Маски привычки по годам. start — дата создания привычки (как у расписания в календаре,
+    life_rpg.ics), у старых сохранений без неё — первая отметка: раньше start дни не считаются
+    запланированными, иначе всё прошлое было бы «пропущено»."""
+
+    __slots__ = ("weekdays", "start", "years")
+
+    def __init__(self, h: dict, today: date):
+        self.weekdays = frozenset(h.get("days", []))
+        self.years: dict[int, YearBits] = {}
+        marks = []
+        for field, key in (("done", "completions"), ("failed", "failures")):
+            marks += [(field, d) for d in as_dates(h.get(key, []))]
+        self.start = _created(h) or min((d for _, d in marks), default=today)
+        for field, d in marks:
+            bits = self.year(d.year)
+            setattr(bits, field, getattr(bits, field) | (1 << (d.timetuple().tm_yday - 1)))
+
+    def year(self, year: int) -> YearBits:
+        bits = self.years.get(year)
+        if bits is None:
+            if year < self.start.year:
+                mask = 0
+            else:
+                mask = scheduled_mask(year, self.weekdays)
+                if year == self.start.year:
+                    mask &= ~((1 << (self.start.timetuple().tm_yday - 1)) - 1)
+            bits = self.years[year] = YearBits(year, mask)
+        return bits
+
+
+def _flags(mask: int, n: int) -> str:
+    """Маска → строка '0'/'1' по дням (индекс = день года)."""
+    return format(mask, f"0{n}b")[::-1][:n]
+
+
+def habit_cells(bits: YearBits, today: date) -> list[dict]:
+    """Клетки календаря привычки: {"i": день года, "s": статус}; неделю и дату считает vega-lite."""
+    year, n = bits.year, days_in_year(bits.year)
+    done, failed, sched = _flags(bits.done, n), _flags(bits.failed, n), _flags(bits.scheduled, n)
+    start = date(year, 1, 1)
+    # индекс сегодняшнего дня в этом году: для прошлых лет — за концом, для будущих — до начала
+    t = (today - start).days if today.year == year else (n if today.year > year else -1)
+    cells = []
+    for i in range(n):
+        if done[i] == "1":
+            s = "выполнено"
+        elif failed[i] == "1":
+            s = "провалено"
+        elif sched[i] == "1":
+            s = "пропущено" if i < t else ("сегодня" if i == t else "запланировано")
+        else:
+            s = "не по плану"
+        cells.append({"i": i, "s": s})
+    return cells
+
+
+def aggregate_cells(all_bits: list[YearBits], year: int) -> list[dict]:
+    """Сводные клетки: сколько привычек выполнено из запланированных (дни без плана пропускаем)."""
+    n = days_in_year(year)
+    done = [0] * n
+    planned = [0] * n
+    for bits in all_bits:
+        for counts, mask in ((done, bits.done), (planned, bits.scheduled | bits.done | bits.failed)):
+            flags = _flags(mask, n)
+            i = flags.find("1")
+            while i != -1:
+                counts[i] += 1
+                i = flags.find("1", i + 1)
+    return [{"i": i, "done": done[i], "planned": planned[i]} for i in range(n) if planned[i]]
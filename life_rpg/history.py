@@ -0,0 +1,330 @@
+# life_rpg/history.py — отмена и повтор действий (↩️ / ↪️)
+"""
+Каждое действие с задачей, глобальной целью или привычкой (выполнить,
+провалить, отметить, удалить) записывается как обратимая дельта — только то,
+что оно поменяло:
+
+  ["num", "xp", d] / ["num", "stats", имя, d] / ["num", "xp_log", день, d]
+                        — прибавки; отмена вычитает (характеристики — не ниже 0)
+  ["set", "level", было, стало]
+  ["field", вид, id, поле, было, стало]
+  ["add" | "del", вид, id, поле, значение]   — отметки в списках (completions…)
+  ["item", вид, id, индекс, элемент]        — удалённый элемент целиком
+
+Дельты, а не копии состояния: между действием и отменой могут пройти
+авто-правила (штрафы за просрочку, ночная обработка), и отмена не должна
+стирать их результат. Поэтому числа отменяются вычитанием, а поле
+возвращается, только если с тех пор его никто не менял (иначе пропускается).
+Отмена на много шагов назад — те же маленькие дельты по очереди: правила
+заново не выполняются.
+
+Стеки undo/redo живут в st.session_state.history и сохраняются вместе с
+документом состояния; размер ограничен по числу действий и по байтам.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import streamlit as st
+
+from life_rpg import clock
+from life_rpg.memory import DayList
+
+HISTORY_MAX_OPS = 50            # действий в стеке отмены
+HISTORY_MAX_BYTES = 64 * 1024   # и не больше стольких байт JSON дельт в нём
+
+
+class _Local(threading.local):
+    depth = 0  # вложенность recording(): вложенное действие — часть внешнего
+
+
+_local = _Local()
+
+
+def empty_history() -> dict:
+    return {"undo": [], "redo": []}
+
+
+def load_history(raw) -> dict:
+    """История из документа состояния (старые сохранения — пустая)."""
+    if not isinstance(raw, dict):
+        return empty_history()
+    return {k: [e for e in raw.get(k) or [] if isinstance(e, dict) and e.get("ops")] for k in ("undo", "redo")}
+
+
+def _history() -> dict:
+    h = st.session_state.get("history")
+    if not isinstance(h, dict):
+        h = st.session_state.history = empty_history()
+    return h
+
+
+# ===== СНИМОК ДО/ПОСЛЕ ДЕЙСТВИЯ =====
+def _enc(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, DayList):
+        return value.iso()
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _dec(field: str, value):
+    if field == "due" and isinstance(value, str):
+        return date.fromisoformat(value)
+    if field in ("completions", "failures") and isinstance(value, list):
+        return DayList.lazy(value)
+    return value
+
+
+def _enc_item(item: dict) -> dict:
+    # rev — служебная ревизия кэша календаря привычки, в базу не пишется
+    return {k: _enc(v) for k, v in item.items() if k != "rev"}
+
+
+def _snap(value):
+    # в снимке — копии, а не ISO-строки: у привычки тысячи дат, а в дельту попадут одна-две
+    if isinstance(value, DayList):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _snap_item(item: dict) -> dict:
+    return {k: _snap(v) for k, v in item.items() if k != "rev"}
+
+
+def _capture(items: dict[str, list]) -> dict:
+    ss = st.session_state
+    day = clock.today().isoformat()
+    snap = {
+        "xp": int(ss.get("xp", 0)),
+        "level": int(ss.get("level", 1)),
+        "stats": dict(ss.get("stats", {})),
+        "day": day,
+        "xp_day": int(ss.get("xp_log", {}).get(day, 0)),
+        "items": {},
+    }
+    for kind, tracked in items.items():
+        ids = {it.get("id") for it in tracked if it.get("id")}
+        if not ids:
+            continue
+        snap["items"][kind] = {
+            it["id"]: (i, _snap_item(it)) for i, it in enumerate(ss.get(kind, [])) if it.get("id") in ids
+        }
+    return snap
+
+
+def _list_ops(kind: str, gid, field: str, a, b) -> list:
+    """add/del для списка: разности множеств, порядок (как в списке) — только у найденного."""
+    days = isinstance(a, DayList) and isinstance(b, DayList)
+    # даты привычки — по ordinal, без ISO-строк на весь список
+    a, b = (a.ordinals(), b.ordinals()) if days else (_enc(a), _enc(b))
+    sa, sb = set(a), set(b)
+    added, removed = sb - sa, sa - sb
+    ops = []
+    if added:
+        ops += [["add", kind, gid, field, v] for v in b if v in added]
+    if removed:
+        ops += [["del", kind, gid, field, v] for v in a if v in removed]
+    if days:
+        for op in ops:
+            op[4] = date.fromordinal(op[4]).isoformat()
+    return ops
+
+
+def _diff(before: dict, after: dict) -> list:
+    ops = []
+    if after["xp"] != before["xp"]:
+        ops.append(["num", "xp", after["xp"] - before["xp"]])
+    if after["xp_day"] != before["xp_day"]:
+        ops.append(["num", "xp_log", before["day"], after["xp_day"] - before["xp_day"]])
+    if after["level"] != before["level"]:
+        ops.append(["set", "level", before["level"], after["level"]])
+    for name in sorted(set(before["stats"]) | set(after["stats"])):
+        d = round(after["stats"].get(name, 0) - before["stats"].get(name, 0), 2)
+        if d:
+            ops.append(["num", "stats", name, d])
+
+    for kind, was in before["items"].items():
+        now = after["items"].get(kind, {})
+        for gid, (index, old) in was.items():
+            if gid not in now:
+                ops.append(["item", kind, gid, index, _enc_item(old)])
+                continue
+            new = now[gid][1]
+            for field in sorted(set(old) | set(new)):
+                a, b = old.get(field), new.get(field)
+                if a == b:
+                    continue
+                if isinstance(a, (list, DayList)) and isinstance(b, (list, DayList)):
+                    ops += _list_ops(kind, gid, field, a, b)
+                else:
+                    ops.append(["field", kind, gid, field, _enc(a), _enc(b)])
+    return ops
+
+
+@contextmanager
+def recording(label: str, goals=(), big_goals=(), habits=()):
+    """
+    Записывает действие в историю:
+        with recording("✅ Выполнено: «…»", goals=[g]):
+            ...
+    Элементы, которые действие может поменять или удалить, передаются явно.
+    """
+    if _local.depth:
+        yield
+        return
+    tracked = {"goals": list(goals), "big_goals": list(big_goals), "habits": list(habits)}
+    before = _capture(tracked)
+    h = _history()
+    _local.depth += 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+    ops = _diff(before, _capture(tracked))
+    # состояние перечитано из базы (запись не прошла, life_rpg.persistence) — действия нет
+    if ops and _history() is h:
+        _push({"label": label, "at": clock.now().isoformat(timespec="seconds"), "ops": ops})
+
+
+def _push(entry: dict):
+    entry["size"] = len(json.dumps(entry["ops"], ensure_ascii=False))
+    h = _history()
+    h["undo"].append(entry)
+    h["redo"].clear()
+    total = sum(e.get("size", 0) for e in h["undo"])
+    while h["undo"] and (len(h["undo"]) > HISTORY_MAX_OPS or total > HISTORY_MAX_BYTES):
+        total -= h["undo"].pop(0).get("size", 0)
+
+
+# ===== ПРИМЕНЕНИЕ ДЕЛЬТ =====
+def _apply(ops: list, sign: int) -> int:
+    """sign=-1 — отменить, +1 — повторить. Возвращает число пропущенных (конфликтных) изменений."""
+    from life_rpg.logic import touch_habit
+    from life_rpg.state import ensure_xp_log_dict, xp_series
+
+    ss = st.session_state
+    skipped = 0
+    touched_habits = set()
+    for op in (reversed(ops) if sign < 0 else ops):
+        tag = op[0]
+        if tag == "num" and op[1] == "xp":
+            ss.xp = int(ss.xp) + sign * int(op[2])
+        elif tag == "num" and op[1] == "xp_log":
+            ensure_xp_log_dict()
+            day, d = op[2], sign * int(op[3])
+            xp_series().add(date.fromisoformat(day), d)  # до записи в лог — как в add_xp
+            value = int(ss.xp_log.get(day, 0)) + d
+            if value:
+                ss.xp_log[day] = value
+            else:
+                ss.xp_log.pop(day, None)
+        elif tag == "num" and op[1] == "stats":
+            ss.stats[op[2]] = max(0, round(ss.stats.get(op[2], 0) + sign * float(op[3]), 2))
+        elif tag == "set" and op[1] == "level":
+            expect, target = (op[3], op[2]) if sign < 0 else (op[2], op[3])
+            if int(ss.level) != expect:
+                skipped += 1
+                continue
+            ss.level = target
+            if target < expect:
+                ss.levelup_pending = False
+        elif tag == "item":
+            kind, gid, index, item = op[1:]
+            items = ss.get(kind, [])
+            present = any(it.get("id") == gid for it in items)
+            if sign < 0 and not present:
+                restored = {k: _dec(k, v) for k, v in item.items()}
+                ss[kind] = items[:index] + [restored] + items[index:]
+            elif sign > 0 and present:
+                ss[kind] = [it for it in items if it.get("id") != gid]
+        else:
+            kind, gid, field = op[1:4]
+            it = next((x for x in ss.get(kind, []) if x.get("id") == gid), None)
+            if it is None:
+                skipped += 1
+                continue
+            if tag == "field":
+                expect, target = (op[5], op[4]) if sign < 0 else (op[4], op[5])
+                if _enc(it.get(field)) != expect:
+                    skipped += 1
+                    continue
+                it[field] = _dec(field, target)
+            else:
+                add = (tag == "add") == (sign > 0)
+                values = it.setdefault(field, [])
+                if add and op[4] not in values:
+                    values.append(op[4])
+                elif not add and op[4] in values:
+                    values.remove(op[4])
+            if kind == "habits":
+                touched_habits.add(gid)
+    for h in ss.get("habits", []):
+        if h.get("id") in touched_habits:
+            touch_habit(h)
+    return skipped
+
+
+def _step(source: str, target: str, sign: int) -> tuple[dict | None, int]:
+    from life_rpg.persistence import deferred_save, save_state
+
+    h = _history()
+    if not h[source]:
+        return None, 0
+    entry = h[source].pop()
+    with deferred_save():
+        skipped = _apply(entry["ops"], sign)
+        h[target].append(entry)
+        save_state()
+    return entry, skipped
+
+
+def undo() -> tuple[dict | None, int]:
+    """Отменяет последнее действие: (запись или None, если отменять нечего; пропущено изменений)."""
+    return _step("undo", "redo", -1)
+
+
+def redo() -> tuple[dict | None, int]:
+    return _step("redo", "undo", +1)
+
+
+def undo_to(n: int) -> int:
+    """Отменяет n последних действий одной записью в базу; возвращает число пропущенных изменений."""
+    from life_rpg.persistence import deferred_save
+
+    skipped = 0
+    with deferred_save():
+        for _ in range(n):
+            entry, s = undo()
+            if entry is None:
+                break
+            skipped += s
+    return skipped
+
+
+def depth(entry: dict) -> int | None:
+    """Сколько последних действий отменить, чтобы отменить entry; None — его уже нет в списке.
+    Ищется по самой записи, а не по номеру: после действий во фрагментах список в боковой
+    панели отстаёт до полного перезапуска, и номер указывал бы на другое действие."""
+    undo = _history()["undo"]
+    for i in range(len(undo) - 1, -1, -1):
+        if undo[i] is entry:
+            return len(undo) - i
+    return None
+
+
+def recent(n: int = 10) -> list[tuple[str, datetime | None, dict]]:
+    """Последние действия для показа (новые сверху): (подпись, время, запись)."""
+    out = []
+    for e in reversed(_history()["undo"][-n:]):
+        try:
+            at = datetime.fromisoformat(e.get("at", ""))
+        except ValueError:
+            at = None
+        out.append((e.get("label", ""), at, e))
+    return out
@@ -0,0 +1,188 @@
+# life_rpg/ics.py — календарь iCalendar (RFC 5545) из задач, глобальных целей и привычек
+"""
+В календарь попадают открытые задачи и глобальные цели и расписания привычек.
+Повторяющиеся задачи и привычки — одно событие с RRULE, а не развёрнутые даты:
+
+  daily   → FREQ=DAILY
+  weekly  → FREQ=WEEKLY (день недели дедлайна)
+  by_days → FREQ=WEEKLY;BYDAY=MO,WE,…
+  привычка → FREQ=WEEKLY;BYDAY=… от первого дня по расписанию после её создания
+             (или первой отметки); у старых привычек без того и другого — после
+             updated_at документа
+
+Время «плавающее» (без часового пояса) — как due_time в приложении: 09:00 — это
+09:00 там, где сейчас телефон. Задача без времени — событие на весь день.
+
+Текст календаря зависит только от документа состояния (DTSTAMP — его updated_at),
+поэтому ETag — хэш текста: пока состояние не менялось, он тот же.
+"""
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from life_rpg.export import _as_date
+from life_rpg.memory import as_dates
+
+ICS_MIME = "text/calendar; charset=utf-8"
+BYDAY = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+EVENT_MINUTES = 30  # длительность события задачи со временем
+
+
+def _escape(text) -> str:
+    return (str(text or "").replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Строки длиннее 75 октетов переносятся (CRLF + пробел), не разрывая символы UTF-8."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, cur, size = [], [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > 75:
+            parts.append("".join(cur))
+            cur, size = [], 1  # продолжение начинается с пробела
+        cur.append(ch)
+        size += n
+    parts.append("".join(cur))
+    return "\r\n ".join(parts)
+
+
+def _stamp(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _parse_time(value) -> tuple[int, int] | None:
+    try:
+        hh, mm = str(value).split(":")[:2]
+        return int(hh), int(mm)
+    except (TypeError, ValueError):
+        return None
+
+
+def _when(day: date, time_str) -> list[str]:
+    """DTSTART/DTEND: со временем — плавающее время, без — весь день."""
+    hm = _parse_time(time_str) if time_str else None
+    if hm is None:
+        return [f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}"]
+    start = datetime(day.year, day.month, day.day, *hm)
+    return [f"DTSTART:{start:%Y%m%dT%H%M%S}", f"DTEND:{start + timedelta(minutes=EVENT_MINUTES):%Y%m%dT%H%M%S}"]
+
+
+def _goal_rrule(g: dict, due: date) -> str | None:
+    mode = g.get("recur_mode", "none")
+    if mode == "daily":
+        return "RRULE:FREQ=DAILY"
+    if mode == "weekly":
+        return "RRULE:FREQ=WEEKLY"
+    if mode == "by_days":
+        days = sorted(set(g.get("recur_days") or [])) or [due.weekday()]
+        return "RRULE:FREQ=WEEKLY;BYDAY=" + ",".join(BYDAY[d] for d in days)
+    return None
+
+
+def _event(uid: str, stamp: str, summary: str, when: list[str], *extra: str) -> list[str]:
+    return ["BEGIN:VEVENT", f"UID:{uid}@life-rpg", f"DTSTAMP:{stamp}",
+            f"SUMMARY:{_escape(summary)}", *when, *[e for e in extra if e], "END:VEVENT"]
+
+
+def _habit_start(days: list[int], anchor: date) -> date:
+    """Первый день по расписанию привычки начиная с anchor."""
+    for step in range(7):
+        d = anchor + timedelta(days=step)
+        if d.weekday() in days:
+            return d
+    return anchor
+
+
+def _habit_anchor(h: dict, fallback: date) -> date:
+    """Постоянная дата начала расписания: создание привычки, иначе самая ранняя отметка.
+    DTSTART не должен сдвигаться с каждым сохранением — иначе календарь телефона
+    заново разворачивает серию и теряет её исключения."""
+    created = _as_date(h.get("created"))
+    if created is not None:
+        return created
+    first = min((d for key in ("completions", "failures") for d in as_dates(h.get(key) or [])), default=None)
+    return first or fallback
+
+
+def build_calendar(goals, big_goals, habits, updated: datetime | None = None) -> str:
+    """Текст .ics. Даты — date или ISO-строки (подходят и session_state, и документ из базы).
+    updated — время изменения состояния: DTSTAMP всех событий (и начало расписания привычек,
+    у которых нет ни даты создания, ни отметок)."""
+    updated = updated or datetime(1970, 1, 1, tzinfo=timezone.utc)
+    stamp = _stamp(updated)
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//life-rpg//calendar//RU",
+             "CALSCALE:GREGORIAN", "METHOD:PUBLISH", "X-WR-CALNAME:Жизненная RPG"]
+
+    for g in goals:
+        if g.get("done") or g.get("failed") or not g.get("id"):
+            continue
+        due = _as_date(g.get("due"))
+        if due is None:
+            continue
+        lines += _event(
+            g["id"], stamp, g.get("title", ""), _when(due, g.get("due_time") or g.get("time")),
+            _goal_rrule(g, due),
+            f"CATEGORIES:{_escape(g['category'])}" if g.get("category") else "",
+            f"DESCRIPTION:{_escape(' · '.join(str(v) for v in (g.get('type'), g.get('stat')) if v))}",
+        )
+
+    for g in big_goals:
+        if g.get("done") or g.get("failed") or not g.get("id"):
+            continue
+        due = _as_date(g.get("due"))
+        if due is None:
+            continue
+        lines += _event(g["id"], stamp, f"🎯 {g.get('title', '')}", _when(due, None),
+                        f"DESCRIPTION:{_escape(g['note'])}" if g.get("note") else "")
+
+    fallback = updated.date()
+    for h in habits:
+        days = sorted(set(h.get("days") or []))
+        if not days or not h.get("id"):
+            continue
+        lines += _event(h["id"], stamp, f"📆 {h.get('title', '')}", _when(_habit_start(days, _habit_anchor(h, fallback)), None),
+                        "RRULE:FREQ=WEEKLY;BYDAY=" + ",".join(BYDAY[d] for d in days),
+                        f"DESCRIPTION:{_escape(h['stat'])}" if h.get("stat") else "")
+
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+def parse_updated(value) -> datetime | None:
+    """updated_at документа (ISO, UTC) → datetime; старые сохранения без поля — None."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+# ===== ВАЛИДАТОРЫ HTTP =====
+def etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def http_date(dt: datetime) -> str:
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified(tag: str, updated: datetime | None, if_none_match: str | None,
+                 if_modified_since: str | None) -> bool:
+    """Условный GET: If-None-Match главнее If-Modified-Since (RFC 9110, 13.2.2)."""
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or tag in tags
+    if if_modified_since and updated is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return updated.replace(microsecond=0) <= since
+    return False
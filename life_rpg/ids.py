@@ -0,0 +1,83 @@
+# life_rpg/ids.py — постоянные идентификаторы и ключи порядка
+"""
+У каждой задачи, глобальной цели и привычки есть постоянный "id" (uuid4 hex):
+он сохраняется в базу, поэтому ключи виджетов не меняются между перезагрузками.
+
+Порядок задач задаётся дробным ключом "order": список отображается
+отсортированным по нему, а перемещение ⬆️/⬇️ меняет только order у одной
+задачи (середина между соседями) вместо перестановки в общем списке.
+"""
+import uuid
+
+ORDER_STEP = 1024.0
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex
+
+
+def ensure_id(item: dict) -> str:
+    gid = item.get("id")
+    if not gid:
+        gid = item["id"] = new_id()
+    return gid
+
+
+def ensure_ids(items: list[dict]) -> bool:
+    """Выдаёт id элементам без него. True — если что-то поменялось (нужно сохранить)."""
+    changed = False
+    for it in items:
+        if not it.get("id"):
+            it["id"] = new_id()
+            changed = True
+    return changed
+
+
+def next_order(items: list[dict]) -> float:
+    """Ключ порядка для нового элемента в конце списка."""
+    top = max((it["order"] for it in items if it.get("order") is not None), default=0.0)
+    return top + ORDER_STEP
+
+
+def ensure_order(items: list[dict]) -> bool:
+    """Элементам без order (старые сохранения) — ключи после максимального, в порядке списка."""
+    changed = False
+    top = None
+    for it in items:
+        if it.get("order") is None:
+            if top is None:
+                top = next_order(items) - ORDER_STEP
+            top += ORDER_STEP
+            it["order"] = top
+            changed = True
+    return changed
+
+
+def renumber(items: list[dict]):
+    """Равномерно перенумеровывает order по текущему порядку сортировки."""
+    for i, it in enumerate(sorted(items, key=order_key), start=1):
+        it["order"] = i * ORDER_STEP
+
+
+def order_key(item: dict) -> float:
+    return item.get("order") or 0.0
+
+
+def order_between(lo: float | None, hi: float | None) -> float | None:
+    """Ключ строго между lo и hi (None — край списка); None, если зазор исчерпан."""
+    if lo is None and hi is None:
+        return ORDER_STEP
+    if lo is None:
+        return hi - ORDER_STEP
+    if hi is None:
+        return lo + ORDER_STEP
+    mid = (lo + hi) / 2
+    # зазор исчерпан, когда середина округляется к соседу: для больших ключей (≈1e7 и выше)
+    # шаг float больше любого фиксированного порога — проверяем саму середину
+    if not lo < mid < hi:
+        return None
+    return mid
+
+
+def index_by_id(items: list[dict]) -> dict[str, dict]:
+    return {it["id"]: it for it in items if it.get("id")}
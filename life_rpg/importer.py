@@ -0,0 +1,292 @@
+# life_rpg/importer.py — потоковый импорт задач и привычек из CSV/JSON
+"""
+Файл читается построчно (CSV, JSON Lines) или по одному объекту из JSON-массива,
+каждая запись проверяется по тем же полям, что даёт форма добавления:
+
+  задача:   kind=goal (по умолчанию), title, due, category, stat,
+            recur_mode (none/daily/weekly/by_days), recur_days, due_time (HH:MM)
+  привычка: kind=habit, title, days, stat
+
+Дни недели — числа 0..6 (Пн=0) или подписи «Пн,Ср,Пт»; дата — YYYY-MM-DD
+или DD-MM-YYYY. Ошибки собираются по номерам строк, валидные записи
+добавляются в состояние одним сохранением (commit()).
+"""
+import codecs
+import csv
+import json
+from datetime import date, datetime
+
+from life_rpg import clock, ids
+from life_rpg.constants import RECUR_MODES, STAT_NAMES, TASK_CATEGORIES, WEEKDAY_LABELS
+from life_rpg.logic import classify_by_due
+from life_rpg.memory import DayList
+
+MAX_ERRORS = 200          # подробно храним первые ошибки, остальные только считаем
+JSON_CHUNK = 64 * 1024
+MAX_JSON_RECORD = 1024 * 1024  # символов на один объект JSON-массива: дальше буфер не растёт
+
+
+class ImportResult:
+    __slots__ = ("goals", "habits", "errors", "error_count", "rows")
+
+    def __init__(self):
+        self.goals: list[dict] = []
+        self.habits: list[dict] = []
+        self.errors: list[tuple[int, str]] = []
+        self.error_count = 0
+        self.rows = 0
+
+    def add_error(self, row: int, msg: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((row, msg))
+
+
+# ---------- чтение ----------
+def _text_lines(fileobj, encoding="utf-8-sig"):
+    """Строки бинарного файла без чтения его целиком."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buf = ""
+    for chunk in iter(lambda: fileobj.read(JSON_CHUNK), b""):
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        yield from (line + "\n" for line in lines)
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf
+
+
+def _iter_csv(fileobj):
+    reader = csv.DictReader(_text_lines(fileobj))
+    for rec in reader:
+        # номер строки файла (с заголовком) — как видит пользователь в редакторе
+        yield reader.line_num, rec
+
+
+def _iter_json_lines(fileobj):
+    for no, line in enumerate(_text_lines(fileobj), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield no, ValueError(f"некорректный JSON: {e.msg}")
+
+
+def _iter_json_array(fileobj):
+    """Объекты JSON-массива по одному: raw_decode по накопленному буферу."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buf, pos, no, started = "", 0, 0, False
+    for chunk in iter(lambda: fileobj.read(JSON_CHUNK), b""):
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("ожидался JSON-массив объектов")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                if _malformed(buf, e):
+                    raise ValueError(f"некорректный JSON: {e.msg}") from None
+                if len(buf) - pos > MAX_JSON_RECORD:
+                    raise ValueError(f"объект длиннее {MAX_JSON_RECORD} символов") from None
+                break  # объект ещё не дочитан — ждём следующий кусок
+            no += 1
+            pos = end
+            yield no, obj
+    if buf[pos:].strip():
+        no += 1
+        yield no, ValueError("файл оборвался посреди записи")
+
+
+def _malformed(buf: str, e: json.JSONDecodeError) -> bool:
+    """
+    Объект не разобрался и уже не разберётся: после места ошибки в буфере есть
+    граница элемента («,» или «]»). Иначе он просто оборван концом куска. Незакрытая
+    строка всегда считается оборванной — запятые внутри неё не граница.
+    """
+    if e.msg.startswith("Unterminated string"):
+        return False
+    return buf.find(",", e.pos) >= 0 or buf.find("]", e.pos) >= 0
+
+
+def iter_records(fileobj, name: str):
+    """(номер строки/записи, dict или ValueError) из CSV, JSON Lines или JSON-массива."""
+    lower = name.lower()
+    if lower.endswith(".csv"):
+        yield from _iter_csv(fileobj)
+        return
+    if lower.endswith((".jsonl", ".ndjson")):
+        yield from _iter_json_lines(fileobj)
+        return
+    # .json: массив объектов; если первый значимый символ не «[» — JSON Lines
+    head = fileobj.read(1)
+    while head in (b" ", b"\n", b"\r", b"\t", b"\xef", b"\xbb", b"\xbf"):
+        head = fileobj.read(1)
+    fileobj.seek(0)
+    if head == b"[":
+        yield from _iter_json_array(fileobj)
+    else:
+        yield from _iter_json_lines(fileobj)
+
+
+# ---------- проверка полей ----------
+def _parse_date(value) -> date:
+    s = str(value or "").strip()
+    if not s:
+        raise ValueError("не указан дедлайн (due)")
+    try:
+        return date.fromisoformat(s)  # быстрый путь, strptime заметно медленнее
+    except ValueError:
+        pass
+    for fmt in ("%d-%m-%Y", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"дата «{s}» не в формате YYYY-MM-DD или DD-MM-YYYY")
+
+
+def _parse_days(value, field: str) -> list[int]:
+    if value in (None, ""):
+        return []
+    items = value if isinstance(value, list) else str(value).replace(";", ",").split(",")
+    out = []
+    for it in items:
+        s = str(it).strip()
+        if not s:
+            continue
+        if s in WEEKDAY_LABELS:
+            d = WEEKDAY_LABELS.index(s)
+        else:
+            try:
+                d = int(s)
+            except ValueError:
+                raise ValueError(f"{field}: «{s}» — не день недели (0..6 или Пн..Вс)") from None
+            if not 0 <= d <= 6:
+                raise ValueError(f"{field}: {d} вне диапазона 0..6")
+        if d not in out:
+            out.append(d)
+    return sorted(out)
+
+
+def _parse_time(value) -> str | None:
+    s = str(value or "").strip()
+    if not s:
+        return None
+    hh, sep, mm = s.partition(":")
+    if sep and hh.isdigit() and mm.isdigit() and len(mm) == 2 and int(hh) < 24 and int(mm) < 60:
+        return f"{int(hh):02d}:{mm}"
+    raise ValueError(f"время «{s}» не в формате HH:MM")
+
+
+def _choice(value, allowed: list[str], field: str, default: str) -> str:
+    s = str(value or "").strip()
+    if not s:
+        return default
+    if s in allowed:
+        return allowed[allowed.index(s)]  # сама константа: тысячи строк импорта не держат по копии
+    # допускаем «Здоровье» вместо «Здоровье ❤️»
+    for a in allowed:
+        if a.split(" ")[0] == s:
+            return a
+    raise ValueError(f"{field}: «{s}» — допустимо: {', '.join(allowed)}")
+
+
+def _title(rec: dict) -> str:
+    title = str(rec.get("title") or "").strip()
+    if not title:
+        raise ValueError("пустое название (title)")
+    return title
+
+
+def validate_goal(rec: dict) -> dict:
+    """Запись → задача в формате st.session_state.goals (без id/order). ValueError — ошибка поля."""
+    due = _parse_date(rec.get("due"))
+    mode = str(rec.get("recur_mode") or "none").strip()
+    if mode not in RECUR_MODES:
+        raise ValueError(f"recur_mode: «{mode}» — допустимо: {', '.join(RECUR_MODES)}")
+    recur_days = _parse_days(rec.get("recur_days"), "recur_days")
+    if mode == "by_days" and not recur_days:
+        raise ValueError("recur_mode=by_days требует recur_days")
+    return {
+        "title": _title(rec),
+        "due": due,
+        "type": classify_by_due(due),
+        "category": _choice(rec.get("category"), TASK_CATEGORIES, "category", TASK_CATEGORIES[-1]),
+        "done": False,
+        "failed": False,
+        "overdue": False,
+        "stat": _choice(rec.get("stat"), STAT_NAMES, "stat", "Успех ⭐"),
+        "recur_mode": mode,
+        "recur_days": recur_days if mode == "by_days" else [],
+        "due_time": _parse_time(rec.get("due_time")),
+    }
+
+
+def validate_habit(rec: dict) -> dict:
+    days = _parse_days(rec.get("days"), "days")
+    if not days:
+        raise ValueError("у привычки не указаны дни (days)")
+    return {
+        "title": _title(rec),
+        "days": days,
+        "stat": _choice(rec.get("stat"), STAT_NAMES, "stat", "Дисциплина 🎯"),
+        "created": clock.today().isoformat(),
+        "completions": DayList(),
+        "failures": DayList(),
+    }
+
+
+def parse(fileobj, name: str, progress=None) -> ImportResult:
+    """Читает и проверяет файл целиком, не держа в памяти ничего, кроме валидных записей."""
+    res = ImportResult()
+    try:
+        for no, rec in iter_records(fileobj, name):
+            res.rows += 1
+            if progress is not None and res.rows % 1000 == 0:
+                progress(res.rows)
+            if isinstance(rec, Exception):
+                res.add_error(no, str(rec))
+                continue
+            if not isinstance(rec, dict):
+                res.add_error(no, "запись должна быть объектом")
+                continue
+            kind = str(rec.get("kind") or "goal").strip().lower()
+            try:
+                if kind in ("goal", "task", "задача"):
+                    res.goals.append(validate_goal(rec))
+                elif kind in ("habit", "привычка"):
+                    res.habits.append(validate_habit(rec))
+                else:
+                    raise ValueError(f"kind: «{kind}» — ожидается goal или habit")
+            except ValueError as e:
+                res.add_error(no, str(e))
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        res.add_error(res.rows + 1, f"файл не читается дальше: {e}")
+    return res
+
+
+def commit(res: ImportResult, goals: list, habits: list):
+    """Добавляет проверенные записи в списки состояния (id и ключи порядка — новые)."""
+    order = ids.next_order(goals)
+    for g in res.goals:
+        g["id"] = ids.new_id()
+        g["order"] = order
+        order += ids.ORDER_STEP
+    goals.extend(res.goals)
+    for h in res.habits:
+        h["id"] = ids.new_id()
+    habits.extend(res.habits)
@@ -0,0 +1,53 @@
+# life_rpg/leaderboard.py — строки рейтинга игроков
+"""
+Рейтинг не читает чужие rpg_state: ночная обработка (life_rpg.nightly) для
+каждого игрока сводит состояние в одну короткую строку таблицы rpg_leaderboard
+и в конце проставляет места по каждой метрике (rank_<метрика>, row_number()).
+Страница 🏆 Рейтинг читает только эту таблицу: страница — диапазон мест по
+индексу, своё место — своя строка; время не зависит от числа игроков.
+"""
+from life_rpg import clock
+
+# метрика (колонка rpg_leaderboard) → подпись
+METRICS = {
+    "level": "Уровень",
+    "xp_week": "XP за 7 дней",
+    "best_streak": "Лучшая серия дисциплины",
+    "habit_rate": "Успех привычек, %",
+}
+COLUMNS = ("user_id", "level", "xp", "xp_week", "best_streak", "habit_rate", "updated_at")
+
+
+def rank_column(metric: str) -> str:
+    return f"rank_{metric}"
+
+
+def habit_rate(habits: list) -> float:
+    """Доля выполнений среди всех отметок привычек, %."""
+    done = sum(len(h.get("completions", [])) for h in habits)
+    failed = sum(len(h.get("failures", [])) for h in habits)
+    return round(done / (done + failed) * 100, 1) if done + failed else 0.0
+
+
+def summary_row(user_id: str) -> dict:
+    """Строка рейтинга по состоянию текущей сессии (после авто-процессов)."""
+    import streamlit as st
+
+    from life_rpg.state import xp_series
+    from life_rpg.stats import _current_and_best_streak
+
+    ss = st.session_state
+    return {
+        "user_id": user_id,
+        "level": int(ss.get("level", 1)),
+        "xp": int(ss.get("xp", 0)),
+        "xp_week": int(xp_series().window_sum(7, clock.today())),
+        "best_streak": int(_current_and_best_streak()[1]),
+        "habit_rate": habit_rate(ss.get("habits", [])),
+        "updated_at": clock.now().isoformat(timespec="seconds"),
+    }
+
+
+def player_label(user_id: str) -> str:
+    """Имён в состоянии нет — показываем короткий неизменный ярлык."""
+    return f"Игрок #{str(user_id).replace('-', '')[:6]}"
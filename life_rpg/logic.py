@@ -0,0 +1,469 @@
+# life_rpg/logic.py — игровые правила: XP, характеристики, просрочки, привычки
+from collections import Counter
+from datetime import date, datetime, time as dtime, timedelta
+
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.constants import BIG_GOAL_STAT_BONUS, BIG_GOAL_XP, GOAL_TYPES, HABIT_XP, XP_LOG_KEEP_DAYS
+from life_rpg.history import recording
+from life_rpg.persistence import deferred_save, save_state
+from life_rpg.state import (
+    _ensure_discipline_list, ensure_xp_log_dict, goal_by_id, goals_in_order, xp_series,
+)
+from life_rpg.tracing import traced
+from life_rpg.xp_series import compact_log
+
+
+def goal_due_datetime(g):
+    """
+    Возвращает datetime дедлайна задачи:
+    - если задано g['due_time'] (строка 'HH:MM'), возьмём эту точку времени,
+    - иначе считаем дедлайн до конца дня (23:59:59), чтобы без времени задача была «на весь день».
+    """
+    from datetime import datetime, time as dtime
+    due_date = g["due"]  # это уже date
+    t = g.get("due_time") or g.get("time")
+    if t:
+        hh, mm = map(int, t.split(":"))
+        return datetime.combine(due_date, dtime(hour=hh, minute=mm))
+    else:
+        return datetime.combine(due_date, dtime(23, 59, 59))
+
+
+def days_left_text(due: date, time_str: str | None = None) -> str:
+    """
+    Если задано время — показываем точнее (сегодня/через X часов/просрочена на ...).
+    Без времени — старая логика по дням.
+    """
+    if time_str:
+        try:
+            hh, mm = map(int, time_str.split(":"))
+            dt_due = datetime.combine(due, dtime(hh, mm))
+        except Exception:
+            dt_due = datetime.combine(due, dtime(23, 59, 59))
+        delta = dt_due - clock.now()
+        s = int(delta.total_seconds())
+        if s > 0:
+            days = s // 86400
+            if days > 0:
+                return f"осталось {days} дн."
+            hours = s // 3600
+            if hours > 0:
+                return f"через {hours} ч."
+            mins = max(1, (s % 3600) // 60)
+            return f"через {mins} мин."
+        else:
+            s = -s
+            days = s // 86400
+            if days > 0:
+                return f"просрочена на {days} дн."
+            hours = s // 3600
+            if hours > 0:
+                return f"просрочена на {hours} ч."
+            mins = max(1, (s % 3600) // 60)
+            return f"просрочена на {mins} мин."
+    else:
+        d = (due - clock.today()).days
+        if d > 0:
+            return f"осталось {d} дн."
+        if d == 0:
+            return "сегодня дедлайн"
+        return f"просрочена на {-d} дн."
+
+
+def classify_by_due(due: date) -> str:
+    left = (due - clock.today()).days
+    if left <= 7:
+        return "Краткосрочная"
+    elif left <= 92:
+        return "Среднесрочная"
+    else:
+        return "Долгосрочная"
+
+
+def next_from_days(d: date, days: list[int]) -> date:
+    if not days:
+        return d + timedelta(days=7)
+    for step in range(1, 8):
+        cand = d + timedelta(days=step)
+        if cand.weekday() in days:
+            return cand
+    return d + timedelta(days=7)
+
+
+def compute_next_due(goal) -> date:
+    mode = goal.get("recur_mode", "none")
+    if mode == "daily":
+        return goal["due"] + timedelta(days=1)
+    elif mode == "weekly":
+        return goal["due"] + timedelta(days=7)            
+    elif mode == "by_days":
+        return next_from_days(goal["due"], goal.get("recur_days", []))
+    return goal["due"]
+
+
+def _moscow_now() -> datetime:
+    """Текущее время в часовом поясе МСК."""
+    return clock.moscow_now()
+
+
+def add_xp(delta: int):
+    """Начисляет/списывает опыт, логирует его и проверяет повышение уровня."""
+    ensure_xp_log_dict()
+
+    xp_old = int(st.session_state.get("xp", 0))
+    lvl_old = int(st.session_state.get("level", 1))
+
+    xp_new = xp_old + int(delta)
+    st.session_state.xp = xp_new
+
+    # лог по дням
+    series = xp_series()  # до записи в лог, чтобы delta не учлась дважды при перестроении
+    d = clock.today()
+    st.session_state.xp_log[d.isoformat()] = int(st.session_state.xp_log.get(d.isoformat(), 0)) + int(delta)
+    series.add(d, delta)
+
+    # новый уровень каждые 1000 XP (базовый 1)
+    lvl_new = max(1, (xp_new // 1000) + 1)
+    if lvl_new > lvl_old:
+        st.session_state.level = lvl_new
+        st.session_state.levelup_pending = True
+        st.session_state.levelup_to = lvl_new
+
+    save_state()
+
+
+def is_habit_scheduled_today(h: dict, on_date: date | None = None) -> bool:
+    d = on_date or clock.today()
+    return d.weekday() in h.get("days", [])
+
+
+def habit_done_on_date(h: dict, on_date: date | None = None) -> bool:
+    d = on_date or clock.today()
+    return (d.isoformat() in h.get("completions", []))
+
+
+def habit_failed_on_date(h: dict, on_date: date | None = None) -> bool:
+    d = on_date or clock.today()
+    return (d.isoformat() in h.get("failures", []))
+
+
+def touch_habit(h: dict):
+    """Новая ревизия привычки (в базу не пишется): по ней кэшируется её календарь."""
+    h["rev"] = h.get("rev", 0) + 1
+
+
+def habit_mark_done(h: dict, on_date: date | None = None):
+    d = (on_date or clock.today()).isoformat()
+    if d not in h["completions"]:
+        h["completions"].append(d)
+        touch_habit(h)
+        add_xp(HABIT_XP)
+        # прокачиваем выбранную характеристику на +1 (как и у задач)
+        update_stat(h.get("stat", "Дисциплина 🎯"), +1)
+        # маленький бонус дисциплины за факт выполнения любой единицы в день у нас не даётся,
+        # общий +1 к дисциплине начисляется другим авто-правилом, когда выполнено всё за день
+        save_state()
+
+
+def habit_mark_failed(h: dict, on_date: date | None = None):
+    d = (on_date or clock.today()).isoformat()
+    if d not in h["failures"]:
+        h["failures"].append(d)
+        touch_habit(h)
+        add_xp(-HABIT_XP)
+        update_stat(h.get("stat", "Дисциплина 🎯"), -1)
+        save_state()
+
+
+def habit_mark(h: dict, success: bool, on_date: date | None = None):
+    """Отметка за день (кнопки ✅/❌): противоположная отметка снимается; XP, характеристика
+    и отметка — одной записью в базу."""
+    d = on_date or clock.today()
+    label = f"{'✅' if success else '❌'} Привычка «{h.get('title', '')}»"
+    with deferred_save(), recording(label, habits=[h]):
+        (habit_mark_done if success else habit_mark_failed)(h, d)
+        other = h["failures" if success else "completions"]
+        if d.isoformat() in other:
+            other.remove(d.isoformat())
+            touch_habit(h)
+        save_state()
+
+
+def update_stat(stat_name: str, delta: float):
+    st.session_state.stats[stat_name] = max(
+        0, round(st.session_state.stats.get(stat_name, 0) + float(delta), 2)
+    )
+    save_state()
+
+
+def award_xp_for_goal(goal: dict, success: bool):
+    """
+    Вычисляет награду/штраф для goal и применяет её:
+      - add_xp(+reward) или add_xp(-reward)
+      - обновляет соответствующую характеристику и дисциплину
+    """
+    reward = GOAL_TYPES.get(goal.get("type", "Краткосрочная"), 5)
+    stat_name = goal.get("stat", "Успех ⭐")
+
+    if success:
+        add_xp(reward)
+        update_stat(stat_name, +1)
+        update_stat("Дисциплина 🎯", +0.1)
+    else:
+        add_xp(-reward)
+        update_stat(stat_name, -1)
+        update_stat("Дисциплина 🎯", -0.1)
+
+
+def settle_goals(goals: list, success: bool):
+    """
+    Выполняет (success=True) или проваливает сразу несколько задач.
+    Награды суммируются: один add_xp, по одному update_stat на характеристику
+    и одна запись в базу. Повторяющиеся задачи переносятся на следующий срок.
+    """
+    if not goals:
+        return
+    sign = 1 if success else -1
+    mark = "✅ Выполнено" if success else "❌ Провалено"
+    label = f"{mark}: «{goals[0].get('title', '')}»" if len(goals) == 1 else f"{mark} задач: {len(goals)}"
+    with deferred_save(), recording(label, goals=goals):
+        xp = 0
+        stat_deltas: Counter = Counter()
+        for g in goals:
+            xp += GOAL_TYPES.get(g.get("type", "Краткосрочная"), 5)
+            stat_deltas[g.get("stat", "Успех ⭐")] += 1
+            if g.get("recur_mode", "none") != "none":
+                g["due"] = compute_next_due(g)
+                g["type"] = classify_by_due(g["due"])
+            elif success:
+                g["done"] = True
+            else:
+                g["failed"] = True
+        stat_deltas["Дисциплина 🎯"] += round(0.1 * len(goals), 2)
+
+        add_xp(sign * xp)
+        for stat_name, delta in stat_deltas.items():
+            update_stat(stat_name, sign * delta)
+
+
+def reschedule_goal(goal: dict, due: date):
+    """Переносит задачу на новую дату (тип пересчитывается, флаг просрочки снимается)."""
+    goal["due"] = due
+    goal["type"] = classify_by_due(due)
+    goal["overdue"] = False
+
+
+def reschedule_goals(goals: list, due: date):
+    for g in goals:
+        reschedule_goal(g, due)
+    if goals:
+        save_state()
+
+
+def award_big_goal_completion():
+    """+250 XP и +10 ко всем характеристикам за выполнение глобальной цели."""
+    add_xp(BIG_GOAL_XP)
+    for k in list(st.session_state.stats.keys()):
+        update_stat(k, +BIG_GOAL_STAT_BONUS)
+
+
+def award_big_goal_failure():
+    """-250 XP и -10 ко всем характеристикам за провал глобальной цели."""
+    add_xp(-BIG_GOAL_XP)
+    for k in list(st.session_state.stats.keys()):
+        update_stat(k, -BIG_GOAL_STAT_BONUS)
+
+
+def settle_big_goal(g: dict, success: bool):
+    """Кнопки ✅/❌ глобальной цели: флаг и награда/штраф — одной записью в базу."""
+    label = f"{'🎯 Выполнена' if success else '💥 Провалена'} цель «{g.get('title', '')}»"
+    with deferred_save(), recording(label, big_goals=[g]):
+        if success:
+            g["done"] = True
+            award_big_goal_completion()
+        else:
+            g["failed"] = True
+            award_big_goal_failure()
+        save_state()
+
+
+def _day_done_ok(the_day: date) -> bool:
+    """True, если все задачи И все привычки, запланированные на день, выполнены; и нет провалов."""
+    # Задачи (как было)
+    todays_goals = [g for g in st.session_state.goals if g["due"] == the_day]
+    if todays_goals:
+        if any(g["failed"] for g in todays_goals):
+            return False
+        if not all(g["done"] for g in todays_goals if g.get("recur_mode","none") == "none"):
+            # одноразовые должны быть все done
+            if any((not g["done"]) and g.get("recur_mode","none") == "none" for g in todays_goals):
+                return False
+
+    # Повторяющиеся задачи на день тоже должны быть закрыты в этот день,
+    # но у нас их мы переносим по нажатию. Для простоты — если есть повторяющиеся на этот день и они не закрыты, считаем не ок.
+    if any((g.get("recur_mode","none")!="none") and (g["due"]==the_day) for g in todays_goals):
+        # если есть хоть одна повторяющаяся задача с due==the_day, требуем, чтобы юзер её нажал "выполнить" (т.е. не оставил на этот день)
+        if any((g.get("recur_mode","none")!="none") and (g["due"]==the_day) for g in todays_goals):
+            return False
+
+    # Привычки
+    todays_habits = [h for h in st.session_state.get("habits", []) if is_habit_scheduled_today(h, the_day)]
+    if todays_habits:
+        # если какая-то привычка провалена в этот день — сразу не ок
+        if any(habit_failed_on_date(h, the_day) for h in todays_habits):
+            return False
+        # все запланированные привычки на день должны быть выполнены
+        if not all(habit_done_on_date(h, the_day) for h in todays_habits):
+            return False
+
+    # если ни задач, ни привычек — не даём авто-бонус (возвращаем False)
+    if not todays_goals and not todays_habits:
+        return False
+
+    return True
+
+
+@traced
+def auto_process_overdues():
+    """Штрафуем и переносим просроченные задачи; одноразовые — помечаем проваленными."""
+    changed = False
+    today_d = clock.today()
+    now_dt = clock.now()
+
+    for g in st.session_state.goals:
+        if g["done"] or g["failed"]:
+            continue
+
+        due_dt = goal_due_datetime(g)
+
+        # просрочка: либо дата в прошлом, либо сегодня, но время уже прошло
+        if due_dt.date() < today_d or (due_dt.date() == today_d and due_dt < now_dt):
+            reward = GOAL_TYPES[g["type"]]
+            if g.get("recur_mode", "none") != "none":
+                # повторяемые — переносим вперёд, штрафуя за каждый пропуск (пока дедлайн < сейчас)
+                while due_dt < now_dt:
+                    add_xp(-reward)
+                    update_stat(g["stat"], -1)
+                    update_stat("Дисциплина 🎯", -0.1)
+                    g["due"] = compute_next_due(g)     # переносим дату
+                    # время сохраняем как есть (g['due_time'])
+                    due_dt = goal_due_datetime(g)       # пересобираем due_dt
+                    g["type"] = classify_by_due(g["due"])
+                    changed = True
+                g["overdue"] = False
+            else:
+                # одноразовые
+                g["overdue"] = True
+                add_xp(-reward)
+                update_stat(g["stat"], -1)
+                update_stat("Дисциплина 🎯", -0.1)
+                g["failed"] = True
+                changed = True
+
+    if changed:
+        save_state()
+
+
+@traced
+def auto_process_big_goal_overdues():
+    """Если глобальная цель просрочена и не закрыта — провалить и применить штраф один раз."""
+    today = clock.today()
+    changed = False
+
+    for g in st.session_state.get("big_goals", []):
+        if g.get("done") or g.get("failed"):
+            continue
+        if g["due"] < today:
+            # помечаем как проваленную и штрафуем
+            g["failed"] = True
+            award_big_goal_failure()
+            changed = True
+
+    if changed:
+        save_state()
+
+
+@traced
+def auto_award_yesterday_if_ok():
+    """Если вчера все задачи выполнены и бонус ещё не выдавался — +1 к дисциплине."""
+    _ensure_discipline_list()
+    y = clock.today() - timedelta(days=1)
+    y_str = y.isoformat()
+    if y_str in st.session_state.discipline_awarded_dates:
+        return
+    if _day_done_ok(y):
+        update_stat("Дисциплина 🎯", +1.0)
+        st.session_state.discipline_awarded_dates.append(y_str)
+        save_state()
+        st.sidebar.success("Вчера всё выполнено: Дисциплина +1.0 🎯")
+
+
+@traced
+def auto_compact_xp_log():
+    """Раз в день сворачивает дни xp_log старше XP_LOG_KEEP_DAYS в помесячные суммы xp_rollup."""
+    today = clock.today()
+    if st.session_state.get("xp_compacted_on") == today:
+        return
+    st.session_state.xp_compacted_on = today
+    ensure_xp_log_dict()
+    log, rollup, moved = compact_log(
+        st.session_state.xp_log, st.session_state.get("xp_rollup") or {},
+        today - timedelta(days=XP_LOG_KEEP_DAYS),
+    )
+    if not moved:
+        return
+    # новый dict лога — xp_series() перестроит дневной ряд уже без свёрнутых дней
+    st.session_state.xp_log = log
+    st.session_state.xp_rollup = rollup
+    save_state()
+
+
+def _move_goal_in_scope(goal_id: str, scope: str, direction: int):
+    """
+    Колбэк ⬆️/⬇️: перемещает задачу в пределах видимого списка.
+    Меняется только её order — середина между новыми соседями.
+    """
+    goal = goal_by_id(goal_id)
+    if goal is None:
+        return
+    ordered = goals_in_order()
+
+    if scope.startswith("active_"):
+        type_map = {
+            "active_short": "Краткосрочная",
+            "active_mid": "Среднесрочная",
+            "active_long": "Долгосрочная",
+        }
+        t = type_map.get(scope)
+        subset = [g for g in ordered if not g["done"] and not g["failed"] and g["type"] == t]
+    elif scope == "today":
+        today = clock.today()
+        subset = [g for g in ordered if g["due"] == today and not g["done"] and not g["failed"]]
+    else:
+        subset = ordered
+
+    i = next((k for k, g in enumerate(subset) if g is goal), None)
+    if i is None:
+        return
+
+    # новые соседи: при движении вверх — [i-2, i-1], вниз — [i+1, i+2]
+    if direction < 0 and i > 0:
+        lo_i, hi_i = i - 2, i - 1
+    elif direction > 0 and i < len(subset) - 1:
+        lo_i, hi_i = i + 1, i + 2
+    else:
+        return
+    lo = subset[lo_i]["order"] if lo_i >= 0 else None
+    hi = subset[hi_i]["order"] if hi_i < len(subset) else None
+
+    new_order = ids.order_between(lo, hi)
+    if new_order is None:
+        # ключи сошлись слишком близко — перенумеровываем весь список и берём середину снова
+        ids.renumber(st.session_state.goals)
+        lo = subset[lo_i]["order"] if lo_i >= 0 else None
+        hi = subset[hi_i]["order"] if hi_i < len(subset) else None
+        new_order = ids.order_between(lo, hi)
+    goal["order"] = new_order
+    save_state()
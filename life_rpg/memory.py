@@ -0,0 +1,256 @@
+# life_rpg/memory.py — память, которую держит одна сессия
+"""
+Состояние игрока целиком лежит в st.session_state каждой открытой вкладки,
+поэтому его размер умножается на число сессий процесса.
+
+  DayList           — даты событий (отметки привычек, дни +1 к дисциплине) как
+                      ordinal-числа в array('i'): 4 байта на дату вместо ISO-строки
+                      (~60 байт) и ссылки на неё (8 байт). Снаружи — список
+                      ISO-строк: in, append, remove, итерация, len, сравнение.
+                      Из документа разбирается лениво — при первом обращении;
+  intern            — повторяющиеся строки документа (характеристика, категория,
+                      тип, повтор) при загрузке — одна копия на процесс;
+  evict_transient   — крупные временные данные (архив экспорта, результат импорта,
+                      байты .ics) удаляются, как только страница, которой они нужны,
+                      закрыта, или они устарели;
+  session_footprint — байты по ключам session_state (панель ?debug=1, bench.memory).
+"""
+import sys
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from datetime import date
+
+import streamlit as st
+
+from life_rpg.cache import CACHE_KEY, state_revision
+
+intern = sys.intern
+
+# ключ session_state → страница, на которой он нужен
+TRANSIENT_KEYS = {"history_export": "profile", "import_result": "import"}
+# memo-записи с байтами (life_rpg.cache): вид → страница
+BLOB_MEMOS = {"ics_calendar": "profile"}
+
+
+# ===== ДАТЫ СОБЫТИЙ =====
+class DayList:
+    """
+    Даты как ordinal в array('i'); порядок добавления сохраняется (как у списка).
+
+    Из документа — лениво (DayList.lazy): до первого обращения даты лежат одной
+    строкой ISO-дат через запятую (11 байт на дату) и разбираются при первом
+    append / итерации. in, len() и запись в документ (iso()) обходятся без разбора:
+    у большинства привычек за перезапуск смотрят только сегодняшнюю отметку.
+    """
+
+    __slots__ = ("_days", "_raw")
+
+    def __init__(self, ordinals: Iterable[int] = ()):
+        self._days = array("i", ordinals)
+        self._raw: str | None = None
+
+    @classmethod
+    def lazy(cls, values: list) -> "DayList":
+        """Список ISO-дат из документа; разбор — при первом обращении."""
+        out = cls()
+        if values:
+            try:
+                out._raw, out._days = ",".join(values), None
+            except TypeError:  # не строки — разбираем сразу, нечитаемое отбрасываем
+                out._days.extend(d.toordinal() for d in as_dates(values))
+        return out
+
+    def _load(self) -> array:
+        days = self._days
+        if days is None:
+            parts = self._raw.split(",")
+            try:
+                days = array("i", map(date.toordinal, map(date.fromisoformat, parts)))
+            except ValueError:
+                days = array("i", (d.toordinal() for d in as_dates(parts)))
+            self._days, self._raw = days, None
+        return days
+
+    @staticmethod
+    def _ordinal(value) -> int | None:
+        if isinstance(value, date):
+            return value.toordinal()
+        try:
+            return date.fromisoformat(value).toordinal()
+        except (TypeError, ValueError):
+            return None
+
+    def copy(self) -> "DayList":
+        """Снимок (история действий): неразобранный — та же строка, разобранный — копия буфера."""
+        out = DayList.__new__(DayList)
+        out._raw = self._raw
+        out._days = None if self._days is None else array("i", self._days)
+        return out
+
+    def ordinals(self) -> array:
+        """Даты как ordinal (разбирает при первом обращении); менять нельзя."""
+        return self._load()
+
+    def iso(self) -> list[str]:
+        """ISO-строки для документа (неразобранные — как были)."""
+        if self._days is None:
+            return self._raw.split(",")
+        return [date.fromordinal(o).isoformat() for o in self._days]
+
+    def dates(self):
+        """Даты (date) без промежуточных строк."""
+        return map(date.fromordinal, self._load())
+
+    def __iter__(self):
+        for o in self._load():
+            yield date.fromordinal(o).isoformat()
+
+    def __len__(self):
+        if self._days is None:
+            return self._raw.count(",") + 1
+        return len(self._days)
+
+    def __getitem__(self, i):
+        days = self._load()
+        if isinstance(i, slice):
+            return [date.fromordinal(o).isoformat() for o in days[i]]
+        return date.fromordinal(days[i]).isoformat()
+
+    def __contains__(self, value):
+        o = self._ordinal(value)
+        if o is None:
+            return False
+        raw = self._raw
+        if raw is not None:
+            # ещё не разобран: ищем ISO-строку целиком между запятыми, без разбора
+            key = date.fromordinal(o).isoformat()
+            i = raw.find(key)
+            while i >= 0:
+                end = i + len(key)
+                if (i == 0 or raw[i - 1] == ",") and (end == len(raw) or raw[end] == ","):
+                    return True
+                i = raw.find(key, i + 1)
+            return False
+        # поиск по байтам буфера (memchr) вместо `o in array`, которое создаёт int на каждый элемент
+        days = self._days
+        buf, needle = days.tobytes(), array("i", (o,)).tobytes()
+        i = buf.find(needle)
+        while i > 0 and i % days.itemsize:  # совпадение не с начала элемента
+            i = buf.find(needle, i + 1)
+        return i >= 0
+
+    def __eq__(self, other):
+        if isinstance(other, DayList):
+            if self._raw is not None and other._raw is not None:
+                return self._raw == other._raw
+            return self._load() == other._load()
+        if isinstance(other, list):
+            return self.iso() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"DayList({self.iso()!r})"
+
+    def append(self, value):
+        o = self._ordinal(value)
+        if o is None:
+            raise ValueError(f"не дата: {value!r}")
+        self._load().append(o)
+
+    def remove(self, value):
+        o = self._ordinal(value)
+        if o is None:
+            raise ValueError(f"{value!r} не в списке")
+        self._load().remove(o)
+
+
+def iso_dates(values) -> list[str]:
+    """Даты событий для документа состояния: DayList или обычный список."""
+    return values.iso() if isinstance(values, DayList) else list(values)
+
+
+def as_dates(values):
+    """Даты из DayList или из списка ISO-строк (нечитаемые пропускаются)."""
+    if isinstance(values, DayList):
+        yield from values.dates()
+        return
+    for s in values:
+        try:
+            yield date.fromisoformat(str(s)[:10])
+        except ValueError:
+            continue
+
+
+# ===== ВРЕМЕННЫЕ ДАННЫЕ =====
+def evict_transient(page: str | None):
+    """Удаляет временные данные чужих страниц и устаревшие (другой ревизии) — каждый перезапуск."""
+    ss = st.session_state
+    rev = state_revision()
+    for key, owner in TRANSIENT_KEYS.items():
+        value = ss.get(key)
+        if value is None:
+            continue
+        stale = isinstance(value, dict) and value.get("rev", rev) != rev
+        if owner != page or stale:
+            del ss[key]
+    cache = ss.get(CACHE_KEY)
+    if cache is not None and len(cache):
+        cache.drop(lambda k: k[0] in BLOB_MEMOS and (BLOB_MEMOS[k[0]] != page or k[1] != rev))
+
+
+# ===== ИЗМЕРЕНИЕ =====
+_OPAQUE = (str, bytes, bytearray, int, float, bool, type(None), date, array)
+
+
+def deep_size(obj, seen: set) -> int:
+    """Байты объекта вместе со вложенными; объект, уже учтённый в seen, — 0 (общие данные считаются один раз)."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    n = sys.getsizeof(obj)
+    if isinstance(obj, _OPAQUE):
+        return n
+    if isinstance(obj, dict):
+        return n + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return n + sum(deep_size(x, seen) for x in obj)
+    # свои классы (индекс поиска, кэши, серии XP) — по полям; чужие объекты — только верхний уровень
+    if type(obj).__module__.split(".")[0] != "life_rpg":
+        return n
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                n += deep_size(getattr(obj, slot), seen)
+    if hasattr(obj, "__dict__"):
+        n += deep_size(vars(obj), seen)
+    return n
+
+
+def session_footprint(ss=None) -> list[tuple[str, int]]:
+    """[(ключ, байты)] по убыванию. Общий объект засчитывается один раз: сначала данные
+    состояния (dict/list), потом кэши и индексы, которые ссылаются на те же задачи."""
+    ss = st.session_state if ss is None else ss
+    seen: set = set()
+    keys = sorted(ss.keys(), key=lambda k: not isinstance(ss[k], (dict, list)))
+    rows = [(str(k), deep_size(ss[k], seen)) for k in keys]
+    return sorted(rows, key=lambda r: -r[1])
+
+
+def fmt_bytes(n: float) -> str:
+    for unit in ("Б", "КБ", "МБ"):
+        if n < 1024 or unit == "МБ":
+            return f"{n:.0f} {unit}" if unit == "Б" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def render_panel():
+    """Память сессии по ключам (показывается вместе с панелью трассировки)."""
+    with st.sidebar.expander("🧠 Память сессии", expanded=False):
+        rows = session_footprint()
+        st.metric("Всего", fmt_bytes(sum(n for _, n in rows)))
+        st.dataframe(
+            [{"Ключ": k, "Размер": fmt_bytes(n)} for k, n in rows[:15]],
+            use_container_width=True,
+            hide_index=True,
+        )
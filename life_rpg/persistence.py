@@ -0,0 +1,279 @@
+# life_rpg/persistence.py — сохранение и загрузка состояния игрока
+"""
+Состояние живёт в st.session_state; в базу уходит JSON-документ serialize_state().
+
+Документ может изменить не только эта сессия: JSON API, другая вкладка, ночная
+обработка. Поэтому сессия помнит updated_at документа, который прочитала или
+записала последним (STORED_KEY): запись условна по нему, а при несовпадении
+состояние перечитывается из базы вместо того, чтобы затереть чужое изменение.
+В начале перезапуска версия в базе сверяется с копией сессии (не чаще раза
+в STATE_CHECK_SECONDS).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timezone
+
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.history import empty_history, load_history
+from life_rpg.memory import DayList, intern, iso_dates
+from life_rpg.auth import current_user_id
+from life_rpg.db import db_load_state, db_save_state, db_state_version
+from life_rpg.tracing import traced
+
+
+class _Local(threading.local):
+    defer_depth = 0   # вложенность deferred_save() в текущем потоке
+    dirty = False     # внутри deferred_save() был хотя бы один save_state()
+
+
+_local = _Local()
+
+# поля, которых может не быть в старых сохранениях
+GOAL_DEFAULTS = {
+    "id": None, "order": None, "category": "Прочее", "done": False, "failed": False, "overdue": False,
+    "stat": "Успех ⭐", "recur_mode": "none", "time": None, "due_time": None,
+}
+BIG_GOAL_DEFAULTS = {"id": None, "done": False, "failed": False, "note": ""}
+_detached = False  # процесс вне Streamlit (life_rpg.headless): документ пишет вызывающий
+
+STORED_KEY = "stored_updated_at"    # updated_at документа в базе, каким его видела сессия
+STATE_CHECK_SECONDS = 15            # как часто сверять его с базой в начале перезапуска
+RELOADED_MSG = "Состояние изменили в другом месте (API, другая вкладка) — загружено заново."
+
+
+def detach():
+    """save_state() больше не пишет в базу и не ищет вошедшего игрока — только ревизия и updated_at."""
+    global _detached
+    _detached = True
+
+
+def serialize_state():
+    return {
+        "xp": st.session_state.xp,
+        "level": st.session_state.level,
+        "stats": st.session_state.stats,
+        "goals": [
+            {
+                "id": g.get("id"),
+                "order": g.get("order"),
+                "title": g["title"],
+                "due": g["due"].isoformat(),
+                "type": g["type"],
+                "category": g.get("category", "Прочее"),
+                "done": g["done"],
+                "failed": g["failed"],
+                "overdue": g.get("overdue", False),
+                "stat": g["stat"],
+                "recur_mode": g.get("recur_mode", "none"),
+                "recur_days": g.get("recur_days", []),
+                "due_time": g.get("due_time"),
+                "time": g.get("time"),
+            }
+            for g in st.session_state.goals
+        ],
+        "xp_log": st.session_state.xp_log,
+        "xp_rollup": st.session_state.get("xp_rollup", {}),
+        "updated_at": st.session_state.get("updated_at"),
+        "ics_token": st.session_state.get("ics_token"),
+        "api_token": st.session_state.get("api_token"),
+        "history": st.session_state.get("history") or empty_history(),
+        "discipline_awarded_dates": iso_dates(st.session_state.discipline_awarded_dates),
+        "big_goals": [
+            {
+                "id": g.get("id"),
+                "title": g["title"],
+                "due": g["due"].isoformat(),
+                "done": g["done"],
+                "failed": g["failed"],
+                "note": g.get("note", ""),
+            }
+            for g in st.session_state.get("big_goals", [])
+        ],
+        "habits": [
+            {
+                "id": h.get("id"),
+                "title": h["title"],
+                "days": h.get("days", []),
+                "stat": h.get("stat", "Дисциплина 🎯"),
+                "created": h.get("created"),
+                "completions": iso_dates(h.get("completions", [])),
+                "failures": iso_dates(h.get("failures", [])),
+            }
+            for h in st.session_state.get("habits", [])
+        ],
+    }
+
+
+@traced
+def deserialize_state(data: dict):
+    st.session_state.state_rev = st.session_state.get("state_rev", 0) + 1
+    st.session_state.xp = int(data.get("xp", 0))
+    st.session_state.level = int(data.get("level", 1))
+    st.session_state.stats = data.get(
+        "stats",
+        {
+            "Здоровье ❤️": 0,
+            "Интеллект 🧠": 0,
+            "Радость 🙂": 0,
+            "Отношения 🤝": 0,
+            "Успех ⭐": 0,
+            "Дисциплина 🎯": 0.0,
+        },
+    )
+
+    # списки собираем локально и кладём в session_state один раз: каждое обращение
+    # к st.session_state идёт через прокси и стоит микросекунды, а задач — тысячи.
+    # Элемент — копия словаря документа (копия целиком быстрее, чем поле за полем,
+    # и не раздувает словарь, как {**по_умолчанию, **raw}); одинаковые даты разбираются один раз
+    dates: dict[str, date] = {}
+    goals = []
+    for raw in data.get("goals", []):
+        g = raw.copy()
+        if not g.keys() >= GOAL_DEFAULTS.keys():
+            for k, v in GOAL_DEFAULTS.items():
+                g.setdefault(k, v)
+        g["due"] = dates.get(raw["due"]) or dates.setdefault(raw["due"], date.fromisoformat(raw["due"]))
+        g["type"] = intern(g["type"])
+        g["category"] = intern(g["category"])
+        g["stat"] = intern(g["stat"])
+        g["recur_mode"] = intern(g["recur_mode"])
+        g.setdefault("recur_days", [])
+        if not g["due_time"]:
+            g["due_time"] = g["time"]
+        goals.append(g)
+    st.session_state.goals = goals
+
+    xp_src = data.get("xp_log", {})
+    if isinstance(xp_src, dict):
+        st.session_state.xp_log = {str(k): int(v) for k, v in xp_src.items()}
+    else:
+        try:
+            st.session_state.xp_log = {str(k): int(v) for k, v in xp_src}
+        except Exception:
+            st.session_state.xp_log = {}
+
+    rollup = data.get("xp_rollup") or {}
+    st.session_state.xp_rollup = {str(k): int(v) for k, v in rollup.items()} if isinstance(rollup, dict) else {}
+
+    st.session_state.discipline_awarded_dates = DayList.lazy(data.get("discipline_awarded_dates", []))
+    st.session_state.updated_at = data.get("updated_at")
+    st.session_state.ics_token = data.get("ics_token")
+    st.session_state.api_token = data.get("api_token")
+    st.session_state.history = load_history(data.get("history"))
+
+    big_goals = []
+    for raw in data.get("big_goals", []):
+        g = raw.copy()
+        if not g.keys() >= BIG_GOAL_DEFAULTS.keys():
+            for k, v in BIG_GOAL_DEFAULTS.items():
+                g.setdefault(k, v)
+        g["due"] = dates.get(raw["due"]) or dates.setdefault(raw["due"], date.fromisoformat(raw["due"]))
+        big_goals.append(g)
+    st.session_state.big_goals = big_goals
+
+    habits = []
+    for h in data.get("habits", []):
+        habits.append(
+            {
+                "id": h.get("id"),
+                "title": h["title"],
+                "days": h.get("days", []),
+                "stat": intern(h.get("stat", "Дисциплина 🎯")),
+                "created": h.get("created"),
+                "completions": DayList.lazy(h.get("completions", [])),
+                "failures": DayList.lazy(h.get("failures", [])),
+            }
+        )
+    st.session_state.habits = habits
+
+    # старые сохранения без id/order: выдаём их один раз, load_state_if_exists() сохранит
+    migrated = ids.ensure_ids(st.session_state.goals)
+    migrated |= ids.ensure_order(st.session_state.goals)
+    migrated |= ids.ensure_ids(st.session_state.big_goals)
+    migrated |= ids.ensure_ids(st.session_state.habits)
+    st.session_state.ids_migrated = migrated
+
+
+def save_state():
+    # новая ревизия — кэши графиков (life_rpg.cache) пересчитаются при следующем показе
+    st.session_state.state_rev = st.session_state.get("state_rev", 0) + 1
+    # время изменения уходит в документ: по нему лента и API отвечают 304 (life_rpg.feed, life_rpg.api).
+    # С микросекундами: две записи за одну секунду не должны получить один ETag
+    st.session_state.updated_at = clock.now().astimezone(timezone.utc).isoformat()
+    if _local.defer_depth:
+        _local.dirty = True
+        return  # запишем один раз при выходе из deferred_save()
+    if _detached:
+        return
+    user_id = current_user_id()
+    if not user_id:
+        return  # не залогинен — не сохраняем
+    try:
+        data = serialize_state()
+        if db_save_state(user_id, data, st.session_state.get(STORED_KEY)):
+            st.session_state[STORED_KEY] = data["updated_at"]
+            return
+    except Exception as e:
+        st.sidebar.warning(f"Не удалось сохранить в базу: {e}")
+        return
+    # документ в базе новее копии сессии — не затираем, а перечитываем (действие не сохранилось)
+    load_state_if_exists()
+    st.session_state.state_reloaded = True
+
+
+@contextmanager
+def deferred_save():
+    """
+    Все save_state() внутри блока сводятся к одной записи в базу в конце:
+        with deferred_save():
+            add_xp(...); update_stat(...); update_stat(...)
+    Запись выполняется и при st.rerun()/st.stop() внутри блока.
+    """
+    _local.defer_depth += 1
+    try:
+        yield
+    finally:
+        _local.defer_depth -= 1
+        if _local.defer_depth == 0 and _local.dirty:
+            _local.dirty = False
+            save_state()
+
+
+@traced(name="load")
+def load_state_if_exists() -> bool:
+    user_id = current_user_id()
+    if not user_id:
+        return False
+    try:
+        data = db_load_state(user_id)
+        if data:
+            deserialize_state(data)
+            st.session_state[STORED_KEY] = data.get("updated_at")
+            st.session_state.state_checked_at = time.monotonic()
+            if st.session_state.pop("ids_migrated", False):
+                save_state()
+            return True
+    except Exception as e:
+        st.sidebar.warning(f"Не удалось загрузить из базы: {e}")
+    return False
+
+
+def refresh_if_changed():
+    """Начало перезапуска: документ в базе изменился после того, как сессия его прочитала
+    или записала, — перечитать его, пока действие перезапуска не легло на старую копию."""
+    ss = st.session_state
+    now = time.monotonic()
+    user_id = current_user_id()
+    if user_id and now - ss.get("state_checked_at", 0.0) >= STATE_CHECK_SECONDS:
+        ss.state_checked_at = now
+        try:
+            version = db_state_version(user_id)
+        except Exception:
+            version = None  # не достучались — проверит условная запись
+        if version is not None and version != ss.get(STORED_KEY) and load_state_if_exists():
+            ss.state_reloaded = True
+    if ss.pop("state_reloaded", False):
+        st.sidebar.info(RELOADED_MSG)
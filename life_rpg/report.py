@@ -0,0 +1,236 @@
+# life_rpg/report.py — годовой отчёт в Excel и годовой сброс
+"""
+Отчёт собирается не в перезапуске пользователя, а фоновой задачей: сброс
+31 декабря только кладёт snapshot состояния в rpg_reports (status=pending)
+и ставит задачу в очередь процесса. Задача пишет xlsx через xlsxwriter
+в режиме constant_memory (строка за строкой, без DataFrame) и сохраняет
+его в ту же строку (status=ready). Модалка читает статус и скачивает
+содержимое только по кнопке — в session_state байты не хранятся.
+"""
+import base64
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import streamlit as st
+
+from life_rpg import export
+from life_rpg.auth import current_user_id
+from life_rpg.db import db_report_meta, db_report_snapshot, db_save_report, job_client
+from life_rpg.history import empty_history
+from life_rpg.logic import _moscow_now
+from life_rpg.persistence import deferred_save, save_state, serialize_state
+from life_rpg.state import _default_stats_dict
+from life_rpg.tracing import traced
+from life_rpg.xp_series import DailyXPSeries, XPHistory
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+def _cell(v):
+    if v is None:
+        return ""
+    return v.isoformat() if hasattr(v, "isoformat") else v
+
+
+# колонки листов — поля документа состояния, как в отчёте до фоновой сборки (DataFrame из списков)
+GOAL_COLUMNS = ("id", "order", "title", "due", "type", "category", "done", "failed", "overdue", "stat",
+                "recur_mode", "recur_days", "due_time", "time")
+BIG_GOAL_COLUMNS = ("id", "title", "due", "done", "failed", "note")
+HABIT_COLUMNS = ("title", "days", "stat", "completions_count", "failures_count", "completions", "failures")
+
+
+def _joined(values) -> str:
+    return ",".join(map(str, values or []))
+
+
+def _doc_rows(items, columns):
+    for it in items:
+        yield [_joined(it.get(c)) if isinstance(it.get(c), list) else it.get(c) for c in columns]
+
+
+def _xp_day_rows(series: DailyXPSeries, year: int):
+    """Строка на каждый день года в пределах ряда — и с нулевым ΔXP."""
+    if series.start is None:
+        return
+    day, last = max(series.start, date(year, 1, 1)), min(series.end, date(year, 12, 31))
+    while day <= last:
+        yield day, series.get(day)
+        day += timedelta(days=1)
+
+
+def _write_sheet(wb, name: str, header: list[str], rows, bold):
+    """В constant_memory строки пишутся строго по порядку — так и идём по генератору."""
+    ws = wb.add_worksheet(name)
+    ws.write_row(0, 0, header, bold)
+    for i, row in enumerate(rows, start=1):
+        ws.write_row(i, 0, [_cell(v) for v in row])
+
+
+def write_year_report_xlsx(out, archive: dict, year: int):
+    """Пишет Excel со статистикой за год по snapshot'у archive (serialize_state()) в файл out."""
+    import xlsxwriter  # лениво: нужен только фоновой задаче отчёта
+
+    goals = archive.get("goals", [])
+    bgoals = archive.get("big_goals", [])
+    habits = archive.get("habits", [])
+
+    series = DailyXPSeries.from_log(archive.get("xp_log", {}))
+    history = XPHistory(archive.get("xp_rollup") or {}, series)
+    # месяцы — точные суммы и для свёрнутых дней, которых уже нет в «XP по дням»
+    xp_months = [(m, v) for m, v in history.monthly() if m.startswith(f"{year:04d}-")]
+
+    summary = [
+        ("Год", year),
+        ("Всего задач", len(goals)),
+        ("Выполнено задач", sum(1 for g in goals if g.get("done"))),
+        ("Провалено задач", sum(1 for g in goals if g.get("failed"))),
+        ("Просрочено задач", sum(1 for g in goals if g.get("overdue"))),
+        ("Глобальных целей всего", len(bgoals)),
+        ("Глобальных целей выполнено", sum(1 for g in bgoals if g.get("done"))),
+        ("Глобальных целей провалено", sum(1 for g in bgoals if g.get("failed"))),
+        ("Привычек всего", len(habits)),
+        ("Выполнений привычек", sum(len(h.get("completions", [])) for h in habits)),
+        ("Провалов привычек", sum(len(h.get("failures", [])) for h in habits)),
+        ("XP за год", history.year_total(year)),
+        ("Итоговый XP", int(archive.get("xp", 0))),
+        ("Итоговый уровень", int(archive.get("level", 1))),
+    ]
+    habit_rows = (
+        (h.get("title", ""), _joined(h.get("days")), h.get("stat", ""),
+         len(h.get("completions", [])), len(h.get("failures", [])),
+         _joined(h.get("completions")), _joined(h.get("failures")))
+        for h in habits
+    )
+
+    wb = xlsxwriter.Workbook(out, {"constant_memory": True})
+    bold = wb.add_format({"bold": True})
+    _write_sheet(wb, "Сводка", ["Показатель", "Значение"], summary, bold)
+    _write_sheet(wb, "XP по месяцам", ["Месяц", "ΔXP"], xp_months, bold)
+    _write_sheet(wb, "XP по дням", ["Дата (ISO)", "ΔXP"], _xp_day_rows(series, year), bold)
+    _write_sheet(wb, "Задачи", GOAL_COLUMNS, _doc_rows(goals, GOAL_COLUMNS), bold)
+    _write_sheet(wb, "Глобальные цели", BIG_GOAL_COLUMNS, _doc_rows(bgoals, BIG_GOAL_COLUMNS), bold)
+    _write_sheet(wb, "Привычки", HABIT_COLUMNS, habit_rows, bold)
+    _write_sheet(wb, "События привычек", [c for c, _ in export.TABLES["habit_events"]],
+                 export.habit_event_rows(habits), bold)
+    wb.close()
+
+
+def export_year_report_xlsx(archive: dict, year: int) -> bytes:
+    """Отчёт целиком в bytes (для бенчмарков и ручной выгрузки)."""
+    with tempfile.TemporaryFile() as tmp:
+        write_year_report_xlsx(tmp, archive, year)
+        tmp.seek(0)
+        return tmp.read()
+
+
+# ===== ФОНОВАЯ ЗАДАЧА ОТЧЁТА =====
+_executor: ThreadPoolExecutor | None = None
+_inflight: set[tuple[str, int]] = set()   # (user_id, year) в очереди или в работе
+_lock = threading.Lock()
+
+
+def _build_year_report(sb, user_id: str, year: int, snapshot: dict | None):
+    try:
+        if snapshot is None:
+            snapshot = db_report_snapshot(user_id, year, sb)
+        if snapshot is None:
+            raise RuntimeError("нет snapshot'а состояния для отчёта")
+        data = export_year_report_xlsx(snapshot, year)
+        db_save_report(user_id, year, {
+            "status": "ready",
+            "content": base64.b64encode(data).decode("ascii"),
+            "snapshot": None,  # отчёт собран — копия состояния больше не нужна
+        }, sb)
+    except Exception as e:
+        db_save_report(user_id, year, {"status": "failed", "error": str(e)}, sb)
+    finally:
+        with _lock:
+            _inflight.discard((user_id, year))
+
+
+def submit_year_report(user_id: str, year: int, snapshot: dict | None = None) -> bool:
+    """Ставит сборку отчёта в очередь процесса (если она ещё не там). snapshot=None — взять из базы."""
+    global _executor
+    if year_report_in_progress(user_id, year):
+        return False
+    # клиент берём здесь: в потоке задачи нет контекста скрипта Streamlit; кэшированный
+    # client() не годится — его авторизацию перепишет вход следующего игрока
+    sb = job_client()
+    with _lock:
+        if (user_id, year) in _inflight:
+            return False
+        _inflight.add((user_id, year))
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="year-report")
+    _executor.submit(_build_year_report, sb, user_id, year, snapshot)
+    return True
+
+
+def year_report_in_progress(user_id: str, year: int) -> bool:
+    with _lock:
+        return (user_id, year) in _inflight
+
+
+def reset_all_stats_after_export():
+    """Обнуляет статистику и рабочие списки после экспорта отчёта."""
+    st.session_state.goals = []
+    st.session_state.big_goals = []
+    st.session_state.habits = []
+    st.session_state.xp_log = {}
+    st.session_state.xp_rollup = {}
+    st.session_state.discipline_awarded_dates = []
+    st.session_state.xp = 0
+    st.session_state.level = 1
+    st.session_state.stats = _default_stats_dict()
+    st.session_state.history = empty_history()  # отмена через границу года вернула бы удалённое
+    save_state()
+
+
+def reset_year_at(now_msk) -> int | None:
+    """Год, который пора сбрасывать в момент now_msk (31 декабря с 12:00 МСК), иначе None."""
+    if (now_msk.month, now_msk.day) != (12, 31) or now_msk.hour < 12:
+        return None
+    return now_msk.year
+
+
+def apply_year_reset(year: int):
+    """Обнуляет статистику и поднимает флаг модалки — одной записью."""
+    with deferred_save():
+        reset_all_stats_after_export()
+
+        # запомним, что в этом году уже сброшено
+        st.session_state.last_reset_year = year
+        st.session_state.year_reset_pending = True
+        save_state()
+
+
+@traced
+def auto_check_yearly_reset():
+    """
+    Каждый запуск проверяет: если сегодня 31 декабря >= 12:00 (МСК) и за этот год
+    ещё не сбрасывали — сформировать отчёт, поднять флаг модалки и обнулить статистику.
+    """
+    year = reset_year_at(_moscow_now())
+    if year is None:
+        return
+    # уже сбрасывали этот год?
+    if st.session_state.get("last_reset_year") == year:
+        return
+
+    uid = current_user_id()
+    # отчёт за этот год уже есть в хранилище (сессия перезапускалась или сбросила
+    # ночная обработка) — второй раз не сбрасываем
+    meta = db_report_meta(uid, year)
+    if meta is not None:
+        st.session_state.last_reset_year = year
+        st.session_state.yearly_report_year = year
+        st.session_state.year_reset_pending = not meta.get("dismissed")
+        return
+
+    # --- snapshot ТЕКУЩЕГО состояния до обнуления — в хранилище, отчёт соберёт фоновая задача
+    snapshot = serialize_state()
+    db_save_report(uid, year, {"status": "pending", "snapshot": snapshot, "dismissed": False})
+    submit_year_report(uid, year, snapshot)
+    st.session_state.yearly_report_year = year
+    apply_year_reset(year)
@@ -0,0 +1,227 @@
+# life_rpg/search.py — поиск и фильтры по задачам, глобальным целям и привычкам
+"""
+Индекс в памяти сессии:
+
+  tokens  — инвертированный индекс: слово названия → id элементов; рядом
+            отсортированный словарь слов, чтобы искать по префиксу (bisect);
+  facets  — (поле, значение) → id: вид, категория, характеристика, статус, повтор;
+  by_due  — отсортированный список (ordinal дедлайна, id) для диапазона дат.
+
+Все изменения состояния проходят через save_state(), который увеличивает
+state_rev. Перед запросом индекс сверяется с состоянием (sync): у каждого
+элемента сравнивается короткая подпись индексируемых полей, и переиндексируются
+только изменившиеся, новые и удалённые элементы.
+"""
+import re
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+from life_rpg.export import _status
+
+KINDS = {"goal": "Задачи", "big_goal": "Глобальные цели", "habit": "Привычки"}
+STATUSES = {"open": "⬜ Активные", "overdue": "⏰ Просроченные", "done": "✅ Выполненные", "failed": "❌ Проваленные"}
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(str(text or "").lower().replace("ё", "е"))
+
+
+def _goal_sig(g: dict) -> tuple:
+    return (g.get("title"), g.get("due"), g.get("category"), g.get("stat"),
+            _status(g), g.get("recur_mode", "none"))
+
+
+def _big_goal_sig(g: dict) -> tuple:
+    return g.get("title"), g.get("due"), None, None, _status(g), None
+
+
+def _habit_sig(h: dict) -> tuple:
+    return h.get("title"), None, None, h.get("stat"), None, "by_days"
+
+
+# подпись элемента: (title, due, category, stat, status, recur); None — поля у вида нет.
+# По ней sync() понимает, что элемент надо переиндексировать.
+SIGNATURES = {"goal": _goal_sig, "big_goal": _big_goal_sig, "habit": _habit_sig}
+FACET_FIELDS = ("category", "stat", "status", "recur")  # sig[2:]
+
+
+class SearchIndex:
+    __slots__ = ("docs", "postings", "vocab", "facets", "by_due", "rev")
+
+    def __init__(self):
+        self.docs: dict[str, tuple] = {}          # id → (kind, item, подпись)
+        self.postings: dict[str, set] = {}        # слово → id
+        self.vocab: list[str] = []                # отсортированные слова postings
+        self.facets: dict[tuple, set] = {}        # (поле, значение) → id
+        self.by_due: list[tuple[int, str]] = []   # (date.toordinal(), id), отсортирован
+        self.rev = None                           # state_rev, на котором индекс сверен
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ---------- изменения ----------
+    def add(self, kind: str, item: dict, sig: tuple | None = None, sort_due: bool = True):
+        """sort_due=False — дописать в by_due без сортировки (массовое добавление, см. sync)."""
+        gid = item["id"]
+        if gid in self.docs:
+            self.remove(gid)
+        sig = sig or SIGNATURES[kind](item)
+        self.docs[gid] = (kind, item, sig)
+        postings, facets = self.postings, self.facets
+        for tok in set(tokenize(sig[0])):
+            ids = postings.get(tok)
+            if ids is None:
+                ids = postings[tok] = set()
+                insort(self.vocab, tok)
+            ids.add(gid)
+        for key in self._facet_keys(kind, sig):
+            ids = facets.get(key)
+            if ids is None:
+                ids = facets[key] = set()
+            ids.add(gid)
+        due = sig[1]
+        if due is not None:
+            if sort_due:
+                insort(self.by_due, (due.toordinal(), gid))
+            else:
+                self.by_due.append((due.toordinal(), gid))
+
+    def remove(self, gid: str):
+        doc = self.docs.pop(gid, None)
+        if doc is None:
+            return
+        kind, _item, sig = doc
+        for tok in set(tokenize(sig[0])):
+            ids = self.postings.get(tok)
+            if ids is not None:
+                ids.discard(gid)
+                if not ids:
+                    del self.postings[tok]
+                    del self.vocab[bisect_left(self.vocab, tok)]
+        for key in self._facet_keys(kind, sig):
+            ids = self.facets.get(key)
+            if ids is not None:
+                ids.discard(gid)
+                if not ids:
+                    del self.facets[key]
+        due = sig[1]
+        if due is not None:
+            i = bisect_left(self.by_due, (due.toordinal(), gid))
+            if i < len(self.by_due) and self.by_due[i][1] == gid:
+                del self.by_due[i]
+
+    @staticmethod
+    def _facet_keys(kind: str, sig: tuple) -> list[tuple]:
+        keys = [("kind", kind)]
+        keys += [(f, v) for f, v in zip(FACET_FIELDS, sig[2:]) if v is not None]
+        return keys
+
+    def sync(self, lists: dict[str, list]) -> int:
+        """Сверяет индекс с состоянием ({вид: список}); возвращает число переиндексированных."""
+        docs = self.docs
+        changed = []
+        matched = 0  # элементов, уже бывших в индексе
+        for kind, items in lists.items():
+            sig_of = SIGNATURES[kind]
+            for item in items:
+                gid = item.get("id")
+                if not gid:
+                    continue
+                doc = docs.get(gid)
+                if doc is None:
+                    changed.append((kind, item, sig_of(item)))
+                    continue
+                matched += 1
+                sig = sig_of(item)
+                if doc[1] is not item or doc[2] != sig or doc[0] != kind:
+                    changed.append((kind, item, sig))
+
+        removed = []
+        if matched != len(docs):
+            # что-то удалили — второй проход, только в этом случае
+            seen = {it.get("id") for items in lists.values() for it in items}
+            removed = [gid for gid in docs if gid not in seen]
+            for gid in removed:
+                self.remove(gid)
+
+        todo = []
+        for kind, item, sig in changed:
+            doc = docs.get(item["id"])
+            if doc is not None and doc[2] == sig and doc[0] == kind:
+                docs[item["id"]] = (kind, item, sig)  # новый dict после загрузки — поля те же
+                continue
+            todo.append((kind, item, sig))
+        # много изменений (первое построение, импорт, массовый перенос) — by_due сортируем один
+        # раз в конце. Старые записи убираем до первой дописанной: remove() ищет бисекцией,
+        # а в несортированном by_due не нашёл бы их
+        bulk = len(todo) > 64
+        if bulk:
+            for _kind, item, _sig in todo:
+                self.remove(item["id"])
+        for kind, item, sig in todo:
+            self.add(kind, item, sig, sort_due=not bulk)
+        if bulk:
+            self.by_due.sort()
+        return len(changed) + len(removed)
+
+    # ---------- запросы ----------
+    def facet_values(self, field: str) -> list:
+        return sorted(v for f, v in self.facets if f == field)
+
+    def _text(self, words: list[str]) -> set:
+        """id, в названии которых для каждого слова запроса есть слово с таким началом."""
+        result = None
+        for q in set(words):
+            hits = set()
+            i = bisect_left(self.vocab, q)
+            while i < len(self.vocab) and self.vocab[i].startswith(q):
+                hits |= self.postings[self.vocab[i]]
+                i += 1
+            result = hits if result is None else result & hits
+            if not result:
+                return set()
+        return result or set()
+
+    def _due_range(self, first: date | None, last: date | None) -> set:
+        lo = bisect_left(self.by_due, (first.toordinal(),)) if first else 0
+        hi = bisect_right(self.by_due, (last.toordinal(), "￿")) if last else len(self.by_due)
+        return {gid for _, gid in self.by_due[lo:hi]}
+
+    def query(self, text: str = "", kinds=(), categories=(), stats=(), statuses=(), recurs=(),
+              due_from: date | None = None, due_to: date | None = None) -> dict[str, list]:
+        """Пересечение всех заданных фильтров; пустой фильтр не ограничивает."""
+        sets = []
+        for field, values in (("kind", kinds), ("category", categories), ("stat", stats),
+                              ("status", statuses), ("recur", recurs)):
+            if values:
+                sets.append(set().union(*(self.facets.get((field, v), ()) for v in values)))
+        words = tokenize(text)
+        if words:
+            sets.append(self._text(words))
+        if due_from or due_to:
+            sets.append(self._due_range(due_from, due_to))
+
+        if sets:
+            sets.sort(key=len)  # пересекаем, начиная с самого узкого
+            found = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+        else:
+            found = self.docs.keys()
+        return self._group(found)
+
+    def _group(self, found) -> dict[str, list]:
+        """{вид: [элементы]}: задачи и цели — по дедлайну (by_due уже отсортирован), привычки — по названию."""
+        docs = self.docs
+        out: dict[str, list] = {k: [] for k in KINDS}
+        if len(found) * 8 >= len(self.by_due):
+            dated = (gid for _, gid in self.by_due if gid in found)
+        else:
+            dated = sorted((docs[g][2][1].toordinal(), g) for g in found if docs[g][2][1] is not None)
+            dated = (gid for _, gid in dated)
+        for gid in dated:
+            kind, item, _ = docs[gid]
+            out[kind].append(item)
+        out["habit"] = sorted((docs[g][1] for g in found if docs[g][0] == "habit"),
+                              key=lambda it: it.get("title", ""))
+        return out
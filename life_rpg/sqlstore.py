@@ -0,0 +1,185 @@
+# life_rpg/sqlstore.py — таблицы приложения в SQLite или Postgres напрямую (без Supabase API)
+"""
+Для процессов вне Streamlit — ночной обработки (life_rpg.nightly), сервера
+календарей (life_rpg.feed) и JSON API (life_rpg.api): sqlite:///путь — локальная копия, postgresql://… —
+в том числе база Supabase по прямому подключению (нужен psycopg 3.x).
+"""
+import json
+import sqlite3
+
+from life_rpg.leaderboard import COLUMNS, METRICS, rank_column
+
+SQLITE_SCHEMA = """
+create table if not exists rpg_state (
+  user_id text primary key, data text not null,
+  -- токены и время изменения вычисляются при записи: опрос ленты/API не разбирает документ
+  ics_token text generated always as (json_extract(data, '$.ics_token')) stored,
+  api_token text generated always as (json_extract(data, '$.api_token')) stored,
+  updated_at text generated always as (json_extract(data, '$.updated_at')) stored
+);
+create table if not exists rpg_reports (
+  user_id text not null, year integer not null, status text not null,
+  snapshot text, content text, error text, dismissed integer default 0,
+  primary key (user_id, year)
+);
+create table if not exists rpg_leaderboard (
+  user_id text primary key, level integer not null, xp integer not null, xp_week integer not null,
+  best_streak integer not null, habit_rate real not null, updated_at text not null,
+  rank_level integer, rank_xp_week integer, rank_best_streak integer, rank_habit_rate integer
+);
+create index if not exists rpg_leaderboard_rank_level on rpg_leaderboard (rank_level);
+create index if not exists rpg_leaderboard_rank_xp_week on rpg_leaderboard (rank_xp_week);
+create index if not exists rpg_leaderboard_rank_best_streak on rpg_leaderboard (rank_best_streak);
+create index if not exists rpg_leaderboard_rank_habit_rate on rpg_leaderboard (rank_habit_rate);
+"""
+
+
+class SQLStore:
+    """rpg_state/rpg_reports через DB-API: sqlite:///путь или postgresql://…"""
+
+    def __init__(self, url: str):
+        if url.startswith("sqlite:///"):
+            self.conn = sqlite3.connect(url[len("sqlite:///"):])
+            self.conn.executescript(SQLITE_SCHEMA)
+            self.ph, self.json_ph = "?", "?"
+            self.same = "is"  # сравнение, равное и для null
+        elif url.startswith(("postgresql://", "postgres://")):
+            try:
+                import psycopg  # лениво: нужен только для Postgres
+            except ImportError:
+                raise SystemExit("для Postgres установите psycopg: pip install 'psycopg[binary]'")
+            self.conn = psycopg.connect(url)
+            self.ph, self.json_ph = "%s", "%s::jsonb"
+            self.same = "is not distinct from"
+        else:
+            raise SystemExit(f"неизвестная база: {url} (sqlite:///… или postgresql://…)")
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _load(value):
+        # sqlite отдаёт текст, psycopg — уже разобранный jsonb
+        return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+    def iter_pages(self, size: int = 200):
+        """Страницы [(user_id, data)] по возрастанию user_id (keyset, без OFFSET)."""
+        last = ""
+        while True:
+            cur = self.conn.cursor()
+            cur.execute(
+                f"select user_id, data from rpg_state where user_id > {self.ph} order by user_id limit {self.ph}",
+                (last, size),
+            )
+            rows = [(str(uid), self._load(data)) for uid, data in cur.fetchall()]
+            cur.close()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+
+    def reported_users(self, user_ids: list[str], year: int) -> set[str]:
+        """Кому отчёт за year уже записан — их повторно не сбрасываем."""
+        if not user_ids:
+            return set()
+        cur = self.conn.cursor()
+        marks = ",".join([self.ph] * len(user_ids))
+        cur.execute(
+            f"select user_id from rpg_reports where year = {self.ph} and user_id in ({marks})",
+            (year, *user_ids),
+        )
+        found = {str(r[0]) for r in cur.fetchall()}
+        cur.close()
+        return found
+
+    def write(self, states: list[tuple[str, dict]], reports: list[tuple[str, int, dict]],
+              summaries: list[dict] = (), seen: dict[str, str | None] | None = None) -> set[str]:
+        """
+        Одна транзакция: состояния, затем отчёты и рейтинг.
+
+        seen — updated_at, прочитанный вместе с документом, по user_id: такие
+        строки перезаписываются, только если с тех пор их никто не изменил.
+        Возвращает user_id конфликтов: их состояние, отчёт и строка рейтинга
+        не пишутся (отчёт без сброса остановил бы сброс в приложении).
+        """
+        ph, jph = self.ph, self.json_ph
+        seen = seen or {}
+        conflicts: set[str] = set()
+        cur = self.conn.cursor()
+        upserts = []
+        for uid, data in states:
+            text = json.dumps(data, ensure_ascii=False)
+            if uid not in seen:
+                upserts.append((uid, text))
+                continue
+            cur.execute(
+                f"update rpg_state set data = {jph} where user_id = {ph} and updated_at {self.same} {ph}",
+                (text, uid, seen[uid]),
+            )
+            if cur.rowcount != 1:
+                conflicts.add(uid)
+        if upserts:
+            cur.executemany(
+                f"insert into rpg_state (user_id, data) values ({ph}, {jph}) "
+                f"on conflict (user_id) do update set data = excluded.data",
+                upserts,
+            )
+        reports = [r for r in reports if r[0] not in conflicts]
+        summaries = [s for s in summaries if s["user_id"] not in conflicts]
+        if reports:
+            cur.executemany(
+                f"insert into rpg_reports (user_id, year, status, snapshot, content, error, dismissed) "
+                f"values ({ph}, {ph}, {ph}, {jph}, {ph}, {ph}, {ph}) "
+                f"on conflict (user_id, year) do update set status = excluded.status, "
+                f"snapshot = excluded.snapshot, content = excluded.content, error = excluded.error, "
+                f"dismissed = excluded.dismissed",
+                [(uid, year, f["status"], None if f.get("snapshot") is None else json.dumps(f["snapshot"]),
+                  f.get("content"), f.get("error"), bool(f.get("dismissed"))) for uid, year, f in reports],
+            )
+        if summaries:
+            cols = ", ".join(COLUMNS)
+            updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS[1:])
+            cur.executemany(
+                f"insert into rpg_leaderboard ({cols}) values ({', '.join([ph] * len(COLUMNS))}) "
+                f"on conflict (user_id) do update set {updates}",
+                [tuple(s[c] for c in COLUMNS) for s in summaries],
+            )
+        cur.close()
+        self.conn.commit()
+        return conflicts
+
+    def rank_leaderboard(self):
+        """Места по каждой метрике (при равенстве — по user_id) — одна транзакция после всех записей."""
+        cur = self.conn.cursor()
+        for metric in METRICS:
+            col = rank_column(metric)
+            cur.execute(
+                f"update rpg_leaderboard set {col} = r.n from ("
+                f"select user_id, row_number() over (order by {metric} desc, user_id) as n from rpg_leaderboard"
+                f") as r where rpg_leaderboard.user_id = r.user_id"
+            )
+        cur.close()
+        self.conn.commit()
+
+    def state_meta(self, user_id: str) -> dict | None:
+        """ics_token, api_token и updated_at — из вычисляемых колонок, без чтения документа;
+        None — строки нет."""
+        cur = self.conn.cursor()
+        cur.execute(f"select ics_token, api_token, updated_at from rpg_state where user_id = {self.ph}", (user_id,))
+        row = cur.fetchone()
+        cur.close()
+        return None if row is None else {"ics_token": row[0], "api_token": row[1], "updated_at": row[2]}
+
+    def load_state(self, user_id: str) -> dict | None:
+        cur = self.conn.cursor()
+        cur.execute(f"select data from rpg_state where user_id = {self.ph}", (user_id,))
+        row = cur.fetchone()
+        cur.close()
+        return None if row is None else self._load(row[0])
+
+    def save_state(self, user_id: str, data: dict):
+        self.write([(user_id, data)], [])
+
+    def save_state_if(self, user_id: str, data: dict, seen) -> bool:
+        """Запись, только если updated_at строки всё ещё seen (его прочитали вместе с документом)."""
+        return not self.write([(user_id, data)], [], seen={user_id: seen})
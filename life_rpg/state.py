@@ -0,0 +1,211 @@
+# life_rpg/state.py — начальное состояние сессии и доступ к его частям
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.cache import memo, state_revision
+from life_rpg.history import empty_history
+from life_rpg.persistence import load_state_if_exists, refresh_if_changed
+from life_rpg.search import SearchIndex
+from life_rpg.tracing import traced
+from life_rpg.xp_series import DailyXPSeries, XPHistory
+
+
+def _default_stats_dict():
+    return {
+        "Здоровье ❤️": 0,
+        "Интеллект 🧠": 0,
+        "Радость 🙂": 0,
+        "Отношения 🤝": 0,
+        "Успех ⭐": 0,
+        "Дисциплина 🎯": 0.0,
+    }
+
+
+@traced(name="bootstrap")
+def _bootstrap_state():
+    ss = st.session_state
+    ss.setdefault("goals", [])
+    ss.setdefault("big_goals", [])
+    ss.setdefault("habits", [])
+    ss.setdefault("xp", 0)
+    ss.setdefault("level", 1)
+    ss.setdefault("stats", _default_stats_dict())
+    ss.setdefault("xp_log", {})
+    ss.setdefault("xp_rollup", {})
+    ss.setdefault("discipline_awarded_dates", [])
+    ss.setdefault("history", empty_history())
+    ss.setdefault("levelup_pending", False)
+    ss.setdefault("levelup_to", 1)
+    ss.setdefault("last_reset_year", None)
+    ss.setdefault("year_reset_pending", False)
+    ss.setdefault("yearly_report_year", None)
+    ss.setdefault("page", "home")
+    ss.setdefault("show_add_form", False)
+    ss.setdefault("show_visual", False)
+
+
+def ensure_xp_log_dict():
+    log = st.session_state.get("xp_log")
+    if log is None:
+        st.session_state.xp_log = {}
+        return
+    if isinstance(log, list):
+        # конвертируем список пар в словарь
+        try:
+            st.session_state.xp_log = {str(k): int(v) for k, v in log}
+        except Exception:
+            st.session_state.xp_log = {}
+    elif not isinstance(log, dict):
+        st.session_state.xp_log = {}
+
+
+def xp_series() -> DailyXPSeries:
+    """Плотный ряд XP по дням для текущего xp_log (перестраивается, только если лог заменили)."""
+    log = st.session_state.get("xp_log") or {}
+    series = st.session_state.get("xp_series")
+    if series is None or series.source is not log:
+        series = DailyXPSeries.from_log(log)
+        st.session_state.xp_series = series
+    return series
+
+
+def xp_history() -> XPHistory:
+    """XP по всем временам: помесячная свёртка старых дней + дневной ряд (для длинных графиков и отчёта)."""
+    return XPHistory(st.session_state.get("xp_rollup") or {}, xp_series())
+
+
+@traced
+def search_index() -> SearchIndex:
+    """Индекс поиска, сверенный с текущей ревизией состояния (переиндексируются только изменения)."""
+    index = st.session_state.get("search_index")
+    if index is None:
+        index = st.session_state.search_index = SearchIndex()
+    rev = state_revision()
+    if index.rev != rev:
+        index.sync({
+            "goal": st.session_state.get("goals", []),
+            "big_goal": st.session_state.get("big_goals", []),
+            "habit": st.session_state.get("habits", []),
+        })
+        index.rev = rev
+    return index
+
+
+def _ensure_discipline_list():
+    if "discipline_awarded_dates" not in st.session_state or st.session_state.discipline_awarded_dates is None:
+        st.session_state.discipline_awarded_dates = []
+
+
+def today_str() -> str:
+    return clock.today().isoformat()
+
+
+def goal_uid(g) -> str:
+    return ids.ensure_id(g)
+
+
+def big_goal_uid(g) -> str:
+    return ids.ensure_id(g)
+
+
+def habit_uid(h: dict) -> str:
+    return ids.ensure_id(h)
+
+
+def goals_in_order() -> list:
+    """Задачи, отсортированные по ключу order (пересортировка — только после изменений)."""
+    goals = st.session_state.goals
+    return memo("goals_order", lambda: sorted(goals, key=ids.order_key), id(goals), len(goals))
+
+
+def goal_by_id(gid: str):
+    goals = st.session_state.goals
+    return memo("goal_index", lambda: ids.index_by_id(goals), id(goals), len(goals)).get(gid)
+
+
+def habit_by_id(hid: str):
+    habits = st.session_state.habits
+    return memo("habit_index", lambda: ids.index_by_id(habits), id(habits), len(habits)).get(hid)
+
+
+def big_goal_by_id(gid: str):
+    big = st.session_state.big_goals
+    return memo("big_goal_index", lambda: ids.index_by_id(big), id(big), len(big)).get(gid)
+
+
+def init_session():
+    """Первый запуск сессии: загрузка из базы или пустое состояние + подстраховки для старых сохранений;
+    в следующих перезапусках — сверка копии сессии с базой."""
+    if "initialized" not in st.session_state:
+        loaded = load_state_if_exists()
+        if not loaded:
+            st.session_state.goals = []
+            st.session_state.big_goals = []
+            st.session_state.habits = []
+            st.session_state.xp = 0
+            st.session_state.level = 1
+            st.session_state.setdefault("levelup_pending", False)
+            st.session_state.setdefault("levelup_to", st.session_state.get("level", 1))
+            st.session_state.setdefault("last_reset_year", None)
+            st.session_state.setdefault("year_reset_pending", False)       # показать модалку
+            st.session_state.setdefault("yearly_report_path", None)        # путь к xlsx, если сохраним на диск (не обяз.)
+            st.session_state.setdefault("yearly_report_year", None)
+            st.session_state.stats = {
+                "Здоровье ❤️": 0,
+                "Интеллект 🧠": 0,
+                "Радость 🙂": 0,
+                "Отношения 🤝": 0,
+                "Успех ⭐": 0,
+                "Дисциплина 🎯": 0.0,
+            }
+            st.session_state.xp_log = {}
+            st.session_state.xp_rollup = {}
+            st.session_state.discipline_awarded_dates = []
+        else:
+            # подстраховки для старых сохранений
+            if "goals" not in st.session_state:
+                st.session_state.goals = []
+            if "big_goals" not in st.session_state or st.session_state.big_goals is None:
+                st.session_state.big_goals = []
+            if "habits" not in st.session_state or st.session_state.habits is None:
+                st.session_state.habits = []
+            if "xp" not in st.session_state:
+                st.session_state.xp = 0
+            if "level" not in st.session_state:
+                st.session_state.level = 1
+            if "stats" not in st.session_state:
+                st.session_state.stats = {
+                    "Здоровье ❤️": 0,
+                    "Интеллект 🧠": 0,
+                    "Радость 🙂": 0,
+                    "Отношения 🤝": 0,
+                    "Успех ⭐": 0,
+                    "Дисциплина 🎯": 0.0,
+                }
+            if "xp_log" not in st.session_state or st.session_state.xp_log is None:
+                st.session_state.xp_log = {}
+            if not isinstance(st.session_state.get("xp_rollup"), dict):
+                st.session_state.xp_rollup = {}
+            if "discipline_awarded_dates" not in st.session_state:
+                st.session_state.discipline_awarded_dates = []
+
+        # общие служебные вещи
+        ensure_xp_log_dict()
+        st.session_state.setdefault("page", "home")
+        st.session_state.setdefault("show_add_form", False)
+        st.session_state.setdefault("show_visual", False)
+        st.session_state.initialized = True
+
+        # служебные приведения типов/структур
+        ensure_xp_log_dict()
+
+        # UI-флаги по умолчанию
+        st.session_state.setdefault("page", "home")          # <— ВАЖНО: текущая страница
+        st.session_state.setdefault("show_add_form", False)  # форма добавления задачи на Главной
+        st.session_state.setdefault("show_visual", False)    # показ визуализации на Профиле
+        st.session_state.setdefault("edit_goal_uid", None)
+        st.session_state.setdefault("edit_habit_uid", None)
+
+        st.session_state.initialized = True
+    else:
+        refresh_if_changed()  # документ могли изменить API или другая вкладка
@@ -0,0 +1,192 @@
+# life_rpg/stats.py — агрегаты для блока «Полная статистика»
+from datetime import date
+
+import streamlit as st
+
+from life_rpg import clock
+from life_rpg.memory import as_dates
+from life_rpg.state import xp_series
+
+
+def _current_and_best_streak() -> tuple[int, int]:
+    """
+    Считаем 'серии без пропусков' на основе discipline_awarded_dates:
+    день считается успешным, если вчера (или дата из списка) был выполнен весь план (задачи+привычки).
+    current — текущая серия до вчера включительно.
+    best — лучшая серия за всё время.
+    """
+    dates = sorted(set(st.session_state.get("discipline_awarded_dates", [])))
+    if not dates:
+        return 0, 0
+
+    # Преобразуем в объекты date
+    from datetime import datetime, timedelta
+    ds = [datetime.fromisoformat(d).date() for d in dates]
+
+    # Лучшая серия
+    best = 0
+    cur = 1
+    for i in range(1, len(ds)):
+        if (ds[i] - ds[i-1]).days == 1:
+            cur += 1
+        else:
+            best = max(best, cur)
+            cur = 1
+    best = max(best, cur)
+
+    # Текущая серия до вчера
+    yesterday = clock.today() - timedelta(days=1)
+    # найдём хвост последовательности, оканчивающейся на yesterday
+    if ds[-1] != yesterday:
+        current = 0
+    else:
+        current = 1
+        i = len(ds) - 1
+        while i > 0 and (ds[i] - ds[i-1]).days == 1:
+            current += 1
+            i -= 1
+
+    return current, best
+
+
+def _goals_stats():
+    goals = st.session_state.get("goals", [])
+    # по типам
+    by_type = {"Краткосрочная": 0, "Среднесрочная": 0, "Долгосрочная": 0}
+    # по категориям
+    by_cat = {}
+    done_cnt = 0
+    fail_cnt = 0
+    overdue_cnt = 0
+    active_cnt = 0
+
+    for g in goals:
+        by_type[g["type"]] = by_type.get(g["type"], 0) + 1
+        cat = g.get("category", "Прочее")
+        by_cat[cat] = by_cat.get(cat, 0) + 1
+        if g["done"]:
+            done_cnt += 1
+        elif g["failed"]:
+            fail_cnt += 1
+            if g.get("overdue"):
+                overdue_cnt += 1
+        else:
+            active_cnt += 1
+
+    return {
+        "by_type": by_type,
+        "by_cat": by_cat,
+        "done": done_cnt,
+        "failed": fail_cnt,
+        "overdue": overdue_cnt,
+        "active": active_cnt,
+        "total": len(goals),
+    }
+
+
+def _big_goals_stats():
+    bgs = st.session_state.get("big_goals", [])
+    total = len(bgs)
+    done = sum(1 for x in bgs if x.get("done"))
+    failed = sum(1 for x in bgs if x.get("failed"))
+    active = total - done - failed
+    # по дедлайнам ближайшее/прошедшее
+    past_due = sum(1 for x in bgs if (not x.get("done") and not x.get("failed") and x["due"] < clock.today()))
+    return {
+        "total": total, "done": done, "failed": failed, "active": active, "past_due": past_due
+    }
+
+
+def _habits_stats():
+    habits = st.session_state.get("habits", [])
+    total = len(habits)
+    # суммарные выполнения/провалы
+    total_done = sum(len(h.get("completions", [])) for h in habits)
+    total_fail = sum(len(h.get("failures", [])) for h in habits)
+    # средняя «успешность» по привычкам
+    per_habit = []
+    for h in habits:
+        d = len(h.get("completions", []))
+        f = len(h.get("failures", []))
+        attempts = d + f
+        rate = (d / attempts * 100) if attempts > 0 else 0.0
+        per_habit.append((h["title"], d, f, rate))
+    return {
+        "total": total,
+        "total_done": total_done,
+        "total_fail": total_fail,
+        "per_habit": per_habit,
+    }
+
+
+def _xp_last_7_days():
+    # возвращает список (date_str, delta_xp) за последние 7 дней
+    return [(d.strftime("%d-%m-%Y"), v) for d, v in xp_series().window(7)]
+
+
+def _week_distribution_from_dates(date_strs: list[str]) -> dict:
+    """Распределение по дням недели (0..6) из списка 'YYYY-MM-DD'."""
+    counts = {i: 0 for i in range(7)}
+    for s in date_strs:
+        try:
+            d = date.fromisoformat(s)
+            counts[d.weekday()] += 1
+        except Exception:
+            pass
+    return counts
+
+
+def _habits_week_success() -> dict:
+    """
+    Возвращает словарь {weekday_index: success_rate_percent}
+    где success_rate = completions / (completions + failures) * 100.
+    Считается по ВСЕМ привычкам суммарно.
+    """
+    habits = st.session_state.get("habits", [])
+    comp = {i: 0 for i in range(7)}
+    fail = {i: 0 for i in range(7)}
+    for h in habits:
+        for d in as_dates(h.get("completions", [])):
+            comp[d.weekday()] += 1
+        for d in as_dates(h.get("failures", [])):
+            fail[d.weekday()] += 1
+    rate = {}
+    for i in range(7):
+        total = comp[i] + fail[i]
+        rate[i] = round((comp[i] / total * 100.0), 1) if total > 0 else 0.0
+    return rate
+
+
+def _goals_category_success() -> list[tuple[str, int, int, float]]:
+    """
+    Считает успешность по категориям задач:
+    возвращает список [(категория, done, failed, success%)].
+    """
+    goals = st.session_state.get("goals", [])
+    by_cat_done = {}
+    by_cat_fail = {}
+    for g in goals:
+        cat = g.get("category", "Прочее")
+        if g.get("done"):
+            by_cat_done[cat] = by_cat_done.get(cat, 0) + 1
+        elif g.get("failed"):
+            by_cat_fail[cat] = by_cat_fail.get(cat, 0) + 1
+    cats = sorted(set(list(by_cat_done.keys()) + list(by_cat_fail.keys())))
+    out = []
+    for c in cats:
+        d = by_cat_done.get(c, 0)
+        f = by_cat_fail.get(c, 0)
+        total = d + f
+        rate = round((d / total * 100.0), 1) if total > 0 else 0.0
+        out.append((c, d, f, rate))
+    # сортируем по успешности убыв.
+    out.sort(key=lambda x: x[3], reverse=True)
+    return out
+
+
+def _xp_last_30_days_summary():
+    """Средний XP за 30 дней и топ-3 дня по XP."""
+    series = xp_series()
+    avg = round(series.average(30), 1)
+    top3_fmt = [(d.strftime("%d-%m-%Y"), v) for d, v in series.top(3, 30)]
+    return avg, top3_fmt
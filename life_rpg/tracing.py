@@ -0,0 +1,215 @@
+# life_rpg/tracing.py — лёгкая трассировка одного перезапуска скрипта
+"""
+Каждый перезапуск app.py — это «трасса» из вложенных замеров (span'ов):
+загрузка, бутстрап, auto_process_*, render_*, db_save_state...
+
+Трассировка включается, если:
+  - в адресе есть ?debug=1 (тогда в сайдбаре появляется панель), или
+  - задана переменная окружения LIFE_RPG_TRACE=1, или
+  - задан файл LIFE_RPG_TRACE_FILE — тогда каждая трасса дописывается в него
+    строкой JSON (JSON Lines) для офлайн-анализа.
+
+Когда трассировка выключена, обёртка @traced — это одна проверка атрибута
+thread-local и прямой вызов функции.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+
+TRACE_ENV = "LIFE_RPG_TRACE"
+TRACE_FILE_ENV = "LIFE_RPG_TRACE_FILE"
+HISTORY_SIZE = 20  # сколько последних трасс держим в сессии для панели
+
+_file_lock = threading.Lock()
+
+
+class _Local(threading.local):
+    trace = None  # активная трасса текущего потока скрипта (или None)
+
+
+_local = _Local()
+
+
+class Trace:
+    """Замеры одного перезапуска. Span хранится списком [имя, начало, длительность, глубина]."""
+
+    __slots__ = ("t0", "wall", "spans", "depth", "last", "meta")
+
+    def __init__(self, meta: dict | None = None):
+        self.t0 = time.perf_counter()
+        self.wall = time.time()
+        self.spans: list[list] = []
+        self.depth = 0
+        self.last = 0.0  # конец последнего закрытого span'а (для прерванных перезапусков)
+        self.meta = meta or {}
+
+    def open(self, name: str) -> list:
+        rec = [name, time.perf_counter() - self.t0, None, self.depth]
+        self.spans.append(rec)
+        self.depth += 1
+        return rec
+
+    def close(self, rec: list):
+        end = time.perf_counter() - self.t0
+        rec[2] = end - rec[1]
+        self.depth -= 1
+        self.last = end
+
+    def to_dict(self, status: str, total: float | None = None) -> dict:
+        total = self.last if total is None else total
+        return {
+            "ts": datetime.fromtimestamp(self.wall).isoformat(timespec="milliseconds"),
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            **self.meta,
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": round(start * 1000, 3),
+                    # незакрытый span — перезапуск прервался внутри него (st.rerun/st.stop)
+                    "dur_ms": round(dur * 1000, 3) if dur is not None else None,
+                    "depth": depth,
+                }
+                for name, start, dur, depth in self.spans
+            ],
+        }
+
+
+def traced(fn=None, *, name: str | None = None):
+    """Декоратор: замеряет вызов функции как span (по умолчанию — по её имени)."""
+    def deco(f):
+        label = name or f.__name__
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            tr = _local.trace
+            if tr is None:
+                return f(*args, **kwargs)
+            rec = tr.open(label)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                tr.close(rec)
+        return wrapper
+
+    return deco(fn) if fn is not None else deco
+
+
+class span:
+    """Контекстный менеджер для замера произвольного блока: with span("bootstrap"): ..."""
+
+    __slots__ = ("name", "tr", "rec")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.tr = _local.trace
+        if self.tr is not None:
+            self.rec = self.tr.open(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if self.tr is not None:
+            self.tr.close(self.rec)
+        return False
+
+
+def trace_file() -> str | None:
+    return os.environ.get(TRACE_FILE_ENV) or None
+
+
+def panel_requested() -> bool:
+    try:
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def is_requested() -> bool:
+    return panel_requested() or os.environ.get(TRACE_ENV) == "1" or bool(trace_file())
+
+
+def _finalize(tr: Trace, status: str, total: float | None = None):
+    rec = tr.to_dict(status, total)
+    hist = st.session_state.setdefault("trace_history", deque(maxlen=HISTORY_SIZE))
+    hist.append(rec)
+    path = trace_file()
+    if path:
+        line = json.dumps(rec, ensure_ascii=False)
+        with _file_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def start_rerun(page: str | None = None):
+    """Начало перезапуска: закрывает прерванную прошлую трассу и, если нужно, открывает новую."""
+    ss = st.session_state
+    prev = ss.pop("trace_open", None)
+    if prev is not None:
+        # прошлый перезапуск оборвался на st.rerun()/st.stop() — фиксируем, что успели замерить
+        _finalize(prev, "interrupted")
+
+    if not is_requested():
+        _local.trace = None
+        return
+    sid = ss.setdefault("trace_session", uuid.uuid4().hex[:8])
+    tr = Trace({"session": sid, "page": page})
+    ss.trace_open = tr
+    _local.trace = tr
+
+
+def finish_rerun():
+    """Конец перезапуска (скрипт дошёл до конца)."""
+    tr = _local.trace
+    _local.trace = None
+    if tr is None:
+        return
+    st.session_state.pop("trace_open", None)
+    _finalize(tr, "ok", time.perf_counter() - tr.t0)
+
+
+def render_debug_panel():
+    """Панель трассировки в сайдбаре (только при ?debug=1)."""
+    if not panel_requested():
+        return
+    hist = list(st.session_state.get("trace_history", []))
+    with st.sidebar.expander("🐞 Трассировка перезапусков", expanded=False):
+        if not hist:
+            st.caption("Трасс пока нет.")
+            return
+        labels = [
+            f"{r['ts'][11:19]} · {r.get('page') or '—'} · {r['total_ms']:.0f} мс"
+            + (" · прерван" if r["status"] != "ok" else "")
+            for r in hist
+        ]
+        idx = st.selectbox("Перезапуск", range(len(hist)), index=len(hist) - 1,
+                           format_func=lambda i: labels[i], key="trace_pick")
+        rec = hist[idx]
+        st.metric("Всего, мс", f"{rec['total_ms']:.1f}")
+        st.dataframe(
+            [
+                {
+                    "Этап": "· " * s["depth"] + s["name"],
+                    "Начало, мс": s["start_ms"],
+                    "Длительность, мс": s["dur_ms"],
+                }
+                for s in rec["spans"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.download_button(
+            "⬇️ Трассы (JSON Lines)",
+            data="\n".join(json.dumps(r, ensure_ascii=False) for r in hist) + "\n",
+            file_name="life_rpg_traces.jsonl",
+            mime="application/x-ndjson",
+            use_container_width=True,
+            key="trace_download",
+        )
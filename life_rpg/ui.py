@@ -0,0 +1,207 @@
+# life_rpg/ui.py — общие элементы интерфейса: фрагменты, пагинация, навигация, отмена
+import functools
+
+import streamlit as st
+
+from life_rpg import budget, history, tracing
+from life_rpg.constants import PAGE_SIZE_DEFAULT, PAGE_SIZES
+
+# Фрагменты (st.fragment, Streamlit >= 1.37): клик внутри секции перезапускает только её,
+# без авторизации, авто-процессов, CSS и навигации. На старых версиях — обычный перезапуск.
+_st_fragment = getattr(st, "fragment", None)
+
+
+def _in_fragment_rerun() -> bool:
+    """True, если сейчас идёт перезапуск одного фрагмента, а не всего скрипта."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return bool(ctx and ctx.fragment_ids_this_run)
+    except Exception:
+        return False
+
+
+def _needs_full_rerun() -> bool:
+    """
+    Действие во фрагменте изменило то, что рисуется вне фрагментов: модалку
+    «Новый уровень» или всё состояние (перечитано из базы — state_reloaded).
+    Список отмены в боковой панели сюда не относится: он догоняет на следующем
+    полном перезапуске (см. render_history_controls).
+    """
+    ss = st.session_state
+    return bool(ss.get("levelup_pending") or ss.get("state_reloaded"))
+
+
+def section_fragment(fn):
+    """Оборачивает секцию страницы во фрагмент; частичный перезапуск — отдельная трасса."""
+    if _st_fragment is None:
+        return fn
+
+    @functools.wraps(fn)
+    def body(*args, **kwargs):
+        partial = _in_fragment_rerun()
+        if partial and _needs_full_rerun():
+            # колбэк виджета внутри фрагмента поднял уровень или перечитал состояние
+            st.rerun()
+        if partial:
+            tracing.start_rerun(f"{st.session_state.get('page')}:{fn.__name__}")
+            budget.start_rerun()
+        fn(*args, **kwargs)
+        if partial:
+            tracing.finish_rerun()
+            budget.finish_rerun()
+
+    return _st_fragment(body)
+
+
+def rerun_section():
+    """
+    Перерисовать текущую секцию. Если действие подняло уровень — нужен полный
+    перезапуск: модалка «Новый уровень» рисуется вне фрагментов.
+    """
+    if _in_fragment_rerun() and not _needs_full_rerun():
+        st.rerun(scope="fragment")
+    st.rerun()
+
+
+def _page_step(page_key: str, delta: int, pages: int):
+    """Колбэк кнопок ◀/▶: меняет номер страницы до того, как виджет будет создан."""
+    st.session_state[page_key] = min(max(1, st.session_state.get(page_key, 1) + delta), pages)
+
+
+def _page_size_changed(page_key: str):
+    st.session_state[page_key] = 1
+
+
+def paginate(items: list, scope: str) -> tuple[int, list]:
+    """
+    Рисует навигацию по страницам для списка и возвращает (смещение, видимый срез).
+    Короткие списки (до PAGE_SIZES[0]) показываются целиком без панели.
+    """
+    start, stop = page_controls(len(items), scope)
+    return start, items[start:stop]
+
+
+def page_controls(n: int, scope: str) -> tuple[int, int]:
+    """
+    Навигация по n строкам, которых нет в памяти (например, страница из базы):
+    возвращает границы [start, stop) текущей страницы. До PAGE_SIZES[0] строк — без панели.
+    """
+    if n <= PAGE_SIZES[0]:
+        return 0, n
+
+    size_key = f"pg_size_{scope}"
+    page_key = f"pg_no_{scope}"
+    size = st.session_state.get(size_key, PAGE_SIZE_DEFAULT)
+    pages = -(-n // size)
+    # список мог сократиться (задачи выполнены) — поджимаем номер страницы
+    st.session_state[page_key] = min(max(1, st.session_state.get(page_key, 1)), pages)
+    page = st.session_state[page_key]
+
+    c_prev, c_page, c_next, c_size, c_info = st.columns([1, 2, 1, 2, 4])
+    c_prev.button("◀", key=f"pg_prev_{scope}", use_container_width=True, disabled=page <= 1,
+                  on_click=_page_step, args=(page_key, -1, pages))
+    c_page.number_input("Страница", min_value=1, max_value=pages, step=1, key=page_key,
+                        label_visibility="collapsed", help="Перейти к странице")
+    c_next.button("▶", key=f"pg_next_{scope}", use_container_width=True, disabled=page >= pages,
+                  on_click=_page_step, args=(page_key, +1, pages))
+    c_size.selectbox("На странице", PAGE_SIZES, index=PAGE_SIZES.index(size), key=size_key,
+                     format_func=lambda v: f"по {v}", label_visibility="collapsed",
+                     on_change=_page_size_changed, args=(page_key,))
+
+    start = (page - 1) * size
+    stop = min(start + size, n)
+    c_info.caption(f"Показаны {start + 1}–{stop} из {n} · страница {page} из {pages}")
+    return start, stop
+
+
+def nav_button(col, label, icon, target, key):
+    with col:
+        pressed = st.button(f"{icon} {label}", key=key, use_container_width=True)
+        cls = "label active" if st.session_state.page == target else "label"
+        st.markdown(f'<div class="{cls}">{label}</div>', unsafe_allow_html=True)
+    if pressed:
+        st.session_state.page = target
+        st.rerun()
+
+
+def render_navbar():
+    """Нижняя навигация между страницами."""
+    st.markdown(
+        """
+<style>
+.navbar {
+  position: fixed; left: 0; right: 0; bottom: 0;
+  padding: 10px 16px;
+  background: rgba(32,32,32,0.9);
+  border-top: 1px solid rgba(255,255,255,0.1);
+  backdrop-filter: blur(6px);
+  z-index: 9999;
+}
+.navbar .label { font-size: 14px; text-align: center; margin-top: 4px; color: #ddd; }
+.navbar .active { color: #16c60c; font-weight: 700; }
+</style>
+""",
+        unsafe_allow_html=True,
+    )
+    st.markdown('<div class="navbar">', unsafe_allow_html=True)
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
+    nav_button(c1, "Главная", "🏠", "home", "nav_home")
+    nav_button(c2, "Профиль", "👤", "profile", "nav_profile")
+    nav_button(c3, "Цели", "🎯", "goals", "nav_goals")
+    nav_button(c4, "Привычки", "📆", "habits", "nav_habits")
+    nav_button(c5, "Импорт", "📥", "import", "nav_import")
+    nav_button(c6, "Рейтинг", "🏆", "leaderboard", "nav_leaderboard")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# ===== ОТМЕНА / ПОВТОР =====
+def _history_notice(done: str, nothing: str, entry: dict | None, skipped: int):
+    if entry is None:
+        st.session_state.history_notice = nothing
+        return
+    note = f"{done}: {entry['label']}"
+    if skipped:
+        note += f" (пропущено изменений: {skipped} — их уже поменяли после)"
+    st.session_state.history_notice = note
+
+
+def _undo_click():
+    _history_notice("Отменено", "Нечего отменять", *history.undo())
+
+
+def _redo_click():
+    _history_notice("Повторено", "Нечего повторять", *history.redo())
+
+
+def _undo_to_click(entry: dict):
+    n = history.depth(entry)
+    if n is None:
+        st.session_state.history_notice = "Это действие уже отменено"
+        return
+    skipped = history.undo_to(n)
+    st.session_state.history_notice = f"Отменено действий: {n}" + (f" (пропущено изменений: {skipped})" if skipped else "")
+
+
+def render_history_controls():
+    """
+    ↩️/↪️ в боковой панели: клик — полный перезапуск, шапка и списки страницы обновятся.
+    Действия во фрагментах перезапускают только свою секцию, поэтому список последних
+    действий обновляется на следующем полном перезапуске; кнопки отменяют по записи
+    (history.depth) и работают и с отставшим списком, ↩️/↪️ — всегда с настоящим.
+    """
+    sb = st.sidebar
+    c1, c2 = sb.columns(2)
+    c1.button("↩️ Отменить", key="undo_btn", on_click=_undo_click, use_container_width=True)
+    c2.button("↪️ Повторить", key="redo_btn", on_click=_redo_click, use_container_width=True)
+    notice = st.session_state.pop("history_notice", None)
+    if notice:
+        sb.caption(notice)
+    recent = history.recent()
+    if recent:
+        with sb.expander("🕘 Последние действия"):
+            for i, (label, at, entry) in enumerate(recent, start=1):
+                c_label, c_btn = st.columns([4, 1])
+                c_label.caption(f"{at:%d.%m %H:%M} · {label}" if at else label)
+                c_btn.button("↩️", key=f"undo_to_{i}", help="Отменить это и все более поздние действия",
+                             on_click=_undo_to_click, args=(entry,))
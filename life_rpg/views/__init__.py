@@ -0,0 +1,16 @@
+"""Страницы приложения: page (st.session_state.page) → функция отрисовки."""
+from life_rpg.views.goals import render_goals_page
+from life_rpg.views.habits import render_habits_page
+from life_rpg.views.home import render_home_page
+from life_rpg.views.importer import render_import_page
+from life_rpg.views.leaderboard import render_leaderboard_page
+from life_rpg.views.profile import render_profile_page
+
+PAGES = {
+    "home": render_home_page,
+    "profile": render_profile_page,
+    "goals": render_goals_page,
+    "habits": render_habits_page,
+    "import": render_import_page,
+    "leaderboard": render_leaderboard_page,
+}
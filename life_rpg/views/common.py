@@ -0,0 +1,174 @@
+# life_rpg/views/common.py — общие блоки страниц: шапка характеристик и модалки
+import streamlit as st
+
+from life_rpg.auth import current_user_id
+from life_rpg.db import db_report_content, db_report_meta, db_save_report
+from life_rpg.logic import _moscow_now
+from life_rpg.persistence import save_state
+from life_rpg.report import XLSX_MIME, submit_year_report, year_report_in_progress
+from life_rpg.tracing import traced
+
+
+def render_stats_header():
+    """Характеристики + опыт/уровень (шапка интерактивных секций)."""
+    st.subheader("📊 Характеристики")
+    cols = st.columns(6)
+    stats = st.session_state.stats
+    keys = ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"]
+    for i, k in enumerate(keys):
+        with cols[i]:
+            st.metric(k, f"{stats.get(k, 0):.1f}")
+
+    xp = st.session_state.xp
+    level = st.session_state.level
+    st.markdown(f"**Опыт (XP):** {xp} / 1000 &nbsp;&nbsp;|&nbsp;&nbsp; **Уровень:** {level}")
+    st.progress(min(1.0, (xp % 1000) / 1000))
+
+
+@traced
+def render_levelup_modal():
+    """Кросс-версия модалки «Новый уровень»: st.dialog если есть, иначе — псевдо-модалка."""
+    if not st.session_state.get("levelup_pending"):
+        return
+
+    # Вариант 1: если Streamlit поддерживает st.dialog
+    if hasattr(st, "dialog"):
+        @st.dialog("🎉 Новый уровень!")
+        def _levelup_dialog():
+            to_lvl = st.session_state.get("levelup_to", st.session_state.get("level", 1))
+            st.markdown(f"## Поздравляю! Достигнут уровень **{to_lvl}** 🚀")
+            st.write("Ты стал(а) сильнее. Продолжаем путь!")
+            if st.button("Только вперёд 💪", use_container_width=True, key="close_levelup_dialog"):
+                st.session_state.levelup_pending = False
+                save_state()
+                st.rerun()
+        _levelup_dialog()
+        return
+
+    # Вариант 2: fallback — «псевдо-модалка» (если st.dialog недоступен)
+    st.markdown("""
+    <style>
+      .lvlup-overlay {
+        position: fixed; inset: 0; background: rgba(0,0,0,0.55);
+        display: flex; align-items: center; justify-content: center;
+        z-index: 9999;
+      }
+      .lvlup-modal {
+        width: min(520px, 92vw);
+        background: #111; color: #fff; border: 1px solid #333;
+        border-radius: 16px; padding: 24px;
+        box-shadow: 0 20px 60px rgba(0,0,0,0.6);
+      }
+      .lvlup-title { font-size: 24px; margin: 0 0 8px 0; }
+      .lvlup-sub { opacity: .85; margin-bottom: 18px; }
+    </style>
+    """, unsafe_allow_html=True)
+
+    to_lvl = st.session_state.get("levelup_to", st.session_state.get("level", 1))
+    st.markdown(
+        f"""
+        <div class="lvlup-overlay">
+          <div class="lvlup-modal">
+            <div class="lvlup-title">🎉 Новый уровень!</div>
+            <div class="lvlup-sub">Поздравляю! Достигнут уровень <b>{to_lvl}</b> 🚀<br/>Ты стал(а) сильнее. Продолжаем путь!</div>
+          </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Кнопку рендерим «поверх» — рядом, но логически относится к модалке
+    if st.button("Только вперёд 💪", key="close_levelup_fallback", use_container_width=True):
+        st.session_state.levelup_pending = False
+        save_state()
+        st.rerun()
+
+
+def _report_year() -> int:
+    return st.session_state.get("yearly_report_year") or _moscow_now().year
+
+
+def _render_year_report_download(suffix: str = ""):
+    """Статус отчёта из хранилища; содержимое читается только по кнопке и не кладётся в session_state."""
+    uid, year = current_user_id(), _report_year()
+    status = (db_report_meta(uid, year) or {}).get("status")
+
+    if status == "ready":
+        if st.button("📄 Получить отчёт", use_container_width=True, key=f"get_year_report{suffix}"):
+            data = db_report_content(uid, year)
+            if data:
+                st.download_button("⬇️ Скачать отчёт", data=data, file_name=f"year_report_{year}.xlsx",
+                                   mime=XLSX_MIME, use_container_width=True, key=f"dl_year_report{suffix}")
+        return
+
+    if status == "failed":
+        st.warning("Не получилось собрать отчёт.")
+        if st.button("🔁 Собрать заново", use_container_width=True, key=f"retry_year_report{suffix}"):
+            db_save_report(uid, year, {"status": "pending", "error": None})
+            submit_year_report(uid, year)
+            st.rerun()
+        return
+
+    # pending: если задачи нет в этом процессе (его перезапускали) — ставим заново по snapshot'у из базы
+    if status == "pending" and not year_report_in_progress(uid, year):
+        submit_year_report(uid, year)
+    st.info("⏳ Отчёт собирается в фоне — можно закрыть окно и вернуться позже.")
+    st.button("🔄 Проверить", use_container_width=True, key=f"check_year_report{suffix}")
+
+
+def _close_year_modal():
+    st.session_state.year_reset_pending = False
+    db_save_report(current_user_id(), _report_year(), {"dismissed": True})
+    save_state()
+
+
+@traced
+def render_year_reset_modal():
+    """Поздравление с прошедшим годом + кнопка скачать отчёт и закрыть модалку."""
+    if not st.session_state.get("year_reset_pending"):
+        return
+
+    title = "🎆 С Новым годом!"
+    body_md = (
+        "Поздравляю с прошедшим годом! Ты проделал(а) огромную работу — гордись собой. "
+        "Пусть новый год будет ещё сильнее, радостнее и продуктивнее. 🚀\n\n"
+        "Здесь можно скачать **полный отчёт за год** в Excel."
+    )
+
+    # 1) Если есть st.dialog (новые версии)
+    if hasattr(st, "dialog"):
+        @st.dialog(title)
+        def _year_dialog():
+            st.markdown(body_md)
+            _render_year_report_download()
+            if st.button("Только вперёд 💪", use_container_width=True, key="close_newyear"):
+                _close_year_modal()
+                st.rerun()
+        _year_dialog()
+        return
+
+    # 2) Fallback: «псевдо-модалка»
+    st.markdown("""
+    <style>
+      .ny-overlay { position: fixed; inset: 0; background: rgba(0,0,0,.55);
+        display:flex; align-items:center; justify-content:center; z-index: 9999; }
+      .ny-modal { width:min(560px,95vw); background:#111; color:#fff; border:1px solid #333;
+        border-radius: 16px; padding: 24px; box-shadow: 0 20px 60px rgba(0,0,0,.6); }
+      .ny-title { font-size:24px; margin:0 0 8px 0; }
+      .ny-sub { opacity:.9; margin-bottom: 14px; white-space: pre-wrap; }
+    </style>
+    """, unsafe_allow_html=True)
+    st.markdown(f"""
+    <div class="ny-overlay">
+      <div class="ny-modal">
+        <div class="ny-title">{title}</div>
+        <div class="ny-sub">{body_md}</div>
+      </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Кнопки рядом (в обычном потоке)
+    _render_year_report_download("_fb")
+    if st.button("Только вперёд 💪", use_container_width=True, key="close_newyear_fb"):
+        _close_year_modal()
+        st.rerun()
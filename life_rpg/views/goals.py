@@ -0,0 +1,111 @@
+# life_rpg/views/goals.py — 🎯 Глобальные цели
+from datetime import date
+
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.history import recording
+from life_rpg.logic import settle_big_goal
+from life_rpg.persistence import deferred_save, save_state
+from life_rpg.state import big_goal_uid
+from life_rpg.tracing import traced
+from life_rpg.views.common import render_levelup_modal, render_year_reset_modal
+
+
+@traced
+def render_goals_page():
+    """🎯 Глобальные цели (годовые)"""
+    st.header("🎯 Глобальные цели")
+    render_levelup_modal()
+
+    render_year_reset_modal()
+
+    st.caption("Это большие цели, например, на год. За выполнение: **+250 XP** и **+10 ко всем показателям**.")
+
+    # --- показать/скрыть форму добавления ---
+    if "show_big_goal_form" not in st.session_state:
+        st.session_state.show_big_goal_form = False
+
+    if st.button("➕ Добавить цель", key="btn_show_big_goal_form"):
+        st.session_state.show_big_goal_form = not st.session_state.show_big_goal_form
+        st.rerun()
+
+    if st.session_state.show_big_goal_form:
+        with st.form("add_big_goal_form", clear_on_submit=True):
+            title = st.text_input("Название глобальной цели", placeholder="Например: Выучить английский до B2")
+            due = st.date_input("Дедлайн", value=clock.today().replace(month=12, day=31))
+            note = st.text_area("Описание / критерии успеха (по желанию)")
+            submitted = st.form_submit_button("Сохранить")
+
+            if submitted:
+                if not title.strip():
+                    st.warning("Введите название цели.")
+                else:
+                    st.session_state.big_goals.append({
+                        "id": ids.new_id(),
+                        "title": title.strip(),
+                        "due": due if isinstance(due, date) else date.fromisoformat(str(due)),
+                        "done": False,
+                        "failed": False,
+                        "note": note.strip(),
+                    })
+                    save_state()
+                    st.success("Глобальная цель добавлена!")
+                    st.session_state.show_big_goal_form = False
+                    st.rerun()
+
+    st.divider()
+
+    # --- список глобальных целей ---
+    goals = st.session_state.get("big_goals", [])
+    if not goals:
+        st.info("Пока нет глобальных целей. Добавьте первую выше 👆")
+        return
+
+    goals = sorted(goals, key=lambda g: g["due"])
+
+    for g in goals:
+        uid = big_goal_uid(g)
+        status = "✅ Выполнена" if g["done"] else ("❌ Провалена" if g["failed"] else "🟡 В процессе")
+        due_str = g["due"].strftime("%d-%m-%Y")
+
+        with st.container():
+            c1, c2, c3, c4 = st.columns([6, 2, 1, 1])
+
+            with c1:
+                st.markdown(f"**{g['title']}**")
+                meta = f"📅 Дедлайн: {due_str} • Статус: {status}"
+                if g.get("note"):
+                    meta += f" • 📝 {g['note']}"
+                st.caption(meta)
+
+            with c2:
+                if not g["done"] and not g["failed"]:
+                    done_btn = st.button("✅ Выполнить", key=f"big_done_{uid}")
+                    fail_btn = st.button("❌ Провалить", key=f"big_fail_{uid}")
+                else:
+                    done_btn = fail_btn = False
+
+            with c3:
+                if st.button("🗑️", key=f"big_del_{uid}", help="Удалить цель"):
+                    with deferred_save(), recording(f"🗑️ Удалена цель «{g['title']}»", big_goals=[g]):
+                        st.session_state.big_goals = [x for x in st.session_state.big_goals if x is not g]
+                        save_state()
+                    st.rerun()
+
+            with c4:
+                new_due = st.date_input("Новый дедлайн", value=g["due"], key=f"big_due_{uid}")
+                if new_due != g["due"]:
+                    g["due"] = new_due
+                    save_state()
+
+            # обработка выполнения/провала
+            if done_btn:
+                settle_big_goal(g, True)
+                st.success("Поздравляю! Большая цель достигнута 🎉")
+                st.rerun()
+
+            if fail_btn:
+                settle_big_goal(g, False)
+                st.warning("Цель помечена как проваленная. Штраф применён.")
+                st.rerun()
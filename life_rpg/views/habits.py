@@ -0,0 +1,249 @@
+# life_rpg/views/habits.py — 📆 Привычки
+from datetime import date
+
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.cache import LRUCache
+from life_rpg.charts import aggregate_heatmap_spec, habit_heatmap_spec
+from life_rpg.constants import WEEKDAY_LABELS
+from life_rpg.heatmap import HabitBits, aggregate_cells, habit_cells, habit_revision
+from life_rpg.history import recording
+from life_rpg.logic import habit_done_on_date, habit_failed_on_date, habit_mark, is_habit_scheduled_today, touch_habit
+from life_rpg.memory import DayList
+from life_rpg.persistence import deferred_save, save_state
+from life_rpg.state import habit_uid
+from life_rpg.tracing import traced
+from life_rpg.ui import rerun_section, section_fragment
+from life_rpg.views.common import render_levelup_modal, render_stats_header, render_year_reset_modal
+
+
+@traced
+def render_edit_habit_form(habit: dict, uid: str):
+    with st.form(f"edit_habit_form_{uid}"):
+        st.subheader("✏️ Редактировать привычку")
+        title = st.text_input("Название привычки", value=habit["title"], key=f"h_title_{uid}")
+        days = st.multiselect(
+            "Дни недели",
+            options=list(range(7)),
+            default=habit.get("days", []),
+            format_func=lambda i: WEEKDAY_LABELS[i],
+            key=f"h_days_{uid}",
+        )
+        stat_options = ["Здоровье ❤️","Интеллект 🧠","Радость 🙂","Отношения 🤝","Успех ⭐","Дисциплина 🎯"]
+        stat_index = stat_options.index(habit.get("stat", stat_options[0]))
+        stat = st.selectbox(
+            "Какая характеристика качается:",
+            stat_options,
+            index=stat_index,
+            key=f"h_stat_{uid}",
+        )
+        col1, col2 = st.columns(2)
+        save_btn = col1.form_submit_button("Сохранить")
+        cancel_btn = col2.form_submit_button("Отмена")
+        if save_btn:
+            if not title.strip():
+                st.warning("Введите название привычки.")
+            elif not days:
+                st.warning("Выберите дни недели.")
+            else:
+                habit["title"] = title.strip()
+                habit["days"] = days[:]
+                habit["stat"] = stat
+                touch_habit(habit)
+                save_state()
+                st.success("Привычка обновлена!")
+                st.session_state.edit_habit_uid = None
+                rerun_section()
+        elif cancel_btn:
+            st.session_state.edit_habit_uid = None
+            rerun_section()
+
+
+@traced
+def render_habits_page():
+    st.header("📆 Трекер привычек")
+
+    render_levelup_modal()
+
+    render_year_reset_modal()
+
+    if "show_habit_form" not in st.session_state:
+        st.session_state.show_habit_form = False
+
+    if st.button("➕ Добавить привычку", key="btn_show_habit_form"):
+        st.session_state.show_habit_form = not st.session_state.show_habit_form
+        st.rerun()
+
+    if st.session_state.show_habit_form:
+        with st.form("add_habit_form", clear_on_submit=True):
+            title = st.text_input("Название привычки", placeholder="Например: Утренняя зарядка")
+            days = st.multiselect(
+                "Дни недели",
+                options=list(range(7)),
+                default=[0, 1, 2, 3, 4],
+                format_func=lambda i: WEEKDAY_LABELS[i]
+            )
+            stat = st.selectbox(
+                "Какая характеристика качается:",
+                ["Здоровье ❤️","Интеллект 🧠","Радость 🙂","Отношения 🤝","Успех ⭐","Дисциплина 🎯"]
+            )
+            submitted = st.form_submit_button("Сохранить")
+
+            if submitted:
+                if not title.strip():
+                    st.warning("Введите название привычки.")
+                elif not days:
+                    st.warning("Выберите дни недели.")
+                else:
+                    st.session_state.habits.append({
+                        "id": ids.new_id(),
+                        "title": title.strip(),
+                        "days": days[:],
+                        "stat": stat,
+                        "created": clock.today().isoformat(),
+                        "completions": DayList(),
+                        "failures": DayList(),
+                    })
+                    save_state()
+                    st.success("Привычка добавлена!")
+                    st.session_state.show_habit_form = False
+                    st.rerun()
+
+    st.divider()
+
+    # --- список привычек ---
+    if not st.session_state.get("habits", []):
+        st.info("Пока нет привычек. Добавьте первую выше 👆")
+        return
+
+    render_habits_board()
+
+
+@section_fragment
+@traced
+def render_habits_board():
+    """Шапка с XP и список привычек — фрагмент: ✅/❌ перерисовывает только его."""
+    render_stats_header()
+    st.divider()
+
+    habits = st.session_state.get("habits", [])
+
+    # Сегодняшний день
+    today = clock.today()
+    today_label = WEEKDAY_LABELS[today.weekday()]
+
+    for h in habits:
+        uid = habit_uid(h)
+        scheduled_today = is_habit_scheduled_today(h, today)
+        done_today = habit_done_on_date(h, today)
+        failed_today = habit_failed_on_date(h, today)
+
+        # текстовый статус
+        if not scheduled_today:
+            status_label = "— сегодня не запланирована"
+            status_style = "⚪"
+        elif done_today:
+            status_label = "выполнена ✅"
+            status_style = "🟢"
+        elif failed_today:
+            status_label = "провалена ❌"
+            status_style = "🔴"
+        else:
+            status_label = "ожидает выполнения"
+            status_style = "🟡"
+
+        # аккуратная строка
+        c1, c2, c3, c4, c5, c6 = st.columns([5, 3, 1, 1, 1, 1])
+
+        with c1:
+            days_str = ", ".join(WEEKDAY_LABELS[i] for i in h.get("days", []))
+            st.markdown(
+                f"**{h['title']}** {status_style}  \n"
+                f"Сегодня: {status_label}  \n"
+                f"Дни: {days_str}  \n"
+                f"Стат: {h.get('stat','')}"
+            )
+
+        with c2:
+            if scheduled_today and not done_today and not failed_today:
+                st.info(f"Запланирована на {today_label}")
+
+        with c3:
+            if st.button("✅", key=f"h_done_{uid}", help="Отметить выполненной сегодня", use_container_width=True):
+                habit_mark(h, True, today)
+                rerun_section()
+
+        with c4:
+            if st.button("❌", key=f"h_fail_{uid}", help="Отметить проваленной сегодня", use_container_width=True):
+                habit_mark(h, False, today)
+                rerun_section()
+
+        with c5:
+            if st.button("✏️", key=f"h_edit_{uid}", help="Редактировать привычку", use_container_width=True):
+                st.session_state.edit_habit_uid = uid
+                rerun_section()
+
+        with c6:
+            if st.button("🗑️", key=f"h_del_{uid}", help="Удалить привычку", use_container_width=True):
+                with deferred_save(), recording(f"🗑️ Удалена привычка «{h['title']}»", habits=[h]):
+                    st.session_state.habits = [x for x in st.session_state.habits if x is not h]
+                    save_state()
+                rerun_section()
+
+        if st.session_state.get("edit_habit_uid") == uid:
+            render_edit_habit_form(h, uid)
+
+    st.divider()
+    render_habit_calendar(habits, today)
+
+
+# ===== КАЛЕНДАРЬ ПРИВЫЧЕК =====
+HEATMAP_CACHE_KEY = "heatmap_cache"
+
+
+def _heatmap_cache() -> LRUCache:
+    cache = st.session_state.get(HEATMAP_CACHE_KEY)
+    if cache is None:
+        cache = st.session_state[HEATMAP_CACHE_KEY] = LRUCache(maxsize=256)
+    return cache
+
+
+def _habit_bits(h: dict, today: date) -> HabitBits:
+    key = ("bits", habit_uid(h), habit_revision(h), today)
+    return _heatmap_cache().get_or_build(key, lambda: HabitBits(h, today))
+
+
+def _habit_heatmap(h: dict, year: int, today: date) -> dict:
+    """Спецификация календаря привычки за год — пересобирается только при новой ревизии привычки."""
+    key = ("habit", habit_uid(h), habit_revision(h), year, today)
+    return _heatmap_cache().get_or_build(
+        key, lambda: habit_heatmap_spec(habit_cells(_habit_bits(h, today).year(year), today), year)
+    )
+
+
+def _aggregate_heatmap(habits: list, year: int, today: date) -> dict:
+    key = ("all", tuple((habit_uid(h), habit_revision(h)) for h in habits), year, today)
+    return _heatmap_cache().get_or_build(
+        key, lambda: aggregate_heatmap_spec(
+            aggregate_cells([_habit_bits(h, today).year(year) for h in habits], year), year
+        )
+    )
+
+
+@traced
+def render_habit_calendar(habits: list, today: date):
+    """Годовой календарь в стиле GitHub: общий по всем привычкам и по каждой."""
+    st.subheader("🗓️ Календарь")
+    first = min((_habit_bits(h, today).start.year for h in habits), default=today.year)
+    years = list(range(today.year, first - 1, -1))
+    c1, c2 = st.columns([1, 2])
+    year = c1.selectbox("Год", years, key="habit_calendar_year")
+    mode = c2.radio("Показать", ["Все вместе", "По каждой"], horizontal=True, key="habit_calendar_mode")
+
+    if mode == "Все вместе":
+        st.vega_lite_chart(_aggregate_heatmap(habits, year, today), use_container_width=True)
+        return
+    for h in habits:
+        st.markdown(f"**{h['title']}**")
+        st.vega_lite_chart(_habit_heatmap(h, year, today), use_container_width=True)
@@ -0,0 +1,104 @@
+# life_rpg/views/home.py — 🏠 Главная
+import streamlit as st
+
+from life_rpg import clock
+from life_rpg.state import goals_in_order
+from life_rpg.tracing import traced
+from life_rpg.ui import rerun_section, section_fragment
+from life_rpg.views.common import render_levelup_modal, render_stats_header, render_year_reset_modal
+from life_rpg.views.search import render_search_panel
+from life_rpg.views.tasks import render_add_task_form, render_list, render_today_tasks_section
+
+
+@traced
+def render_home_page():
+    """Главная страница"""
+
+    render_levelup_modal()
+    st.header("🏠 Главная")
+    render_year_reset_modal()
+    render_home_board()
+
+
+@section_fragment
+@traced
+def render_home_board():
+    """Счётчики, характеристики и все списки задач главной — один фрагмент:
+    ✅/❌ в любом списке перерисовывает только его и шапку с XP."""
+    # --- Счётчики ---
+    goals = st.session_state.get("goals", [])
+    today = clock.today()
+
+    today_count = sum(1 for g in goals if g["due"] == today and not g["done"] and not g["failed"])
+    active_total = sum(1 for g in goals if not g["done"] and not g["failed"])
+
+    # стиль «пилюлек»
+    st.markdown("""
+    <style>
+    .counters { display:flex; gap:10px; flex-wrap:wrap; margin-bottom: 8px; }
+    .pill {
+      display:inline-block; padding:6px 12px; border-radius:999px;
+      background: rgba(255,255,255,0.07); border:1px solid rgba(255,255,255,0.12);
+      font-size:14px; color:#eaeaea;
+    }
+    .pill-today { background:#ffdd57; color:#111; border-color:#e6c84f; }
+    </style>
+    """, unsafe_allow_html=True)
+
+    st.markdown(
+        f"<div class='counters'>"
+        f"<span class='pill pill-today'>Сегодня: <b>{today_count}</b></span>"
+        f"<span class='pill'>Активных всего: <b>{active_total}</b></span>"
+        f"</div>",
+        unsafe_allow_html=True
+    )
+
+    # --- Поиск: внутри того же фрагмента, чтобы ✅/❌ в результатах обновляли и списки ---
+    render_search_panel()
+
+    # --- Характеристики и опыт ---
+    render_stats_header()
+
+    st.divider()
+
+    # --- Задачи на сегодня (карточки) ---
+    render_today_tasks_section()
+    st.divider()
+
+    # --- Добавить задачу (раскрывающаяся форма) ---
+    st.subheader("➕ Добавить задачу")
+
+    if "show_add_form" not in st.session_state:
+        st.session_state.show_add_form = False
+
+    if not st.session_state.show_add_form:
+        if st.button("➕ Открыть форму", key="open_add_form_home"):
+            st.session_state.show_add_form = True
+            rerun_section()
+    else:
+        render_add_task_form(suffix="_home")
+        if st.button("🔽 Скрыть форму", key="hide_add_form_home"):
+            st.session_state.show_add_form = False
+            rerun_section()
+
+    st.divider()
+
+    # --- Активные задачи (по типам) ---
+    st.subheader("🟢 Активные задачи")
+
+    active = [g for g in goals_in_order() if not g["done"] and not g["failed"]]
+    # теперь НЕ исключаем сегодняшние — они тоже попадают в «Активные»
+    active_rest = active
+
+    short = [g for g in active_rest if g["type"] == "Краткосрочная"]
+    mid   = [g for g in active_rest if g["type"] == "Среднесрочная"]
+    long  = [g for g in active_rest if g["type"] == "Долгосрочная"]
+
+    st.markdown(f"#### ⏱️ Краткосрочные ({len(short)})")
+    render_list(short, "active_short")
+
+    st.markdown(f"#### 📆 Среднесрочные ({len(mid)})")
+    render_list(mid, "active_mid")
+
+    st.markdown(f"#### 🗓️ Долгосрочные ({len(long)})")
+    render_list(long, "active_long")
@@ -0,0 +1,95 @@
+# life_rpg/views/importer.py — 📥 Импорт задач и привычек из файла
+import streamlit as st
+
+from life_rpg import importer
+from life_rpg.constants import WEEKDAY_LABELS
+from life_rpg.persistence import deferred_save, save_state
+from life_rpg.tracing import traced
+from life_rpg.views.common import render_levelup_modal, render_year_reset_modal
+
+PREVIEW_ROWS = 10
+
+
+def _apply_import():
+    """on_click «Импортировать»: всё проверенное — в состояние одним сохранением."""
+    res = st.session_state.pop("import_result", None)
+    if res is None:
+        return
+    with deferred_save():
+        importer.commit(res, st.session_state.goals, st.session_state.habits)
+        save_state()
+    st.session_state.import_done = (len(res.goals), len(res.habits))
+
+
+@traced
+def render_import_page():
+    st.header("📥 Импорт")
+    render_levelup_modal()
+    render_year_reset_modal()
+
+    st.caption(
+        "CSV, JSON-массив или JSON Lines. Поля задачи: `title`, `due` (YYYY-MM-DD или DD-MM-YYYY), "
+        "`category`, `stat`, `recur_mode` (none/daily/weekly/by_days), `recur_days`, `due_time` (HH:MM). "
+        "Привычка — `kind=habit`, `title`, `days` (0..6 или Пн,Ср,Пт), `stat`."
+    )
+
+    done = st.session_state.pop("import_done", None)
+    if done:
+        st.success(f"Добавлено: задач — {done[0]}, привычек — {done[1]}.")
+
+    upload = st.file_uploader("Файл", type=["csv", "json", "jsonl", "ndjson"], key="import_file")
+    if upload is None:
+        st.session_state.pop("import_result", None)
+        return
+
+    # результат проверки живёт в session_state и привязан к загруженному файлу
+    if st.button("🔍 Проверить", key="import_check"):
+        bar = st.progress(0.0, text="Читаю файл…")
+        size = max(upload.size, 1)
+
+        def progress(rows):
+            bar.progress(min(upload.tell() / size, 1.0), text=f"Прочитано строк: {rows}")
+
+        upload.seek(0)
+        res = importer.parse(upload, upload.name, progress)
+        bar.empty()
+        st.session_state.import_result = res
+        st.session_state.import_file_id = upload.file_id
+
+    res = st.session_state.get("import_result")
+    if res is None or st.session_state.get("import_file_id") != upload.file_id:
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Строк", res.rows)
+    c2.metric("Готово к импорту", len(res.goals) + len(res.habits))
+    c3.metric("С ошибками", res.error_count)
+
+    if res.errors:
+        with st.expander(f"⚠️ Ошибки ({res.error_count})", expanded=not (res.goals or res.habits)):
+            st.table([{"строка": no, "ошибка": msg} for no, msg in res.errors])
+            if res.error_count > len(res.errors):
+                st.caption(f"Показаны первые {len(res.errors)}.")
+
+    if res.goals:
+        st.markdown(f"**Задачи: {len(res.goals)}**")
+        st.table([
+            {"название": g["title"], "дедлайн": g["due"].strftime("%d-%m-%Y"),
+             "категория": g["category"], "характеристика": g["stat"]}
+            for g in res.goals[:PREVIEW_ROWS]
+        ])
+    if res.habits:
+        st.markdown(f"**Привычки: {len(res.habits)}**")
+        st.table([
+            {"название": h["title"], "дни": ", ".join(WEEKDAY_LABELS[d] for d in h["days"]),
+             "характеристика": h["stat"]}
+            for h in res.habits[:PREVIEW_ROWS]
+        ])
+
+    st.button(
+        "📥 Импортировать",
+        key="import_apply",
+        type="primary",
+        disabled=not (res.goals or res.habits),
+        on_click=_apply_import,
+    )
@@ -0,0 +1,84 @@
+# life_rpg/views/leaderboard.py — 🏆 Рейтинг игроков
+import streamlit as st
+
+from life_rpg.auth import current_user_id
+from life_rpg.constants import PAGE_SIZE_DEFAULT
+from life_rpg.db import db_leaderboard_page, db_leaderboard_row, db_leaderboard_size
+from life_rpg.leaderboard import METRICS, player_label, rank_column
+from life_rpg.tracing import traced
+from life_rpg.ui import page_controls
+from life_rpg.views.common import render_levelup_modal, render_year_reset_modal
+
+# таблицу пересчитывает ночная обработка — страницы можно держать в кэше процесса
+# (общем для всех сессий) несколько минут
+LEADERBOARD_TTL = 300
+PAGE_SCOPE = "leaderboard"
+
+
+@st.cache_data(ttl=LEADERBOARD_TTL, show_spinner=False)
+def _page(metric: str, first: int, last: int) -> list[dict]:
+    return db_leaderboard_page(metric, first, last)
+
+
+@st.cache_data(ttl=LEADERBOARD_TTL, show_spinner=False)
+def _size(metric: str) -> int:
+    return db_leaderboard_size(metric)
+
+
+@st.cache_data(ttl=LEADERBOARD_TTL, show_spinner=False)
+def _my_row(user_id: str) -> dict | None:
+    return db_leaderboard_row(user_id)
+
+
+def _go_to_rank(rank: int):
+    """on_click «К моему месту»: номер страницы меняем до создания виджета."""
+    size = st.session_state.get(f"pg_size_{PAGE_SCOPE}", PAGE_SIZE_DEFAULT)
+    st.session_state[f"pg_no_{PAGE_SCOPE}"] = (rank - 1) // size + 1
+
+
+def _fmt(metric: str, value) -> str:
+    return f"{value:.1f}" if metric == "habit_rate" else str(value)
+
+
+@traced
+def render_leaderboard_page():
+    st.header("🏆 Рейтинг")
+    render_levelup_modal()
+    render_year_reset_modal()
+
+    metric = st.radio("Метрика", list(METRICS), format_func=METRICS.get, horizontal=True, key="lb_metric")
+    col = rank_column(metric)
+    uid = current_user_id()
+
+    mine = _my_row(uid) if uid else None
+    if mine is None or mine.get(col) is None:
+        st.info("Вы появитесь в рейтинге после ночного пересчёта.")
+    else:
+        c1, c2, c3 = st.columns([1, 1, 2])
+        c1.metric("Ваше место", mine[col])
+        c2.metric(METRICS[metric], _fmt(metric, mine[metric]))
+        c3.button("К моему месту", key="lb_find_me", on_click=_go_to_rank, args=(mine[col],))
+
+    total = _size(metric)
+    if not total:
+        st.caption("Рейтинг ещё не рассчитан.")
+        return
+
+    start, stop = page_controls(total, PAGE_SCOPE)
+    rows = _page(metric, start + 1, stop)
+    other = [m for m in METRICS if m != metric]
+    st.dataframe(
+        [
+            {
+                "Место": r[col],
+                "Игрок": player_label(r["user_id"]) + (" (вы)" if r["user_id"] == uid else ""),
+                METRICS[metric]: r[metric],
+                **{METRICS[m]: r[m] for m in other},
+            }
+            for r in rows
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    if rows:
+        st.caption(f"Обновлено: {rows[0]['updated_at'].replace('T', ' ')}")
@@ -0,0 +1,325 @@
+# life_rpg/views/profile.py — 👤 Профиль: визуализация и полная статистика
+import os
+import secrets
+from collections import Counter
+
+import streamlit as st
+
+from life_rpg import clock, export, ics
+from life_rpg.auth import current_user_id
+from life_rpg.cache import memo, state_revision
+from life_rpg.charts import bar_spec, pie_spec, show_chart, _xp_last_7_days_df, _xp_line_spec
+from life_rpg.constants import WEEKDAY_LABELS
+from life_rpg.state import xp_history
+from life_rpg.stats import (
+    _big_goals_stats, _current_and_best_streak, _goals_category_success, _goals_stats,
+    _habits_stats, _habits_week_success, _xp_last_30_days_summary, _xp_last_7_days,
+)
+from life_rpg.persistence import save_state
+from life_rpg.tracing import traced
+from life_rpg.views.common import render_levelup_modal, render_year_reset_modal
+
+
+@traced
+def render_progress_section():
+    """Секция визуализации: 2 пончика + линия XP."""
+    st.markdown("## 📈 Визуализация прогресса")
+
+    # данные и спецификации пересобираются только после save_state() (см. life_rpg.cache)
+    def done_tasks():
+        return [g for g in st.session_state.get("goals", []) if g.get("done")]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        title = "Выполненные по длительности"
+        spec = memo("pie_type", lambda: pie_spec(Counter(g.get("type", "Неизв.") for g in done_tasks()), title))
+        show_chart(spec, title)
+    with col2:
+        title_cat = "Выполненные по категориям"
+        spec = memo("pie_cat", lambda: pie_spec(Counter(g.get("category", "Прочее") for g in done_tasks()), title_cat))
+        show_chart(spec, title_cat)
+
+    st.divider()
+    today = clock.today()
+    xp_spec = memo("xp7_line", lambda: _xp_line_spec(_xp_last_7_days_df()), today)
+    if xp_spec is not None:
+        st.markdown("#### XP за последние 7 дней")
+        st.vega_lite_chart(xp_spec, use_container_width=True)
+    else:
+        st.caption("ℹ️ Нет данных для графика XP за 7 дней.")
+
+    # вся история — по месяцам: старые дни уже свёрнуты в xp_rollup, читаем многоуровневый ряд
+    def xp_monthly_spec():
+        months = dict(xp_history().monthly())
+        return bar_spec(months, y_title="XP") if months else None
+
+    st.markdown("#### XP по месяцам")
+    show_chart(memo("xp_monthly", xp_monthly_spec), "XP по месяцам")
+
+
+@traced
+def render_full_stats():
+    """Большой блок 'Полная статистика' в профиле."""
+    st.markdown("### 📈 Полная статистика")
+
+    # Агрегаты и спецификации графиков кэшируются по ревизии состояния и дате:
+    # повторные перезапуски профиля без изменений не пересчитывают статистику.
+    today = clock.today()
+
+    # 1) Стрики дисциплины
+    cur_streak, best_streak = memo("streaks", _current_and_best_streak, today)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Текущая серия без пропусков (дней)", cur_streak)
+    c2.metric("Лучшая серия (дней)", best_streak)
+    c3.metric("Дней с +1 к дисциплине всего", len(set(st.session_state.get("discipline_awarded_dates", []))))
+
+    st.divider()
+
+    # 2) Задачи (обычные)
+    gstats = memo("goals_stats", _goals_stats, today)
+    st.markdown("#### ✅ Задачи")
+    cA, cB, cC, cD, cE = st.columns(5)
+    cA.metric("Всего", gstats["total"])
+    cB.metric("Активных", gstats["active"])
+    cC.metric("Выполнено", gstats["done"])
+    cD.metric("Провалено", gstats["failed"])
+    cE.metric("Просрочено", gstats["overdue"])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("По типам")
+        st.vega_lite_chart(memo("bar_by_type", lambda: bar_spec(gstats["by_type"]), today), use_container_width=True)
+    with col2:
+        st.caption("По категориям (число задач)")
+        if gstats["by_cat"]:
+            st.vega_lite_chart(memo("bar_by_cat", lambda: bar_spec(gstats["by_cat"]), today), use_container_width=True)
+        else:
+            st.info("Категорий пока нет.")
+
+    # ➕ Новое: успешность по категориям
+    cat_succ = memo("cat_success", _goals_category_success)
+    if cat_succ:
+        st.caption("Успешность по категориям (выполнено/провалено, % успеха)")
+        st.dataframe(
+            [{"Категория": c, "Выполнено": d, "Провалено": f, "Успех, %": r} for (c,d,f,r) in cat_succ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+    st.divider()
+
+    # 3) Глобальные цели
+    bg = memo("big_goals_stats", _big_goals_stats, today)
+    st.markdown("#### 🎯 Глобальные цели")
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("Всего", bg["total"])
+    c2.metric("Активных", bg["active"])
+    c3.metric("Выполнено", bg["done"])
+    c4.metric("Провалено", bg["failed"])
+    c5.metric("С дедлайном в прошлом", bg["past_due"])
+
+    st.divider()
+
+    # 4) Привычки
+    hst = memo("habits_stats", _habits_stats)
+    st.markdown("#### 📆 Привычки")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Всего привычек", hst["total"])
+    c2.metric("Выполнений всего", hst["total_done"])
+    c3.metric("Провалов всего", hst["total_fail"])
+
+    # ➕ Новое: успешность по дням недели
+    week_rate = memo("habits_week", _habits_week_success)
+    if any(v > 0 for v in week_rate.values()):
+        st.caption("Успешность привычек по дням недели, %")
+        week_spec = memo("bar_week", lambda: bar_spec({WEEKDAY_LABELS[i]: week_rate[i] for i in range(7)}, y_title="%"))
+        st.vega_lite_chart(week_spec, use_container_width=True)
+    else:
+        st.info("Пока нет выполнений/провалов привычек для расчёта успешности по дням недели.")
+
+    # Табличка по каждой привычке (успех % уже был)
+    if hst["per_habit"]:
+        rows = [{"Привычка": n, "Выполнено": d, "Провалов": f, "Успех, %": round(r, 1)} for (n, d, f, r) in hst["per_habit"]]
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("Пока нет данных по привычкам.")
+
+    st.divider()
+
+    # 5) XP за 7 дней (как было)
+    st.markdown("#### ⭐ XP за последние 7 дней")
+    xp7_spec = memo("bar_xp7", lambda: bar_spec({d: v for (d, v) in _xp_last_7_days()}, y_title="XP"), today)
+    st.vega_lite_chart(xp7_spec, use_container_width=True)
+
+    # ➕ Новое: Средний XP за 30 дней и Топ-3 дня
+    avg30, top3 = memo("xp30_summary", _xp_last_30_days_summary, today)
+    c1, c2 = st.columns(2)
+    c1.metric("Средний XP за 30 дней", avg30)
+    if top3:
+        c2.markdown("**Топ-3 дня по XP**")
+        c2.table([{"Дата": d, "XP": v} for d, v in top3])
+
+
+@traced
+def render_history_export():
+    """Выгрузка всей истории по запросу: архив строится кусками, только по кнопке."""
+    st.subheader("💾 Экспорт истории")
+    st.caption("XP по дням, задачи, глобальные цели и события привычек — ZIP с таблицами.")
+    formats = ["csv"] + (["parquet"] if export.parquet_available() else [])
+    c1, c2 = st.columns([2, 1])
+    fmt = c1.radio("Формат", formats, format_func=export.FORMATS.get, horizontal=True, key="history_export_fmt")
+    if c2.button("Подготовить", key="history_export_build", use_container_width=True):
+        with st.spinner("Собираю архив…"):
+            data = export.export_history(
+                fmt,
+                st.session_state.get("goals", []),
+                st.session_state.get("big_goals", []),
+                st.session_state.get("habits", []),
+                xp_history(),
+            )
+        st.session_state.history_export = {"rev": state_revision(), "fmt": fmt, "data": data}
+
+    # готовый архив годится, пока состояние не менялось и формат тот же
+    ready = st.session_state.get("history_export")
+    if ready and ready["rev"] == state_revision() and ready["fmt"] == fmt:
+        st.download_button(
+            "⬇️ Скачать историю",
+            data=ready["data"],
+            file_name=f"life_rpg_history_{clock.today().isoformat()}_{fmt}.zip",
+            mime="application/zip",
+            use_container_width=True,
+            key="history_export_dl",
+        )
+    elif "parquet" not in formats:
+        st.caption("Parquet доступен после установки pyarrow.")
+
+
+FEED_URL_ENV = "LIFE_RPG_FEED_URL"  # адрес сервера ленты (python -m life_rpg.feed)
+API_URL_ENV = "LIFE_RPG_API_URL"    # адрес JSON API (python -m life_rpg.api)
+
+
+def _base_url(env: str) -> str | None:
+    url = os.environ.get(env)
+    if url is None:
+        try:
+            url = st.secrets.get(env)
+        except Exception:
+            url = None
+    return url.rstrip("/") if url else None
+
+
+def _new_token(field: str):
+    """on_click: новый токен ленты/API (старый перестаёт работать)."""
+    st.session_state[field] = secrets.token_urlsafe(16)
+    save_state()
+
+
+@traced
+def render_calendar_export():
+    """Календарь .ics: файл собирается один раз на ревизию состояния; ссылка-лента — если задан сервер."""
+    st.subheader("📅 Календарь")
+    st.caption("Открытые задачи, глобальные цели и расписание привычек; повторы — правилами RRULE.")
+
+    def build():
+        ss = st.session_state
+        return ics.build_calendar(ss.get("goals", []), ss.get("big_goals", []), ss.get("habits", []),
+                                  ics.parse_updated(ss.get("updated_at"))).encode("utf-8")
+
+    st.download_button(
+        "⬇️ Скачать .ics",
+        data=memo("ics_calendar", build),
+        file_name="life_rpg.ics",
+        mime=ics.ICS_MIME,
+        key="ics_download",
+    )
+
+    base = _base_url(FEED_URL_ENV)
+    if base is None:
+        return
+    uid = current_user_id()
+    token = st.session_state.get("ics_token")
+    if token and uid:
+        st.markdown("Подписка для календаря телефона (обновляется сама):")
+        st.code(f"{base}/ics/{uid}/{token}.ics", language=None)
+    st.button("🔗 Сменить ссылку" if token else "🔗 Создать ссылку для подписки",
+              key="ics_token_btn", on_click=_new_token, args=("ics_token",))
+
+
+@traced
+def render_api_access():
+    """Адрес и токен JSON API — только если сервер API задан."""
+    base = _base_url(API_URL_ENV)
+    uid = current_user_id()
+    if base is None or not uid:
+        return
+    st.subheader("📱 API")
+    st.caption("Задачи на сегодня, отметки и статистика без страницы — для виджетов и быстрых команд телефона.")
+    token = st.session_state.get("api_token")
+    if token:
+        st.code(f"curl -H 'Authorization: Bearer {token}' {base}/api/{uid}/today", language="bash")
+    st.button("🔑 Сменить токен" if token else "🔑 Создать токен", key="api_token_btn",
+              on_click=_new_token, args=("api_token",))
+
+
+@traced
+def render_profile_page():
+    """Страница профиля"""
+
+    render_levelup_modal()
+
+    render_year_reset_modal()
+
+    st.header("👤 Профиль")
+
+    # --- Характеристики ---
+    st.subheader("📊 Характеристики")
+
+    cols = st.columns(6)
+    stats = st.session_state.stats
+    keys = ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"]
+    for i, k in enumerate(keys):
+        with cols[i]:
+            st.metric(k, f"{stats.get(k, 0):.1f}")
+
+    st.divider()
+
+    # --- Опыт и уровень ---
+    st.subheader("⭐ Прогресс")
+
+    xp = st.session_state.xp
+    level = st.session_state.level
+    st.markdown(f"**Опыт (XP):** {xp} / 1000 &nbsp;&nbsp;|&nbsp;&nbsp; **Уровень:** {level}")
+    st.progress(xp % 1000 / 1000)
+
+    st.divider()
+
+    # --- Визуализация (по кнопке) ---
+    if "show_visual" not in st.session_state:
+        st.session_state.show_visual = False
+
+    if not st.session_state.show_visual:
+        if st.button("📊 Показать визуализацию", key="show_visual_btn"):
+            st.session_state.show_visual = True
+            st.rerun()
+    else:
+        render_progress_section()
+        if st.button("🔽 Скрыть визуализацию", key="hide_visual_btn"):
+            st.session_state.show_visual = False
+            st.rerun()
+
+# Кнопка показать/скрыть полную статистику
+    if "show_full_stats" not in st.session_state:
+        st.session_state.show_full_stats = False
+
+    btn_lbl = "📊 Показать полную статистику" if not st.session_state.show_full_stats else "🔽 Скрыть статистику"
+    if st.button(btn_lbl, key="toggle_full_stats"):
+        st.session_state.show_full_stats = not st.session_state.show_full_stats
+        st.rerun()
+
+    if st.session_state.show_full_stats:
+        render_full_stats()
+        st.divider()
+
+    render_history_export()
+    render_calendar_export()
+    render_api_access()
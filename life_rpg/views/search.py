@@ -0,0 +1,96 @@
+# life_rpg/views/search.py — 🔎 поиск и фильтры по задачам, целям и привычкам
+from datetime import date
+
+import streamlit as st
+
+from life_rpg.cache import memo
+from life_rpg.constants import CATEGORIES, STAT_NAMES, TASK_CATEGORIES, WEEKDAY_LABELS
+from life_rpg.search import KINDS, STATUSES
+from life_rpg.state import search_index
+from life_rpg.tracing import traced
+from life_rpg.ui import paginate
+from life_rpg.views.tasks import render_list
+
+RECUR_LABELS = {"none": "Без повтора", "daily": "Ежедневно", "weekly": "Еженедельно", "by_days": "По дням недели"}
+
+
+def _filters() -> dict | None:
+    """Значения фильтров панели; None — ничего не задано (индекс не трогаем)."""
+    ss = st.session_state
+    due = ss.get("search_due") or ()
+    if isinstance(due, date):
+        due = (due,)
+    q = {
+        "text": ss.get("search_text", ""),
+        "kinds": ss.get("search_kinds", []),
+        "categories": ss.get("search_categories", []),
+        "stats": ss.get("search_stats", []),
+        "statuses": ss.get("search_statuses", []),
+        "recurs": ss.get("search_recurs", []),
+        "due_from": due[0] if len(due) > 0 else None,
+        "due_to": due[1] if len(due) > 1 else (due[0] if due else None),
+    }
+    if not (q["text"].strip() or any(q[k] for k in ("kinds", "categories", "stats", "statuses", "recurs"))
+            or q["due_from"]):
+        return None
+    return q
+
+
+def _reset_filters():
+    for k in ("search_text", "search_kinds", "search_categories", "search_stats",
+              "search_statuses", "search_recurs", "search_due"):
+        st.session_state.pop(k, None)
+
+
+def _category_options() -> list[str]:
+    """Категории формы и все, что встречаются у задач (у старых бывают другие)."""
+    def build():
+        seen = dict.fromkeys(TASK_CATEGORIES + CATEGORIES)
+        seen.update(dict.fromkeys(g.get("category") for g in st.session_state.get("goals", []) if g.get("category")))
+        return list(seen)
+    return memo("search_categories", build)
+
+
+@traced
+def render_search_panel():
+    """Панель поиска; индекс строится при первом запросе и дальше только доиндексирует изменения."""
+    active = _filters() is not None
+    with st.expander("🔎 Поиск и фильтры", expanded=active):
+        st.text_input("Название", key="search_text", placeholder="Слова или их начало: «отч пре»")
+        c1, c2, c3 = st.columns(3)
+        c1.multiselect("Где искать", list(KINDS), format_func=KINDS.get, key="search_kinds",
+                       placeholder="Везде")
+        c2.multiselect("Статус", list(STATUSES), format_func=STATUSES.get, key="search_statuses",
+                       placeholder="Любой")
+        c3.date_input("Дедлайн с … по", value=(), key="search_due", format="DD.MM.YYYY")
+        c4, c5, c6 = st.columns(3)
+        c4.multiselect("Категория", _category_options(), key="search_categories", placeholder="Любая")
+        c5.multiselect("Характеристика", STAT_NAMES, key="search_stats", placeholder="Любая")
+        c6.multiselect("Повтор", list(RECUR_LABELS), format_func=RECUR_LABELS.get, key="search_recurs",
+                       placeholder="Любой")
+
+        q = _filters()
+        if q is None:
+            st.caption("Задайте хотя бы один фильтр.")
+            return
+        st.button("Сбросить фильтры", key="search_reset", on_click=_reset_filters)
+
+        found = search_index().query(**q)
+        goals, big_goals, habits = found["goal"], found["big_goal"], found["habit"]
+        st.caption(f"Найдено: задач — {len(goals)}, глобальных целей — {len(big_goals)}, привычек — {len(habits)}")
+
+        if goals:
+            st.markdown(f"#### 📝 Задачи ({len(goals)})")
+            render_list(goals, "search")
+        if big_goals:
+            st.markdown(f"#### 🎯 Глобальные цели ({len(big_goals)})")
+            _, visible = paginate(big_goals, "search_big")
+            for g in visible:
+                status = "✅" if g.get("done") else ("❌" if g.get("failed") else "⬜")
+                st.write(f"{status} **{g['title']}** · 📅 {g['due'].strftime('%d-%m-%Y')}")
+        if habits:
+            st.markdown(f"#### 📆 Привычки ({len(habits)})")
+            _, visible = paginate(habits, "search_habits")
+            for h in visible:
+                days = ", ".join(WEEKDAY_LABELS[d] for d in h.get("days", []))
+                st.write(f"**{h['title']}** · {days} · {h.get('stat', '')}")
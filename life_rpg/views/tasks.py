@@ -0,0 +1,386 @@
+# life_rpg/views/tasks.py — строки задач, списки, формы добавления/редактирования
+from datetime import date, datetime
+
+import streamlit as st
+
+from life_rpg import clock, ids
+from life_rpg.constants import GOAL_TYPES
+from life_rpg.history import recording
+from life_rpg.logic import (
+    classify_by_due, days_left_text, _move_goal_in_scope, reschedule_goals, settle_goals,
+)
+from life_rpg.persistence import deferred_save, save_state
+from life_rpg.state import goal_by_id, goal_uid, goals_in_order
+from life_rpg.tracing import traced
+from life_rpg.ui import paginate, rerun_section
+
+
+def row(goal, scope: str):
+    reward = GOAL_TYPES[goal["type"]]
+    status = "✅" if goal["done"] else ("❌" if goal["failed"] else ("⏰" if goal.get("overdue") else "⬜"))
+
+    left, mid, up, down, edit_col, b1, b2, b3 = st.columns([6, 3, 1, 1, 1, 1, 1, 1])
+
+    with left:
+        if goal["due"] == clock.today() and not goal["done"] and not goal["failed"]:
+            st.markdown(
+                '<div style="display:inline-block;padding:2px 8px;border-radius:12px;'
+                'background:#ffdd57;color:#000;font-size:12px;margin-right:6px;">Сегодня</div>',
+                unsafe_allow_html=True,
+            )
+        st.write(
+            f"{status} **{goal['title']}** · {goal['type']} (±{reward} XP) · {goal['stat']} · "
+            f"🏷️ {goal.get('category','')}"
+        )
+
+    time_str = goal.get("due_time") or goal.get("time")
+    time_part = f" • ⏰ {time_str}" if time_str else ""
+    mid.caption(f"📅 {goal['due'].strftime('%d-%m-%Y')}{time_part} • {days_left_text(goal['due'], time_str)}")
+
+
+    uid = goal_uid(goal)
+
+    up.button("⬆️", key=f"{scope}_up_{uid}", use_container_width=True,
+              on_click=_move_goal_in_scope, args=(uid, scope, -1))
+    down.button("⬇️", key=f"{scope}_down_{uid}", use_container_width=True,
+                on_click=_move_goal_in_scope, args=(uid, scope, +1))
+
+    if edit_col.button("✏️", key=f"{scope}_edit_{uid}", use_container_width=True, help="Редактировать"):
+        st.session_state.edit_goal_uid = uid
+        rerun_section()
+
+    if not goal["done"] and not goal["failed"]:
+        if b1.button("✅", key=f"{scope}_done_{uid}", use_container_width=True, help="Выполнить"):
+            settle_goals([goal], True)  # награда + перенос/закрытие, одна запись в базу
+            rerun_section()
+
+        if b2.button("❌", key=f"{scope}_fail_{uid}", use_container_width=True, help="Провалить"):
+            settle_goals([goal], False)  # награда + перенос/закрытие, одна запись в базу
+            rerun_section()
+
+    if b3.button("🗑️", key=f"{scope}_del_{uid}", use_container_width=True, help="Удалить задачу"):
+        with deferred_save(), recording(f"🗑️ Удалена задача «{goal['title']}»", goals=[goal]):
+            st.session_state.goals = [g for g in st.session_state.goals if g is not goal]
+            save_state()
+        rerun_section()
+
+    if st.session_state.get("edit_goal_uid") == uid:
+        render_edit_goal_form(goal, uid)
+
+
+def _bulk_select_page(pick_key: str, page_ids: list[str]):
+    st.session_state[pick_key] = list(page_ids)
+
+
+def _bulk_apply(scope: str, action: str):
+    """Колбэк кнопок массовых действий: всё выбранное — одним проходом и одной записью."""
+    pick_key = f"bulk_pick_{scope}"
+    picked = [goal_by_id(gid) for gid in st.session_state.get(pick_key, [])]
+    picked = [g for g in picked if g is not None and not g["done"] and not g["failed"]]
+    if action == "done":
+        settle_goals(picked, True)
+    elif action == "fail":
+        settle_goals(picked, False)
+    elif action == "move":
+        reschedule_goals(picked, st.session_state.get(f"bulk_due_{scope}") or clock.today())
+    st.session_state[pick_key] = []
+
+
+def render_bulk_actions(visible: list, scope: str):
+    """Выбор нескольких задач текущей страницы и ✅/❌/перенос для всех сразу."""
+    active = [g for g in visible if not g["done"] and not g["failed"]]
+    if len(active) < 2:
+        return
+    pick_key = f"bulk_pick_{scope}"
+    titles = {goal_uid(g): g["title"] for g in active}
+    # выбор с другой страницы/уже закрытые задачи — убираем до создания виджета
+    st.session_state[pick_key] = [gid for gid in st.session_state.get(pick_key, []) if gid in titles]
+
+    with st.expander("☑️ Несколько задач сразу", expanded=bool(st.session_state[pick_key])):
+        st.multiselect("Задачи", list(titles), key=pick_key, format_func=titles.get,
+                       placeholder="Выберите задачи на этой странице", label_visibility="collapsed")
+        n = len(st.session_state[pick_key])
+        c_all, c_done, c_fail, c_due, c_move = st.columns([2, 2, 2, 2, 2])
+        c_all.button("Все на странице", key=f"bulk_all_{scope}", use_container_width=True,
+                     on_click=_bulk_select_page, args=(pick_key, list(titles)))
+        c_done.button(f"✅ Выполнить ({n})", key=f"bulk_done_{scope}", use_container_width=True,
+                      disabled=not n, on_click=_bulk_apply, args=(scope, "done"))
+        c_fail.button(f"❌ Провалить ({n})", key=f"bulk_fail_{scope}", use_container_width=True,
+                      disabled=not n, on_click=_bulk_apply, args=(scope, "fail"))
+        c_due.date_input("Перенести на", value=clock.today(), key=f"bulk_due_{scope}",
+                         label_visibility="collapsed")
+        c_move.button(f"📅 Перенести ({n})", key=f"bulk_move_{scope}", use_container_width=True,
+                      disabled=not n, on_click=_bulk_apply, args=(scope, "move"))
+
+
+@traced
+def render_list(goals, scope: str):
+    if not goals:
+        st.caption("Нет задач в этом списке.")
+        return
+    _, visible = paginate(goals, scope)
+    render_bulk_actions(visible, scope)
+    for g in visible:
+        row(g, scope)
+
+
+@traced
+def render_add_task_form(suffix: str = ""):
+    """Форма для добавления новой задачи (с выбором времени либо без него)."""
+    with st.form(f"add_goal_form{suffix}", clear_on_submit=True):
+        st.subheader("➕ Добавить задачу")
+
+        title = st.text_input("Название задачи", key=f"title{suffix}")
+        due_input = st.date_input("Дедлайн (дата)", value=clock.today(), key=f"due{suffix}")
+
+        time_options = ["Без времени"] + [f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30)]
+        time_choice = st.selectbox("Время", time_options, key=f"time{suffix}")
+        time_val = None if time_choice == "Без времени" else datetime.strptime(time_choice, "%H:%M").time()
+
+        characteristic = st.selectbox(
+            "Какая характеристика качается:",
+            ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"],
+            key=f"char{suffix}"
+        )
+        category = st.selectbox(
+            "Категория:",
+            ["Работа", "Учёба", "Дом", "Здоровье", "Хобби", "Другое"],
+            key=f"cat{suffix}"
+        )
+
+        RECUR_OPTIONS = {
+            "Не повторять": "none",
+            "Ежедневно": "daily",
+            "Еженедельно": "weekly",
+            "По дням недели": "by_days"
+        }
+        recur_mode_label = st.selectbox(
+            "Повторение:",
+            list(RECUR_OPTIONS.keys()),
+            index=0,
+            key=f"recur_mode{suffix}"
+        )
+        mode_key = RECUR_OPTIONS[recur_mode_label]
+
+        recur_days = []
+        if mode_key == "by_days":
+            st.markdown("**Выберите дни недели:**")
+            checks = []
+            cols = st.columns(7)
+            for i, day_name in enumerate(["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]):
+                with cols[i]:
+                    if st.checkbox(day_name, key=f"day_{i}{suffix}"):
+                        checks.append(i)
+            recur_days = checks
+
+        submitted = st.form_submit_button("Добавить задачу", use_container_width=True, key=f"submit{suffix}")
+
+        if submitted:
+            if not title.strip():
+                st.error("❌ Нужно ввести название задачи")
+            else:
+                new_goal = {
+                    "id": ids.new_id(),
+                    "order": ids.next_order(st.session_state.goals),
+                    "title": title.strip(),
+                    "due": due_input if isinstance(due_input, date) else date.fromisoformat(str(due_input)),
+                    "type": classify_by_due(due_input),
+                    "category": category,
+                    "done": False,
+                    "failed": False,
+                    "overdue": False,
+                    "stat": characteristic,
+                    "recur_mode": mode_key,
+                    "recur_days": recur_days,
+                    # Сохраняем время как строку 'HH:MM' или None
+                    "due_time": time_val.strftime("%H:%M") if time_val else None,
+                }
+                st.session_state.goals.append(new_goal)
+                save_state()
+                st.success(f"✅ Задача '{title}' добавлена!")
+                rerun_section()
+
+
+@traced
+def render_edit_goal_form(goal: dict, uid: str):
+    """Форма редактирования существующей задачи."""
+    with st.form(f"edit_goal_form_{uid}"):
+        st.subheader("✏️ Редактировать задачу")
+
+        title = st.text_input("Название задачи", value=goal["title"], key=f"edit_title_{uid}")
+        due_input = st.date_input("Дедлайн (дата)", value=goal["due"], key=f"edit_due_{uid}")
+
+        time_options = ["Без времени"] + [f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30)]
+        current_time = goal.get("due_time") or "Без времени"
+        time_index = time_options.index(current_time) if current_time in time_options else 0
+        time_choice = st.selectbox("Время", time_options, index=time_index, key=f"edit_time_{uid}")
+        time_val = None if time_choice == "Без времени" else datetime.strptime(time_choice, "%H:%M").time()
+
+        stat_options = ["Здоровье ❤️", "Интеллект 🧠", "Радость 🙂", "Отношения 🤝", "Успех ⭐", "Дисциплина 🎯"]
+        stat_index = stat_options.index(goal.get("stat", stat_options[0]))
+        characteristic = st.selectbox(
+            "Какая характеристика качается:",
+            stat_options,
+            index=stat_index,
+            key=f"edit_char_{uid}"
+        )
+        cat_options = ["Работа", "Учёба", "Дом", "Здоровье", "Хобби", "Другое"]
+        cat_index = cat_options.index(goal.get("category", cat_options[0]))
+        category = st.selectbox(
+            "Категория:",
+            cat_options,
+            index=cat_index,
+            key=f"edit_cat_{uid}"
+        )
+
+        RECUR_OPTIONS = {
+            "Не повторять": "none",
+            "Ежедневно": "daily",
+            "Еженедельно": "weekly",
+            "По дням недели": "by_days",
+        }
+        inverse_recur = {v: k for k, v in RECUR_OPTIONS.items()}
+        current_mode_label = inverse_recur.get(goal.get("recur_mode", "none"), "Не повторять")
+        recur_mode_label = st.selectbox(
+            "Повторение:",
+            list(RECUR_OPTIONS.keys()),
+            index=list(RECUR_OPTIONS.keys()).index(current_mode_label),
+            key=f"edit_recur_mode_{uid}"
+        )
+        mode_key = RECUR_OPTIONS[recur_mode_label]
+
+        recur_days = goal.get("recur_days", [])
+        if mode_key == "by_days":
+            st.markdown("**Выберите дни недели:**")
+            checks = []
+            cols = st.columns(7)
+            for i, day_name in enumerate(["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]):
+                with cols[i]:
+                    if st.checkbox(day_name, value=i in recur_days, key=f"edit_day_{i}_{uid}"):
+                        checks.append(i)
+            recur_days = checks
+        else:
+            recur_days = []
+
+        col1, col2 = st.columns(2)
+        save_btn = col1.form_submit_button("Сохранить")
+        cancel_btn = col2.form_submit_button("Отмена")
+
+        if save_btn:
+            if not title.strip():
+                st.error("❌ Нужно ввести название задачи")
+            else:
+                goal["title"] = title.strip()
+                goal["due"] = due_input if isinstance(due_input, date) else date.fromisoformat(str(due_input))
+                goal["type"] = classify_by_due(goal["due"])
+                goal["category"] = category
+                goal["stat"] = characteristic
+                goal["recur_mode"] = mode_key
+                goal["recur_days"] = recur_days
+                goal["due_time"] = time_val.strftime("%H:%M") if time_val else None
+                save_state()
+                st.success("Задача обновлена!")
+                st.session_state.edit_goal_uid = None
+                rerun_section()
+        elif cancel_btn:
+            st.session_state.edit_goal_uid = None
+            rerun_section()
+
+
+@traced
+def render_today_tasks_section():
+    """Красивые карточки задач на сегодня с кнопками ✔ / ✖."""
+    st.subheader("📅 Задачи на сегодня")
+
+    today = clock.today()
+    today_tasks = [
+        g for g in goals_in_order()
+        if g["due"] == today and not g["done"] and not g["failed"]
+    ]
+
+    st.markdown("""
+    <style>
+    .task-card {
+        padding: 12px 14px; border: 1px solid rgba(255,255,255,0.08);
+        border-radius: 12px; margin-bottom: 10px; background: rgba(255,255,255,0.03);
+    }
+    .task-row { display:flex; align-items:center; gap:10px; }
+    .task-left { flex: 1; }
+    .badge {
+        display:inline-block; padding: 2px 8px; border-radius: 999px; font-size: 12px;
+        background: #2a2a2a; color: #eaeaea; margin-right: 6px;
+        border: 1px solid rgba(255,255,255,0.1);
+    }
+    .badge.today { background: #ffdd57; color:#000; border-color:#e6c84f; }
+    .title { font-weight: 600; }
+    .meta { color:#bbb; font-size:13px; margin-top:2px; }
+    </style>
+    """, unsafe_allow_html=True)
+
+    if not today_tasks:
+        st.info("Сегодня задач нет! 🎉")
+        return  # ← теперь это внутри функции, всё ок
+
+    _, today_tasks = paginate(today_tasks, "today")
+    render_bulk_actions(today_tasks, "today")
+    for g in today_tasks:
+        uid = goal_uid(g)
+        reward = GOAL_TYPES.get(g["type"], 5)
+
+        # дата + (опционально) время
+        due_str = g["due"].strftime("%d-%m-%Y")
+        t = g.get("due_time") or g.get("time")
+        if t:
+            if isinstance(t, dict):
+                hh = int(t.get("hour", 0))
+                mm = int(t.get("minute", 0))
+                due_str += f" ⏰ {hh:02d}:{mm:02d}"
+            else:
+                due_str += f" ⏰ {str(t)[:5]}"
+
+        with st.container():
+            st.markdown('<div class="task-card">', unsafe_allow_html=True)
+
+            c_left, c_up, c_down, c_edit, c_done, c_fail = st.columns([8, 1, 1, 1, 1, 1])
+
+            with c_left:
+                st.markdown(
+                    f'<div class="task-row">'
+                    f'  <div class="task-left">'
+                    f'    <span class="badge today">Сегодня</span>'
+                    f'    <span class="badge">{g["type"]}</span>'
+                    f'    <span class="badge">🏷️ {g.get("category","")}</span>'
+                    f'    <span class="badge">±{reward} XP</span>'
+                    f'    <div class="title">{g["title"]}</div>'
+                    f'    <div class="meta">{g.get("stat","")} • дедлайн: {due_str}</div>'
+                    f'  </div>'
+                    f'</div>',
+                    unsafe_allow_html=True
+                )
+
+            with c_up:
+                st.button("⬆️", key=f"today_up_{uid}", use_container_width=True,
+                          on_click=_move_goal_in_scope, args=(uid, "today", -1))
+            with c_down:
+                st.button("⬇️", key=f"today_down_{uid}", use_container_width=True,
+                          on_click=_move_goal_in_scope, args=(uid, "today", +1))
+            
+            with c_edit:
+                if st.button("✏️", key=f"today_edit_{uid}", use_container_width=True, help="Редактировать"):
+                    st.session_state.edit_goal_uid = uid
+                    rerun_section()
+
+            with c_done:
+                if st.button("✅", key=f"today_done_{uid}", use_container_width=True, help="Выполнить"):
+                    settle_goals([g], True)  # награда + перенос/закрытие, одна запись в базу
+                    rerun_section()
+
+            with c_fail:
+                if st.button("❌", key=f"today_fail_{uid}", use_container_width=True, help="Провалить"):
+                    settle_goals([g], False)  # награда + перенос/закрытие, одна запись в базу
+                    rerun_section()
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            if st.session_state.get("edit_goal_uid") == uid:
+                render_edit_goal_form(g, uid)
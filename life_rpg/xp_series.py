@@ -0,0 +1,212 @@
+# life_rpg/xp_series.py — плотный ряд XP по дням с префиксными суммами
+"""
+xp_log хранится как {'YYYY-MM-DD': delta} — так он сохраняется в базу.
+Для графиков и сводок по окнам (7/30 дней, топ дней) он разворачивается
+один раз в плотный массив значений по дням от первой даты лога и массив
+префиксных сумм: сумма/среднее за любое окно — O(1), ряд для графика и
+топ-N — O(окна). add_xp() обновляет ряд на месте вместе с логом.
+
+Дни старше XP_LOG_KEEP_DAYS сворачиваются (compact_log) в помесячные суммы
+xp_rollup {'YYYY-MM': сумма} — они сохраняются отдельным разделом состояния.
+XPHistory объединяет оба разрешения: месяцы из свёртки + дни из ряда, так что
+суммы по месяцам и годам остаются точными.
+"""
+import heapq
+from array import array
+from datetime import date, datetime, timedelta
+
+from life_rpg import clock
+
+
+def _parse_day(key) -> date | None:
+    if isinstance(key, date):
+        return key
+    s = str(key)[:10]
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(s, "%d-%m-%Y").date()  # старый формат ключей
+    except ValueError:
+        return None
+
+
+class DailyXPSeries:
+    """values[i] — XP за день start + i; prefix[i] — сумма values[:i]."""
+
+    __slots__ = ("start", "values", "prefix", "source")
+
+    def __init__(self, start: date | None = None):
+        self.start = start
+        self.values = array("q")
+        self.prefix = array("q", [0])
+        self.source = None  # dict xp_log, из которого построен ряд
+
+    @classmethod
+    def from_log(cls, log) -> "DailyXPSeries":
+        items = log.items() if isinstance(log, dict) else (log or [])
+        days: dict[date, int] = {}
+        for k, v in items:
+            d = _parse_day(k)
+            if d is None:
+                continue
+            try:
+                days[d] = days.get(d, 0) + int(v)
+            except (TypeError, ValueError):
+                continue
+
+        series = cls(min(days) if days else None)
+        series.source = log
+        if not days:
+            return series
+        n = (max(days) - series.start).days + 1
+        values = array("q", bytes(8 * n))
+        for d, v in days.items():
+            values[(d - series.start).days] = v
+        series.values = values
+        series._rebuild_prefix(0)
+        return series
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def end(self) -> date | None:
+        return None if self.start is None else self.start + timedelta(days=len(self.values) - 1)
+
+    def _rebuild_prefix(self, i: int):
+        """Пересчитывает prefix[i+1:] (после изменения values[i])."""
+        prefix, values = self.prefix, self.values
+        del prefix[i + 1:]
+        acc = prefix[i]
+        for v in values[i:]:
+            acc += v
+            prefix.append(acc)
+
+    def add(self, day: date, delta: int):
+        """Добавляет delta к дню. Для сегодняшнего (последнего) дня — O(1)."""
+        delta = int(delta)
+        if self.start is None:
+            self.start = day
+        if day < self.start:
+            # день раньше начала ряда — сдвигаем начало, дописывая нули слева
+            shift = (self.start - day).days
+            self.values = array("q", bytes(8 * shift)) + self.values
+            self.start = day
+            self.prefix = array("q", [0])
+            self._rebuild_prefix(0)
+        i = (day - self.start).days
+        if i >= len(self.values):
+            gap = i - len(self.values) + 1
+            last = self.prefix[-1]
+            self.values.extend([0] * gap)
+            self.prefix.extend([last] * gap)
+        self.values[i] += delta
+        if i == len(self.values) - 1:
+            self.prefix[-1] += delta
+        else:
+            self._rebuild_prefix(i)
+
+    # ---------- запросы ----------
+    def _clip(self, first: date, last: date) -> tuple[int, int]:
+        """Индексы [a, b) пересечения окна [first, last] с рядом."""
+        if self.start is None:
+            return 0, 0
+        a = max(0, (first - self.start).days)
+        b = min(len(self.values), (last - self.start).days + 1)
+        return a, max(a, b)
+
+    def get(self, day: date) -> int:
+        a, b = self._clip(day, day)
+        return self.values[a] if b > a else 0
+
+    def sum(self, first: date, last: date) -> int:
+        """Сумма XP за дни first..last включительно — O(1)."""
+        a, b = self._clip(first, last)
+        return self.prefix[b] - self.prefix[a]
+
+    def window_sum(self, days: int, end: date | None = None) -> int:
+        end = end or clock.today()
+        return self.sum(end - timedelta(days=days - 1), end)
+
+    def average(self, days: int, end: date | None = None) -> float:
+        return self.window_sum(days, end) / days if days > 0 else 0.0
+
+    def window(self, days: int, end: date | None = None) -> list[tuple[date, int]]:
+        """[(день, XP)] за последние days дней по end включительно (с нулями) — O(окна)."""
+        end = end or clock.today()
+        first = end - timedelta(days=days - 1)
+        out = [(first + timedelta(days=i), 0) for i in range(days)]
+        a, b = self._clip(first, end)
+        if b > a:
+            off = (self.start + timedelta(days=a) - first).days
+            for j, v in enumerate(self.values[a:b]):
+                out[off + j] = (out[off + j][0], v)
+        return out
+
+    def top(self, n: int, days: int, end: date | None = None) -> list[tuple[date, int]]:
+        """n лучших дней окна (при равенстве — более ранний день первым)."""
+        return heapq.nlargest(n, self.window(days, end), key=lambda t: t[1])
+
+
+# ===== СВЁРТКА СТАРЫХ ДНЕЙ ПО МЕСЯЦАМ =====
+def month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def compact_log(log: dict, rollup: dict, cutoff: date) -> tuple[dict, dict, int]:
+    """Переносит дни раньше cutoff из log в помесячные суммы.
+    Возвращает (новый log, новый rollup, сколько дней свёрнуто); исходные dict не меняются.
+    Ключи, которые не разобрать как дату, остаются в логе."""
+    kept: dict = {}
+    merged = dict(rollup)
+    moved = 0
+    for k, v in log.items():
+        d = _parse_day(k)
+        if d is None or d >= cutoff:
+            kept[k] = v
+            continue
+        try:
+            v = int(v)
+        except (TypeError, ValueError):
+            continue
+        m = month_key(d)
+        merged[m] = int(merged.get(m, 0)) + v
+        moved += 1
+    return kept, merged, moved
+
+
+class XPHistory:
+    """Многоуровневый ряд: помесячная свёртка старых дней + дневной ряд последних."""
+
+    __slots__ = ("rollup", "daily")
+
+    def __init__(self, rollup: dict, daily: DailyXPSeries):
+        self.rollup = rollup or {}
+        self.daily = daily
+
+    def monthly(self) -> list[tuple[str, int]]:
+        """[('YYYY-MM', XP)] по всем месяцам истории по возрастанию (месяцы без XP пропускаются)."""
+        totals: dict[str, int] = {k: int(v) for k, v in self.rollup.items()}
+        daily = self.daily
+        if daily.start is not None:
+            d = date(daily.start.year, daily.start.month, 1)
+            while d <= daily.end:
+                nxt = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+                v = daily.sum(d, nxt - timedelta(days=1))
+                if v:
+                    m = month_key(d)
+                    totals[m] = totals.get(m, 0) + v
+                d = nxt
+        return sorted((m, v) for m, v in totals.items() if v)
+
+    def year_total(self, year: int) -> int:
+        """Точная сумма XP за год (свёрнутые месяцы + дни ряда)."""
+        prefix = f"{year:04d}-"
+        rolled = sum(int(v) for k, v in self.rollup.items() if k.startswith(prefix))
+        return rolled + self.daily.sum(date(year, 1, 1), date(year, 12, 31))
+
+    def rolled_total(self) -> int:
+        """XP, накопленный в свёрнутых месяцах (база для накопленной суммы дневного ряда)."""
+        return sum(int(v) for v in self.rollup.values())
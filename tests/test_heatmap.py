@@ -0,0 +1,26 @@
+from datetime import date
+
+from life_rpg.heatmap import HabitBits, habit_cells
+
+TODAY = date(2026, 3, 20)
+
+
+def _status(bits: HabitBits, day: date) -> str:
+    cells = habit_cells(bits.year(day.year), TODAY)
+    return cells[day.timetuple().tm_yday - 1]["s"]
+
+
+def test_scheduled_days_since_creation_are_missed():
+    # понедельники; создана 2 марта, первая отметка — 16 марта
+    h = {"days": [0], "created": "2026-03-02", "completions": ["2026-03-16"], "failures": []}
+    bits = HabitBits(h, TODAY)
+    assert bits.start == date(2026, 3, 2)
+    assert _status(bits, date(2026, 3, 9)) == "пропущено"
+    assert _status(bits, date(2026, 2, 23)) == "не по плану"
+
+
+def test_old_habit_without_creation_date_starts_at_first_mark():
+    h = {"days": [0], "completions": ["2026-03-16"], "failures": []}
+    bits = HabitBits(h, TODAY)
+    assert bits.start == date(2026, 3, 16)
+    assert _status(bits, date(2026, 3, 9)) == "не по плану"
@@ -0,0 +1,62 @@
+import json
+import time
+from datetime import date, timedelta
+
+import streamlit as st
+
+from life_rpg import clock, history
+from life_rpg.headless import init_process, open_session
+from life_rpg.logic import habit_mark
+
+START = date(2021, 1, 1)
+DAY = date(2026, 10, 1)
+
+
+def _long_habit(n: int = 1800) -> dict:
+    return {"id": "h1", "title": "зарядка", "days": list(range(7)),
+            "completions": [(START + timedelta(days=i)).isoformat() for i in range(n)],
+            "failures": [(START + timedelta(days=i)).isoformat() for i in range(n, n + 60, 3)]}
+
+
+def _session(*habits):
+    init_process()
+    clock.use_clock(None)
+    open_session({"habits": list(habits)})
+    return st.session_state.habits
+
+
+def test_mark_on_long_history_records_only_the_change():
+    (h,) = _session(_long_habit())
+    habit_mark(h, True, DAY)
+    habit_mark(h, False, DAY)  # ✅ → ❌ в тот же день: отметка переезжает
+    ops = st.session_state.history["undo"][-1]["ops"]
+    assert ["add", "habits", "h1", "failures", DAY.isoformat()] in ops
+    assert ["del", "habits", "h1", "completions", DAY.isoformat()] in ops
+    assert len(json.dumps(ops)) < 300
+
+    history.undo()
+    assert DAY.isoformat() in h["completions"] and DAY.isoformat() not in h["failures"]
+    history.undo()
+    assert h["completions"] == _long_habit()["completions"]
+
+
+def test_mark_on_long_history_is_fast():
+    (h,) = _session(_long_habit())
+    habit_mark(h, True, DAY - timedelta(days=1))  # первый разбор дат — не в замере
+    times = []
+    for i in range(7):
+        t0 = time.perf_counter()
+        habit_mark(h, i % 2 == 0, DAY + timedelta(days=i))
+        times.append(time.perf_counter() - t0)
+    assert sorted(times)[len(times) // 2] < 0.02  # было ~0.1 с на отметку
+
+
+def test_deleted_habit_is_restored_with_its_dates():
+    habits = _session(_long_habit(40))
+    h = habits[0]
+    with history.recording("🗑️", habits=[h]):
+        st.session_state.habits = []
+    item = st.session_state.history["undo"][-1]["ops"][0][4]
+    assert item["completions"][:2] == ["2021-01-01", "2021-01-02"]
+    history.undo()
+    assert st.session_state.habits[0]["completions"] == _long_habit(40)["completions"]
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from life_rpg.ics import build_calendar
+from life_rpg.memory import DayList
+
+
+def _dtstart(text: str) -> str:
+    return next(line for line in text.split("\r\n") if line.startswith("DTSTART"))
+
+
+def _at(day: int) -> datetime:
+    return datetime(2026, 3, day, 12, 0, tzinfo=timezone.utc)
+
+
+def test_habit_start_does_not_move_with_updated_at():
+    habit = {"id": "h1", "title": "зарядка", "days": [0, 2], "completions": ["2026-01-14", "2026-01-05"]}
+    first, later = build_calendar([], [], [habit], _at(2)), build_calendar([], [], [habit], _at(20))
+    assert _dtstart(first) == _dtstart(later) == "DTSTART;VALUE=DATE:20260105"
+
+
+def test_habit_start_from_creation_date():
+    habit = {"id": "h1", "title": "чтение", "days": [4], "created": "2026-02-02",
+             "completions": DayList.lazy(["2026-02-20"])}
+    assert _dtstart(build_calendar([], [], [habit], _at(20))) == "DTSTART;VALUE=DATE:20260206"
+
+
+def test_habit_without_history_falls_back_to_updated_at():
+    habit = {"id": "h1", "title": "бег", "days": [0], "completions": [], "failures": []}
+    assert _dtstart(build_calendar([], [], [habit], _at(4))) == "DTSTART;VALUE=DATE:20260309"
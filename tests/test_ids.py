@@ -0,0 +1,27 @@
+import math
+
+from life_rpg import ids
+
+
+def test_order_between_small_keys():
+    assert ids.order_between(1024.0, 2048.0) == 1536.0
+    assert ids.order_between(None, 1024.0) == 0.0 and ids.order_between(1024.0, None) == 2048.0
+
+
+def test_order_between_exhausted_gap_with_large_keys():
+    lo = 1e7 * ids.ORDER_STEP
+    hi = math.nextafter(lo, math.inf)  # соседние float: середины между ними нет
+    assert lo < hi and ids.order_between(lo, hi) is None
+    assert ids.order_between(lo, lo) is None
+
+
+def test_repeated_halving_with_large_keys_ends_in_renumber_signal():
+    lo, hi = 1e7 * ids.ORDER_STEP, 1e7 * ids.ORDER_STEP + ids.ORDER_STEP
+    for _ in range(200):
+        mid = ids.order_between(lo, hi)
+        if mid is None:
+            break
+        assert lo < mid < hi
+        hi = mid
+    else:
+        raise AssertionError("зазор не исчерпался")
@@ -0,0 +1,54 @@
+import io
+import json
+
+from life_rpg import importer
+
+
+class CountingIO(io.BytesIO):
+    """BytesIO, который помнит, сколько байт у него прочитали."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.read_bytes = 0
+
+    def read(self, n=-1):
+        chunk = super().read(n)
+        self.read_bytes += len(chunk)
+        return chunk
+
+
+def _goal(i: int) -> dict:
+    return {"title": f"задача {i}", "due": "2026-01-01"}
+
+
+def test_json_array_streams_valid_records():
+    data = json.dumps([_goal(i) for i in range(500)]).encode()
+    res = importer.parse(io.BytesIO(data), "tasks.json")
+    assert res.rows == 500 and len(res.goals) == 500 and not res.errors
+
+
+def test_malformed_element_reported_without_reading_to_eof():
+    head = b"[" + b",".join(json.dumps(_goal(i)).encode() for i in range(3))
+    tail = b"," + b",".join(json.dumps(_goal(i)).encode() for i in range(50_000)) + b"]"
+    f = CountingIO(head + b', {"title": "x", "due": tru, "stat": 1}' + tail)
+    res = importer.parse(f, "tasks.json")
+    assert len(res.goals) == 3
+    assert res.errors[0][0] == 4 and "некорректный JSON" in res.errors[0][1]
+    assert f.read_bytes < len(f.getvalue()) // 2
+
+
+def test_record_split_across_chunks_still_decodes(monkeypatch):
+    monkeypatch.setattr(importer, "JSON_CHUNK", 7)
+    data = json.dumps([{"title": "a, b ] c", "due": "2026-01-01"}, _goal(2)]).encode()
+    res = importer.parse(io.BytesIO(data), "tasks.json")
+    assert [g["title"] for g in res.goals] == ["a, b ] c", "задача 2"] and not res.errors
+
+
+def test_oversized_element_stops_buffering(monkeypatch):
+    monkeypatch.setattr(importer, "MAX_JSON_RECORD", 1000)
+    monkeypatch.setattr(importer, "JSON_CHUNK", 256)
+    f = CountingIO(b'[{"title": "ok", "due": "2026-01-01"}, {"title": "' + b"x" * 100_000 + b'"}]')
+    res = importer.parse(f, "tasks.json")
+    assert len(res.goals) == 1
+    assert res.errors[0][0] == 2 and "длиннее" in res.errors[0][1]
+    assert f.read_bytes < 5000
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from bench.profiles import SIZES, generate_state
+from life_rpg import nightly
+from life_rpg.sqlstore import SQLStore
+
+AT = datetime(2026, 3, 10, 3, 0, tzinfo=timezone.utc)
+
+
+def _store(tmp_path, n: int) -> SQLStore:
+    store = SQLStore(f"sqlite:///{tmp_path / 'rpg.db'}")
+    states = []
+    for i in range(n):
+        data = generate_state(**SIZES["small"], overdue=0.5, seed=i, today=AT.date())
+        data["updated_at"] = "2026-03-01T10:00:00.000000"
+        states.append((f"u{i:02d}", data))
+    store.write(states, [])
+    return store
+
+
+def test_row_saved_during_run_is_not_overwritten(tmp_path, monkeypatch):
+    store = _store(tmp_path, 6)
+    before = store.load_state("u02")
+    process_page = nightly._process_page
+
+    def saved_by_player_meanwhile(rows, reset_year, reported):
+        out = process_page(rows, reset_year, reported)
+        if any(uid == "u03" for uid, _ in rows):
+            data = store.load_state("u03")
+            data["xp"], data["updated_at"] = 12345, "2026-03-10T02:59:59.000000"
+            store.save_state("u03", data)
+        return out
+
+    monkeypatch.setattr(nightly, "_process_page", saved_by_player_meanwhile)
+    stats = nightly.run(store, AT, page_rows=4)
+
+    assert stats["conflicts"] == 1 and stats["conflict_samples"] == ["u03"]
+    assert stats["changed"] == 6 and not stats["errors"]
+    kept = store.load_state("u03")
+    assert kept["xp"] == 12345 and kept["updated_at"] == "2026-03-10T02:59:59.000000"
+    assert store.load_state("u02")["goals"] != before["goals"]  # остальные записаны
+
+    # следующий прогон обрабатывает пропущенную строку
+    monkeypatch.setattr(nightly, "_process_page", process_page)
+    stats = nightly.run(store, AT)
+    assert stats["conflicts"] == 0 and store.load_state("u03")["xp"] != 12345
@@ -0,0 +1,26 @@
+from datetime import date
+
+from life_rpg import report
+from life_rpg.xp_series import DailyXPSeries
+
+
+def test_xp_by_day_has_a_row_for_every_day_of_the_year():
+    series = DailyXPSeries.from_log({"2025-12-30": 5, "2026-01-02": 10, "2026-01-05": -3})
+    rows = list(report._xp_day_rows(series, 2026))
+    assert rows == [(date(2026, 1, 1), 0), (date(2026, 1, 2), 10), (date(2026, 1, 3), 0),
+                    (date(2026, 1, 4), 0), (date(2026, 1, 5), -3)]
+    assert list(report._xp_day_rows(DailyXPSeries.from_log({}), 2026)) == []
+
+
+def test_task_sheet_keeps_document_columns():
+    goal = {"id": "g1", "order": 1024.0, "title": "отчёт", "due": "2026-05-01", "type": "Обычная",
+            "category": "Работа", "done": False, "failed": True, "overdue": True, "stat": "Успех ⭐",
+            "recur_mode": "by_days", "recur_days": [0, 2], "due_time": "09:00", "time": None}
+    (row,) = report._doc_rows([goal], report.GOAL_COLUMNS)
+    assert dict(zip(report.GOAL_COLUMNS, row)) == {**goal, "recur_days": "0,2"}
+
+
+def test_report_builds():
+    data = report.export_year_report_xlsx({"goals": [], "big_goals": [], "habits": [],
+                                           "xp_log": {"2026-01-02": 10}}, 2026)
+    assert data[:2] == b"PK"
@@ -0,0 +1,36 @@
+import random
+from datetime import date, timedelta
+
+from life_rpg.search import SearchIndex
+
+
+def _goals(n: int, rnd: random.Random) -> list[dict]:
+    return [{"id": f"g{i}", "title": f"задача {i}", "due": date(2026, 1, 1) + timedelta(days=rnd.randrange(365)),
+             "category": "Прочее", "stat": "Успех ⭐", "done": False, "failed": False} for i in range(n)]
+
+
+def test_bulk_due_change_leaves_no_ghost_entries():
+    for seed in range(20):
+        rnd = random.Random(seed)
+        goals = _goals(200, rnd)
+        index = SearchIndex()
+        index.sync({"goal": goals})
+        for g in goals:  # массовый перенос: больше 64 изменений за один sync
+            g["due"] = date(2026, 1, 1) + timedelta(days=rnd.randrange(365))
+        assert index.sync({"goal": goals}) > 64
+
+        assert len(index.by_due) == len(index.docs) == 200
+        assert index.by_due == sorted(index.by_due)
+        found = [g["id"] for g in index.query(text="задача")["goal"]]
+        assert len(found) == len(set(found)) == 200
+
+
+def test_small_due_change_keeps_index_sorted():
+    goals = _goals(100, random.Random(1))
+    index = SearchIndex()
+    index.sync({"goal": goals})
+    for g in goals[:10]:
+        g["due"] = date(2025, 6, 1)
+    assert index.sync({"goal": goals}) == 10
+    assert len(index.by_due) == 100 and index.by_due == sorted(index.by_due)
+    assert [g["id"] for g in index.query(due_to=date(2025, 12, 31))["goal"]] == [f"g{i}" for i in range(10)]
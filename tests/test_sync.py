@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from bench.api import TOKEN, USER_ID as API_USER, _call
+from bench.fakes import InMemoryStore, InMemorySupabase
+from bench.profiles import SIZES, generate_state
+from bench.rerun import USER_ID, _new_app
+from life_rpg import api, clock, persistence
+from life_rpg.headless import init_process
+
+
+def _state() -> dict:
+    data = generate_state(**SIZES["small"])
+    data["updated_at"] = "2026-01-01T00:00:00+00:00"
+    return data
+
+
+def _api_write(c: InMemorySupabase, xp_bonus: int) -> dict:
+    """То, что делает JSON API: читает документ, меняет и пишет с новым updated_at."""
+    data = json.loads(json.dumps(c.tables["rpg_state"][0]["data"]))
+    data["xp"] += xp_bonus
+    data["updated_at"] = "2099-01-01T00:00:00.000001+00:00"
+    c.put_state(USER_ID, data)
+    return data
+
+
+def _done_button(at):
+    return next(b for b in at.button if (b.key or "").startswith("today_done_"))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # ночная обработка и API в других тестах отключают запись и фиксируют часы процесса
+    monkeypatch.setattr(persistence, "_detached", False)
+    clock.use_clock(None)
+    c = InMemorySupabase(USER_ID)
+    c.put_state(USER_ID, _state())
+    at = _new_app(c, timeout=120)
+    at.run()
+    assert not at.exception
+    return at, c
+
+
+def test_click_after_api_write_does_not_overwrite_it(app):
+    at, c = app
+    written = _api_write(c, 1000)
+    _done_button(at).click().run()  # проверка в начале перезапуска ещё не наступила
+    assert not at.exception
+    stored = c.tables["rpg_state"][0]["data"]
+    assert stored["xp"] == written["xp"] and stored["updated_at"] == written["updated_at"]
+    assert at.session_state["xp"] == written["xp"]  # сессия перечитала документ
+    assert persistence.RELOADED_MSG in [x.value for x in at.sidebar.info]
+
+    # повтор действия уже ложится на свежую копию
+    _done_button(at).click().run()
+    assert c.tables["rpg_state"][0]["data"]["xp"] > written["xp"]
+
+
+def test_rerun_picks_up_api_write_before_click(app, monkeypatch):
+    at, c = app
+    monkeypatch.setattr(persistence, "STATE_CHECK_SECONDS", 0)
+    written = _api_write(c, 1000)
+    _done_button(at).click().run()
+    assert not at.exception
+    stored = c.tables["rpg_state"][0]["data"]
+    assert stored["xp"] > written["xp"]  # и изменение API, и нажатие
+
+
+def test_api_post_conflicts_with_write_made_meanwhile(monkeypatch):
+    init_process()
+    store = InMemoryStore()
+    data = _state()
+    data["api_token"] = TOKEN
+    store.put_state(API_USER, data)
+    app = api.Api(store)
+    hid = data["habits"][0]["id"]
+    apply_action = api.apply_action
+
+    def saved_in_app_meanwhile(*args):
+        other = store.load_state(API_USER)
+        other["xp"], other["updated_at"] = 777, "2099-01-01T00:00:00+00:00"
+        store.put_state(API_USER, other)
+        return apply_action(*args)
+
+    monkeypatch.setattr(api, "apply_action", saved_in_app_meanwhile)
+    status, _, body = _call(app, "POST", f"/api/{API_USER}/habits/{hid}/done")
+    assert status == "409 Conflict" and json.loads(body)["error"] == "state changed, retry"
+    assert store.load_state(API_USER)["xp"] == 777
+
+    monkeypatch.setattr(api, "apply_action", apply_action)
+    assert _call(app, "POST", f"/api/{API_USER}/habits/{hid}/done")[0] == "200 OK"
+    assert store.load_state(API_USER)["xp"] > 777
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+import pytest
+import streamlit as st
+
+from life_rpg import clock, history, ui
+from life_rpg.headless import init_process, open_session
+from life_rpg.logic import habit_mark
+
+
+class Rerun(Exception):
+    pass
+
+
+@pytest.fixture
+def reruns(monkeypatch):
+    init_process()
+    clock.use_clock(None)
+    open_session({"habits": [{"id": "h1", "title": "зарядка", "days": list(range(7))}]})
+    scopes = []
+
+    def rerun(scope="app"):
+        scopes.append(scope)
+        raise Rerun
+
+    monkeypatch.setattr(ui, "_in_fragment_rerun", lambda: True)
+    monkeypatch.setattr(ui.st, "rerun", rerun)
+    return scopes
+
+
+def _rerun_section(scopes) -> str:
+    with pytest.raises(Rerun):
+        ui.rerun_section()
+    return scopes[-1]
+
+
+def test_action_recorded_in_history_keeps_fragment_scope(reruns):
+    habit_mark(st.session_state.habits[0], True)
+    assert st.session_state.history["undo"]
+    assert _rerun_section(reruns) == "fragment"
+
+
+def test_level_up_still_reruns_whole_app(reruns):
+    st.session_state.levelup_pending = True
+    assert _rerun_section(reruns) == "app"  # модалка «Новый уровень» — вне фрагментов
+
+
+def test_stale_undo_list_undoes_the_entry_it_shows(reruns):
+    h = st.session_state.habits[0]
+    habit_mark(h, True)
+    (_label, _at, shown), = history.recent()  # список в боковой панели до действия во фрагменте
+    habit_mark(h, False, clock.today() - timedelta(days=1))
+    ui._undo_to_click(shown)
+    assert not st.session_state.history["undo"]
+    assert not h["completions"] and not h["failures"]
+    ui._undo_to_click(shown)
+    assert st.session_state.history_notice == "Это действие уже отменено"